@@ -1,3 +1,76 @@
-from mypackage.vector import Vector, NormError
-from mypackage.linearmap import LinearMap, Rotation, Shear
+"""Top level of our package.
+
+Note:
+    Importing a module executes all of its code, so importing heavy libraries like NumPy
+    or Numba when they are not needed slows down every script (and every call to the
+    `vector` command). The scalar Vector classes are imported right away, while the rest
+    of the public objects are imported the first time they are accessed thanks to the
+    module-level `__getattr__` function (PEP 562).
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
 from mypackage._version import __version__
+from mypackage.vector import Vector, NormError, FrozenVector, frozen_vector
+
+
+TYPE_CHECKING = False  # same as typing.TYPE_CHECKING, without importing typing (slow)
+
+if TYPE_CHECKING:  # type checkers see the usual imports, at runtime they are lazy
+    from typing import Any
+
+    from mypackage import backend, instrumentation, linalg, linearmap, parallel, random
+    from mypackage import server, stream
+    from mypackage.vector import VectorArray, VectorN, VectorIndex, Accumulator
+    from mypackage.linearmap import LinearMap, Rotation, Shear, ComposedMap
+    from mypackage.linearmap import MatrixMap, RotationBatch, ShearBatch, LinearMapN
+
+
+# Name of each lazily loaded object and the module where it lives
+_LAZY_IMPORTS: dict[str, str] = {
+    "VectorArray": "mypackage.vector",
+    "VectorN": "mypackage.vector",
+    "VectorIndex": "mypackage.vector",
+    "Accumulator": "mypackage.vector",
+    "LinearMap": "mypackage.linearmap",
+    "Rotation": "mypackage.linearmap",
+    "Shear": "mypackage.linearmap",
+    "ComposedMap": "mypackage.linearmap",
+    "MatrixMap": "mypackage.linearmap",
+    "RotationBatch": "mypackage.linearmap",
+    "ShearBatch": "mypackage.linearmap",
+    "LinearMapN": "mypackage.linearmap",
+}
+_LAZY_SUBPACKAGES: tuple[str, ...] = (
+    "backend",
+    "instrumentation",
+    "linalg",
+    "linearmap",
+    "parallel",
+    "random",
+    "server",
+    "stream",
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import an object the first time it is accessed as an attribute of the package.
+
+    Note:
+        Python only calls this function when the attribute is not found the usual way,
+        so after caching the object in the module globals it is never called again for it.
+    """
+    if name in _LAZY_SUBPACKAGES:
+        value = import_module(f"{__name__}.{name}")
+    elif name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_IMPORTS, *_LAZY_SUBPACKAGES])
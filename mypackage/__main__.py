@@ -13,23 +13,63 @@ Example:
     Vector (1.0, 2.0) created!
     Vector pickled in data/hey.pkl!
 
+    Pickle files are slow, big and unsafe to load, so vectors can also be saved
+    in our binary vector format (see mypackage/io/binary.py) and loaded back:
+
+    >>> vector 1 2 --save vector.vec --format binary
+    Vector (1.0, 2.0) created!
+    Vector saved in data/vector.vec!
+
+    >>> vector --load data/vector.vec
+    Vector (1.0, 2.0) loaded!
+
+    In batch mode, vectors are read from files (or the standard input if no file is
+    given), one per line, and streamed in chunks to the standard output (or a file):
+
+    >>> vector --batch points.csv --delimiter , --rotate 0.5 -o rotated.csv --reject bad.csv
+    999998 vectors written, 2 rejected (1 parse errors, 1 norm errors)
+
+    The benchmark suite (see mypackage/bench.py) is a subcommand with its own options:
+
+    >>> vector bench --filter Rotation --sizes 1 1000 1000000
+
+    Linear maps can also be served over a socket to many clients, which send their
+    vectors in a compact binary format (see mypackage/server), and load tested:
+
+    >>> vector serve --rotate 0.5 --unix /tmp/vector.sock
+    >>> vector loadgen --unix /tmp/vector.sock --connections 64
+
 """
-from argparse import ArgumentParser
+import sys
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from collections.abc import Sequence
 
 from .vector import Vector
 
 
-def main():
+def positive_int(text: str) -> int:
+    """Argument type of the counts that must be positive (argparse shows the error)."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise ArgumentTypeError(f"must be a positive integer, not {value}")
+    return value
+
+
+def build_parser() -> ArgumentParser:
+    """Create the parser of the command line arguments."""
     parser = ArgumentParser(  # this object parses the arguments given through command line
         prog="vector",  # name of our command
-        description="Create a 2D vector.",
+        description="Create a 2D vector, or transform many of them with --batch.",
         epilog="Thanks for using %(prog)s! :)",
     )
     parser.add_argument(
         "coordinates",  # positional argument
-        nargs=2,
+        nargs="*",  # we check ourselves that there are two of them (except in batch mode)
         type=float,
-        metavar=("x", "y"),
+        metavar="x y",
         help="take the Cartesian coordinates %(metavar)s",
     )
     parser.add_argument(
@@ -38,7 +78,104 @@ def main():
         action="store",  # stores whatever goes after --save. This is the default value for action.
         type=str,
     )
-    args = parser.parse_args()  # after parsing the arguments we can access them
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("pickle", "binary"),  # argparse rejects any other value
+        default="pickle",
+        help="file format used by --save (default: %(default)s)",
+    )
+    parser.add_argument("-l", "--load", metavar="FILE", help="load a binary vector file")
+
+    batch = parser.add_argument_group("batch mode")  # groups are shown together in --help
+    batch.add_argument(
+        "-b",
+        "--batch",
+        nargs="*",  # zero or more files
+        metavar="FILE",
+        help="read vectors from the files (or from stdin if none is given), one per line",
+    )
+    batch.add_argument("-o", "--output", help="write the vectors to this file instead of stdout")
+    batch.add_argument("--reject", metavar="FILE", help="copy the invalid lines to this file")
+    batch.add_argument("--delimiter", help="separator of the coordinates (default: whitespace)")
+    batch.add_argument(
+        "--chunk-size", type=positive_int, default=65_536, help="lines read at once"
+    )
+    transform = batch.add_mutually_exclusive_group()  # only one of them can be given
+    transform.add_argument("--rotate", type=float, metavar="ANGLE", help="apply a rotation")
+    transform.add_argument("--shear", type=float, metavar="ANGLE", help="apply a shear")
+    batch.add_argument("--inverse", action="store_true", help="apply the inverse map instead")
+    return parser
+
+
+def run_batch(args: Namespace) -> None:
+    """Stream the vectors of the input files (or stdin) through the requested map.
+
+    Note:
+        The library modules with NumPy are imported here and not at the top of the
+        file, so that creating a single vector stays fast.
+    """
+    from contextlib import ExitStack
+    from itertools import chain
+
+    from .io import transform_text
+    from .linearmap import Rotation, Shear
+
+    linear_map = None
+    if args.rotate is not None:
+        linear_map = Rotation(args.rotate)
+    elif args.shear is not None:
+        linear_map = Shear(args.shear)
+
+    with ExitStack() as stack:  # closes all the files we open, whatever happens
+        if args.batch:
+            files = [stack.enter_context(open(path)) for path in args.batch]
+            source = chain.from_iterable(files)
+        else:
+            source = sys.stdin
+        sink = stack.enter_context(open(args.output, "w")) if args.output else sys.stdout
+        rejects = stack.enter_context(open(args.reject, "w")) if args.reject else None
+
+        stats = transform_text(
+            source,
+            sink,
+            linear_map,
+            inverse=args.inverse,
+            chunk_size=args.chunk_size,
+            delimiter=args.delimiter,
+            rejects=rejects,
+        )
+    print(stats, file=sys.stderr)  # stdout may be carrying the vectors
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["bench"]:  # subcommand, with its own parser
+        from .bench import main as bench_main
+
+        sys.exit(bench_main(argv[1:]))
+    if argv[:1] == ["serve"]:
+        from .server.server import main as serve_main
+
+        sys.exit(serve_main(argv[1:]))
+    if argv[:1] == ["loadgen"]:
+        from .server.client import main as loadgen_main
+
+        sys.exit(loadgen_main(argv[1:]))
+
+    parser = build_parser()
+    args = parser.parse_args(argv)  # after parsing the arguments we can access them
+
+    if args.batch is not None:
+        run_batch(args)
+        return
+
+    if args.load:
+        load(args.load)
+        return
+
+    if len(args.coordinates) != 2:
+        parser.error("exactly two coordinates x y are required")
     x, y = args.coordinates[0], args.coordinates[1]
     vector = Vector(x, y)
 
@@ -52,11 +189,36 @@ def main():
         Path("data/").mkdir(exist_ok=True)
         file_path = Path("data") / args.save
 
+        if args.format == "binary":
+            from .io import save_vectors
+
+            save_vectors(file_path, vector)
+            print(f"Vector saved in {file_path}!")
+            return
+
         with open(file_path, mode="wb") as f:
             pickle.dump(vector, f)
 
         print(f"Vector pickled in {file_path}!")
 
 
+def load(path: str) -> None:
+    """Print the vector(s) stored in a binary vector file.
+
+    Note:
+        The file is memory-mapped, so only the vectors that are printed are read.
+    """
+    from .io import load_vectors
+
+    vectors = load_vectors(path)
+    if len(vectors) == 1:
+        print(f"Vector {vectors[0]} loaded!")
+        return
+    print(f"{len(vectors)} vectors loaded from {path}:")
+    print(vectors.array[:10])
+    if len(vectors) > 10:
+        print("...")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,20 @@
+"""To import from the backend.py module we can also type
+from mypackage.backend.backend import set_backend
+"""
+
+from .backend import (
+    BACKENDS,
+    get_backend,
+    get_backend_name,
+    get_kernels,
+    set_backend,
+    use_backend,
+)
+from .precision import (
+    PRECISIONS,
+    get_dtype,
+    get_precision,
+    get_tolerance,
+    set_precision,
+    use_precision,
+)
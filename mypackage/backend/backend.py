@@ -0,0 +1,100 @@
+"""This module selects which kernels (NumPy or Numba) run the batch operations
+of VectorArray and LinearMap.
+
+Attributes:
+    BACKENDS (tuple[str, ...]): Names of the available backends.
+
+Examples:
+    We can switch to the Numba backend for the whole program
+
+    >>> set_backend("numba")
+
+    or only inside a block of code
+
+    >>> with use_backend("numpy"):
+    ...     get_backend_name()
+    'numpy'
+
+"""
+
+import warnings
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any
+
+from . import numpy_kernels
+
+
+BACKENDS: tuple[str, ...] = ("numpy", "numba")
+
+_backend: ModuleType = numpy_kernels
+_backend_name: str = "numpy"
+
+
+def get_backend() -> ModuleType:
+    """Return the module with the kernels of the current backend."""
+    return _backend
+
+
+def get_kernels(workers: int | None = None) -> Any:
+    """Return the kernels of the current backend or, if a number of workers is given,
+    a thread pool that runs the NumPy kernels on chunks of the batch in parallel (see
+    mypackage.parallel.thread_pool), which offers the same functions.
+    """
+    if workers is None:
+        return _backend
+    from mypackage.parallel.thread_pool import get_thread_pool  # only if it is needed
+
+    return get_thread_pool(workers)
+
+
+def get_backend_name() -> str:
+    """Return the name of the current backend."""
+    return _backend_name
+
+
+def set_backend(name: str) -> None:
+    """Select the kernels used by the batch operations.
+
+    Note:
+        Numba is imported only when its backend is selected. If it is not installed,
+        we warn the user and fall back to the NumPy backend.
+
+    Args:
+        name (str): "numpy" or "numba".
+
+    Raises:
+        ValueError: Unknown backend.
+    """
+    global _backend, _backend_name
+    if name not in BACKENDS:
+        raise ValueError(f"Backend must be one of {BACKENDS}, not {name!r}.")
+
+    if name == "numba":
+        try:
+            from . import numba_kernels
+        except ImportError:
+            warnings.warn(
+                "Numba is not installed: falling back to the NumPy backend.", stacklevel=2
+            )
+        else:
+            _backend, _backend_name = numba_kernels, name
+            return
+
+    _backend, _backend_name = numpy_kernels, "numpy"
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[None]:
+    """Context manager to use a backend only inside a block of code.
+
+    Args:
+        name (str): "numpy" or "numba".
+    """
+    previous_name = _backend_name
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous_name)
@@ -0,0 +1,197 @@
+"""Numba kernels for batches of two dimensional vectors.
+
+These functions mirror the ones in numpy_kernels.py, but they are compiled to machine
+code by Numba. The loops over vectors run in parallel on all the cores (`prange` with
+`parallel=True`), do not hold the GIL (`nogil=True`), and the compiled code is cached
+on disk (`cache=True`) so the compilation is paid once per machine, not once per process.
+
+Note:
+    Numba compiles a function the first time it is called with some argument types.
+    The cache is stored in the `__pycache__` folder next to this file (or in the folder
+    given by the NUMBA_CACHE_DIR environment variable, if that one is read only).
+
+References:
+    https://numba.readthedocs.io/en/stable/user/parallel.html
+"""
+
+import numpy as np
+from numba import njit, prange
+from numpy.typing import NDArray
+
+
+# A decorator with our options, to avoid repeating them for every kernel
+jit_kernel = njit(parallel=True, nogil=True, cache=True)
+
+
+@jit_kernel
+def add(a: NDArray[np.float64], b: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Element-wise addition of two batches of vectors."""
+    step = 0 if b.shape[0] == 1 else 1  # step 0 repeats the single vector
+    for i in prange(a.shape[0]):
+        j = i * step
+        out[i, 0] = a[i, 0] + b[j, 0]
+        out[i, 1] = a[i, 1] + b[j, 1]
+    return out
+
+
+@jit_kernel
+def scale(a: NDArray[np.float64], scalar: float, out: NDArray[np.float64]) -> NDArray:
+    """Multiplication of every vector by a scalar."""
+    for i in prange(a.shape[0]):
+        out[i, 0] = a[i, 0] * scalar
+        out[i, 1] = a[i, 1] * scalar
+    return out
+
+
+@jit_kernel
+def dot(a: NDArray[np.float64], b: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Dot products of the vectors of both batches, written in an (N,) array."""
+    step = 0 if b.shape[0] == 1 else 1  # step 0 repeats the single vector
+    for i in prange(a.shape[0]):
+        j = i * step
+        out[i] = a[i, 0] * b[j, 0] + a[i, 1] * b[j, 1]
+    return out
+
+
+@jit_kernel
+def norm(a: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Euclidean norms of the vectors, written in an (N,) array."""
+    for i in prange(a.shape[0]):
+        out[i] = np.hypot(a[i, 0], a[i, 1])
+    return out
+
+
+@jit_kernel
+def _norm_violation_mask(a: NDArray[np.float64], max_squared_norm: float) -> NDArray[np.bool_]:
+    mask = np.empty(a.shape[0], dtype=np.bool_)
+    for i in prange(a.shape[0]):
+        mask[i] = a[i, 0] * a[i, 0] + a[i, 1] * a[i, 1] > max_squared_norm
+    return mask
+
+
+def norm_violations(a: NDArray[np.float64], max_norm: float) -> NDArray[np.intp]:
+    """Indices of the vectors whose norm is greater than max_norm.
+
+    Note:
+        The comparison runs in parallel; gathering the (usually very few) indices
+        is left to NumPy.
+    """
+    return np.flatnonzero(_norm_violation_mask(a, max_norm * max_norm))
+
+
+@jit_kernel
+def project(a: NDArray[np.float64], s: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Projection of every vector of `a` onto the subspace spanned by `s`."""
+    step = 0 if s.shape[0] == 1 else 1  # step 0 repeats the single vector
+    for i in prange(a.shape[0]):
+        j = i * step
+        coef = (a[i, 0] * s[j, 0] + a[i, 1] * s[j, 1]) / (s[j, 0] * s[j, 0] + s[j, 1] * s[j, 1])
+        out[i, 0] = s[j, 0] * coef
+        out[i, 1] = s[j, 1] * coef
+    return out
+
+
+@jit_kernel
+def apply(matrix: NDArray[np.float64], a: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Multiplication of every vector by a 2x2 matrix (in place if `out` is `a`)."""
+    m00, m01, m10, m11 = matrix[0, 0], matrix[0, 1], matrix[1, 0], matrix[1, 1]
+    for i in prange(a.shape[0]):
+        x, y = a[i, 0], a[i, 1]  # read both components before overwriting them
+        out[i, 0] = m00 * x + m01 * y
+        out[i, 1] = m10 * x + m11 * y
+    return out
+
+
+@jit_kernel
+def apply_each(
+    matrices: NDArray[np.float64], a: NDArray[np.float64], out: NDArray[np.float64]
+) -> NDArray:
+    """Multiplication of the i-th vector by the i-th matrix of an (N, 2, 2) stack
+    (in place if `out` is `a`). If `a` has shape (1, 2), every matrix multiplies it.
+    """
+    step = 0 if a.shape[0] == 1 else 1  # step 0 repeats the single vector
+    for i in prange(matrices.shape[0]):
+        j = i * step
+        x, y = a[j, 0], a[j, 1]
+        out[i, 0] = matrices[i, 0, 0] * x + matrices[i, 0, 1] * y
+        out[i, 1] = matrices[i, 1, 0] * x + matrices[i, 1, 1] * y
+    return out
+
+
+@njit(nogil=True, cache=True)
+def _lu_factor_matrix(a: NDArray[np.float64], pivots: NDArray[np.intp]) -> float:
+    """LU factorization with partial pivoting of a single matrix (see lu_factor)."""
+    size = a.shape[0]
+    sign = 1.0
+    for col in range(size):
+        pivot_row, largest = col, abs(a[col, col])
+        for row in range(col + 1, size):
+            if abs(a[row, col]) > largest:
+                pivot_row, largest = row, abs(a[row, col])
+        pivots[col] = pivot_row
+        if pivot_row != col:
+            sign = -sign
+            for k in range(size):
+                a[col, k], a[pivot_row, k] = a[pivot_row, k], a[col, k]
+        pivot = a[col, col]
+        if pivot == 0.0:  # a zero column: there is nothing to eliminate
+            continue
+        for row in range(col + 1, size):
+            factor = a[row, col] / pivot
+            a[row, col] = factor
+            for k in range(col + 1, size):
+                a[row, k] -= factor * a[col, k]
+    return sign
+
+
+@njit(nogil=True, cache=True)
+def _lu_solve_matrix(lu: NDArray[np.float64], pivots: NDArray[np.intp], b: NDArray) -> None:
+    """Solve the systems of a single factorized matrix, in place (see lu_solve)."""
+    size, columns = lu.shape[0], b.shape[1]
+    for col in range(size):  # same row swaps as in the factorization
+        for k in range(columns):
+            b[col, k], b[pivots[col], k] = b[pivots[col], k], b[col, k]
+    for row in range(size):  # forward substitution with L (ones on the diagonal)
+        for k in range(columns):
+            total = b[row, k]
+            for j in range(row):
+                total -= lu[row, j] * b[j, k]
+            b[row, k] = total
+    for row in range(size - 1, -1, -1):  # back substitution with U
+        for k in range(columns):
+            total = b[row, k]
+            for j in range(row + 1, size):
+                total -= lu[row, j] * b[j, k]
+            b[row, k] = total / lu[row, row]
+
+
+@jit_kernel
+def lu_factor(
+    a: NDArray[np.float64], pivots: NDArray[np.intp], signs: NDArray[np.float64]
+) -> NDArray:
+    """LU factorization with partial pivoting of every matrix of a (B, n, n) stack,
+    in place (see numpy_kernels.lu_factor).
+
+    Note:
+        Starting the threads of a parallel loop takes a few microseconds, more than
+        factorizing a small matrix, so a single matrix is factorized without them.
+    """
+    if a.shape[0] == 1:
+        signs[0] = _lu_factor_matrix(a[0], pivots[0])
+        return signs
+    for i in prange(a.shape[0]):
+        signs[i] = _lu_factor_matrix(a[i], pivots[i])
+    return signs
+
+
+@jit_kernel
+def lu_solve(lu: NDArray[np.float64], pivots: NDArray[np.intp], b: NDArray[np.float64]) -> NDArray:
+    """Solve the systems of a (B, n, n) stack factorized by lu_factor for the (B, n, k)
+    right hand sides `b`, which are overwritten by the solutions.
+    """
+    if lu.shape[0] == 1:  # no threads for a single matrix (see lu_factor)
+        _lu_solve_matrix(lu[0], pivots[0], b[0])
+        return b
+    for i in prange(lu.shape[0]):
+        _lu_solve_matrix(lu[i], pivots[i], b[i])
+    return b
@@ -0,0 +1,130 @@
+"""Pure NumPy kernels for batches of two dimensional vectors.
+
+Every kernel works on (N, 2) float arrays and writes its result into a preallocated
+`out` array, which it also returns. The "other" operand of binary kernels may have
+shape (N, 2) or (1, 2), in which case that single vector is used for every element.
+The linear algebra kernels (lu_factor and lu_solve) work instead on (B, n, n) stacks
+of square matrices, in place.
+
+Note:
+    The Numba backend (see numba_kernels.py) exposes exactly the same functions, so
+    that the rest of the library can use either of them without knowing which one.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def add(a: NDArray[np.float64], b: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Element-wise addition of two batches of vectors."""
+    return np.add(a, b, out=out)
+
+
+def scale(a: NDArray[np.float64], scalar: float, out: NDArray[np.float64]) -> NDArray:
+    """Multiplication of every vector by a scalar."""
+    return np.multiply(a, scalar, out=out)
+
+
+def dot(a: NDArray[np.float64], b: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Dot products of the vectors of both batches, written in an (N,) array."""
+    if b.shape[0] == 1:
+        return np.matmul(a, b[0], out=out)
+    return np.einsum("ij,ij->i", a, b, out=out)
+
+
+def norm(a: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Euclidean norms of the vectors, written in an (N,) array."""
+    return np.hypot(a[:, 0], a[:, 1], out=out)
+
+
+def norm_violations(a: NDArray[np.float64], max_norm: float) -> NDArray[np.intp]:
+    """Indices of the vectors whose norm is greater than max_norm.
+
+    Note:
+        We compare the squared norms to avoid computing N square roots.
+    """
+    squared_norms = np.einsum("ij,ij->i", a, a)
+    return np.flatnonzero(squared_norms > max_norm * max_norm)
+
+
+def project(a: NDArray[np.float64], s: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Projection of every vector of `a` onto the subspace spanned by `s`."""
+    if s.shape[0] == 1:
+        coefs = (a @ s[0]) / (s[0] @ s[0])
+    else:
+        coefs = np.einsum("ij,ij->i", a, s) / np.einsum("ij,ij->i", s, s)
+    return np.multiply(s, coefs[:, np.newaxis], out=out)
+
+
+def apply(matrix: NDArray[np.float64], a: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+    """Multiplication of every vector by a 2x2 matrix.
+
+    Note:
+        Our vectors are the rows of the (N, 2) array, so instead of computing
+        matrix @ vector for each of them we compute a @ matrix.T for all of them.
+    """
+    return np.matmul(a, matrix.T, out=out)
+
+
+def apply_each(
+    matrices: NDArray[np.float64], a: NDArray[np.float64], out: NDArray[np.float64]
+) -> NDArray:
+    """Multiplication of the i-th vector by the i-th matrix of an (N, 2, 2) stack
+    (in place if `out` is `a`). If `a` has shape (1, 2), every matrix multiplies it.
+    """
+    x, y = a[:, 0], a[:, 1]
+    new_x = matrices[:, 0, 0] * x + matrices[:, 0, 1] * y  # a temporary array
+    out[:, 1] = matrices[:, 1, 0] * x + matrices[:, 1, 1] * y  # x is not overwritten yet
+    out[:, 0] = new_x
+    return out
+
+
+def lu_factor(
+    a: NDArray[np.float64], pivots: NDArray[np.intp], signs: NDArray[np.float64]
+) -> NDArray:
+    """LU factorization with partial pivoting of every matrix of a (B, n, n) stack.
+
+    Each matrix is overwritten by its factors (the unit lower triangular L below the
+    diagonal and U on and above it), `pivots[b, k]` gets the row swapped with row k at
+    step k, and `signs[b]` the sign (+1 or -1) of the permutation.
+
+    Note:
+        This is the Gaussian elimination of examples/5-jit-compiler.ipynb, choosing as
+        pivot the largest element of the column (dividing by small pivots amplifies the
+        rounding errors). The loops over the columns run in Python, but every step
+        works on the whole stack at once.
+    """
+    batch = np.arange(a.shape[0])
+    signs[:] = 1.0
+    for col in range(a.shape[1]):
+        pivot_rows = col + np.argmax(np.abs(a[:, col:, col]), axis=1)
+        pivots[:, col] = pivot_rows
+        signs[pivot_rows != col] *= -1.0
+        row = a[:, col].copy()
+        a[:, col] = a[batch, pivot_rows]
+        a[batch, pivot_rows] = row
+        pivot = a[:, col, col]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factors = a[:, col + 1 :, col] / pivot[:, np.newaxis]
+        factors[pivot == 0.0] = 0.0  # a zero column: there is nothing to eliminate
+        a[:, col + 1 :, col] = factors
+        a[:, col + 1 :, col + 1 :] -= factors[:, :, np.newaxis] * a[:, np.newaxis, col, col + 1 :]
+    return signs
+
+
+def lu_solve(lu: NDArray[np.float64], pivots: NDArray[np.intp], b: NDArray[np.float64]) -> NDArray:
+    """Solve the systems A x = b of a (B, n, n) stack factorized by lu_factor, for the
+    (B, n, k) right hand sides `b`, which are overwritten by the solutions.
+    """
+    batch = np.arange(lu.shape[0])
+    size = lu.shape[1]
+    for col in range(size):  # same row swaps as in the factorization
+        row = b[:, col].copy()
+        b[:, col] = b[batch, pivots[:, col]]
+        b[batch, pivots[:, col]] = row
+    for col in range(1, size):  # forward substitution with L (ones on the diagonal)
+        b[:, col] -= np.einsum("bj,bjk->bk", lu[:, col, :col], b[:, :col])
+    for col in reversed(range(size)):  # back substitution with U
+        b[:, col] -= np.einsum("bj,bjk->bk", lu[:, col, col + 1 :], b[:, col + 1 :])
+        b[:, col] /= lu[:, col, col, np.newaxis]
+    return b
@@ -0,0 +1,126 @@
+"""This module selects the floating point type (float64 or float32) of the batches of
+vectors created by the library.
+
+Batch operations move a lot of memory and do little arithmetic per byte, so halving
+the size of the numbers nearly halves their time, besides their memory. float32 numbers
+only have about 7 significant digits (float64 have about 16), which is plenty for data
+measured with less precision than that, e.g. most sensors.
+
+The precision decides the dtype of new VectorArrays, LinearMapBatch matrices and the
+arrays read by mypackage.io and mypackage.stream. Operations keep the dtype of the
+batch they work on (the matrices of the linear maps are converted to it), so a whole
+pipeline runs in float32 without ever converting its data back to float64.
+
+Rounding errors grow with the precision too, so the tolerance of `Vector.__eq__` (and of
+`VectorArray.isclose`) follows the precision: vectors computed in float32 are equal
+when they agree to about 5 significant digits instead of 9.
+
+Attributes:
+    PRECISIONS (tuple[str, ...]): Names of the available precisions.
+    TOLERANCES (dict[str, tuple[float, float]]): absolute and relative tolerance of the
+        comparisons of vectors for each precision.
+
+Examples:
+    We can use float32 for the whole program
+
+    >>> set_precision("float32")
+
+    or only inside a block of code
+
+    >>> with use_precision("float32"):
+    ...     VectorArray([[1, 2]]).array.dtype
+    dtype('float32')
+
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from mypackage.vector import vector as _vector_module
+
+
+PRECISIONS: tuple[str, ...] = ("float64", "float32")
+TOLERANCES: dict[str, tuple[float, float]] = {
+    "float64": (1e-10, 1e-9),
+    # float32 coordinates up to MAX_NORM = 100 carry rounding errors of about 1e-5
+    "float32": (1e-4, 1e-5),
+}
+
+_precision: str = "float64"
+_dtype: np.dtype = np.dtype(np.float64)
+
+
+def get_precision() -> str:
+    """Return the name of the current precision."""
+    return _precision
+
+
+def get_dtype() -> np.dtype:
+    """Return the dtype of the batches of the current precision."""
+    return _dtype
+
+
+def get_tolerance() -> tuple[float, float]:
+    """Return the absolute and relative tolerance of the comparisons of vectors."""
+    return TOLERANCES[_precision]
+
+
+def set_precision(name: str) -> None:
+    """Select the dtype of new batches and the tolerance of the comparisons.
+
+    Note:
+        Existing batches keep their dtype: convert them with VectorArray.astype.
+
+    Args:
+        name (str): "float64" or "float32".
+
+    Raises:
+        ValueError: Unknown precision.
+    """
+    global _precision, _dtype
+    if name not in PRECISIONS:
+        raise ValueError(f"Precision must be one of {PRECISIONS}, not {name!r}.")
+    _precision, _dtype = name, np.dtype(name)
+    absolute_tolerance, relative_tolerance = TOLERANCES[name]
+    _vector_module._absolute_tolerance = absolute_tolerance
+    _vector_module._relative_tolerance = relative_tolerance
+
+
+@contextmanager
+def use_precision(name: str) -> Iterator[None]:
+    """Context manager to use a precision only inside a block of code.
+
+    Args:
+        name (str): "float64" or "float32".
+    """
+    previous_name = _precision
+    set_precision(name)
+    try:
+        yield
+    finally:
+        set_precision(previous_name)
+
+
+def resolve_dtype(dtype: DTypeLike | None = None) -> np.dtype:
+    """Return the given dtype, which must be float64 or float32, or the dtype of the
+    current precision if it is None.
+
+    Raises:
+        ValueError: The dtype is not float64 nor float32.
+    """
+    if dtype is None:
+        return _dtype
+    dtype = np.dtype(dtype)
+    if dtype.name not in PRECISIONS:
+        raise ValueError(f"The dtype must be one of {PRECISIONS}, not {dtype}.")
+    return dtype.newbyteorder("=")
+
+
+def result_dtype(array: NDArray) -> np.dtype:
+    """Return the dtype of the result of an operation on a batch: its own dtype if it
+    is float64 or float32, or the dtype of the current precision (e.g. for integers).
+    """
+    return array.dtype if array.dtype.name in PRECISIONS else _dtype
@@ -0,0 +1,464 @@
+"""Benchmark suite of the library, also available from the terminal as `vector bench`.
+
+Timing code correctly is harder than it looks. The benchmarks in this module follow
+a few rules so that the numbers can be trusted and compared between runs:
+
+- Inputs are generated before timing, so we measure our code and not the random number
+  generator.
+- Each benchmark is called once before timing (warmup), which fills the caches and
+  compiles the Numba kernels.
+- The number of calls per measurement is increased until a measurement lasts at least
+  `min_time` seconds, so that the resolution of the clock does not matter.
+- Measurements are repeated and we keep all of them. The fastest one is the least
+  disturbed by other programs, so it is the one used to detect regressions.
+
+The scalar benchmarks apply an operation to `size` Vector objects in a loop, while the
+batch benchmarks apply it once to a VectorArray of `size` vectors, so we can compare the
+time per vector of both approaches.
+
+Examples:
+    Benchmark the rotations with the Numba backend, save the results and compare them
+    later with a new run (which fails if something got more than 10% slower):
+
+    >>> vector bench --filter Rotation --backend numba --json baseline.json
+    >>> vector bench --filter Rotation --backend numba --baseline baseline.json
+
+    Measure the gains of float32 batches with respect to the float64 ones:
+
+    >>> vector bench --filter VectorArray --json float64.json
+    >>> vector bench --filter VectorArray --precision float32 --baseline float64.json
+
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import repeat, starmap
+from operator import add, eq, mul
+from timeit import Timer
+from typing import Any, TextIO
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mypackage._version import __version__
+from mypackage.backend import BACKENDS, PRECISIONS, get_backend_name, get_precision
+from mypackage.backend import use_backend, use_precision
+from mypackage.linearmap import LinearMap, Rotation, RotationBatch, Shear
+from mypackage.vector import Vector, VectorArray
+
+
+DEFAULT_SIZES: tuple[int, ...] = tuple(10**exponent for exponent in range(8))  # 1 to 10^7
+MAX_SCALAR_SIZE: int = 100_000  # larger Python loops only make the suite slower
+DEFAULT_THRESHOLD: float = 0.1  # 10% slower than the baseline is a regression
+
+# Coordinates in [-35, 35] have norms below 50, so sums stay below MAX_NORM
+_COORDINATE_RANGE = 35.0
+
+Inputs = tuple[NDArray[np.float64], NDArray[np.float64]]  # two (N, 2) arrays of coordinates
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A benchmark of the suite.
+
+    Attributes:
+        name (str): name of the operation, e.g. "Vector.__add__".
+        kind (str): "scalar" (loop over Vector objects) or "batch" (one VectorArray).
+        make (Callable): function that receives the inputs and returns the function to
+            time. All the preparation (creating vectors, maps...) happens in `make`.
+    """
+
+    name: str
+    kind: str
+    make: Callable[[Inputs], Callable[[], object]]
+
+
+def _consume(iterator: Iterable[object]) -> None:
+    """Run an iterator to the end as fast as possible (the loop runs in C)."""
+    deque(iterator, maxlen=0)
+
+
+def _vectors(inputs: Inputs) -> tuple[list[Vector], list[Vector]]:
+    vectors_1 = [Vector(x, y) for x, y in inputs[0].tolist()]
+    vectors_2 = [Vector(x, y) for x, y in inputs[1].tolist()]
+    return vectors_1, vectors_2
+
+
+def _vector_arrays(inputs: Inputs) -> tuple[VectorArray, VectorArray]:
+    return VectorArray(inputs[0]), VectorArray(inputs[1])
+
+
+def _scalar(operation: Callable[[list[Vector], list[Vector]], Iterable[object]]) -> Callable:
+    """Make a scalar benchmark out of an operation on two lists of vectors."""
+
+    def make(inputs: Inputs) -> Callable[[], None]:
+        vectors_1, vectors_2 = _vectors(inputs)
+        return lambda: _consume(operation(vectors_1, vectors_2))
+
+    return make
+
+
+def _batch(operation: Callable[[VectorArray, VectorArray], object]) -> Callable:
+    """Make a batch benchmark out of an operation on two VectorArrays."""
+
+    def make(inputs: Inputs) -> Callable[[], object]:
+        vectors_1, vectors_2 = _vector_arrays(inputs)
+        return lambda: operation(vectors_1, vectors_2)
+
+    return make
+
+
+def _map_benchmarks(linear_map: LinearMap) -> list[Benchmark]:
+    """Benchmarks of a linear map and its inverse, on vectors and on batches."""
+    name = type(linear_map).__name__
+    return [
+        Benchmark(f"{name}.__call__", "scalar", _scalar(lambda v, _: map(linear_map, v))),
+        Benchmark(f"{name}.inverse", "scalar", _scalar(lambda v, _: map(linear_map.inverse, v))),
+        Benchmark(f"{name}.__call__", "batch", _batch(lambda v, _: linear_map(v))),
+        Benchmark(f"{name}.inverse", "batch", _batch(lambda v, _: linear_map.inverse(v))),
+    ]
+
+
+def _make_vector_init(inputs: Inputs) -> Callable[[], None]:
+    coordinates = inputs[0].tolist()
+    return lambda: _consume(starmap(Vector, coordinates))
+
+
+def _make_rotation_batch_init(inputs: Inputs) -> Callable[[], object]:
+    angles = inputs[0][:, 0]
+    return lambda: RotationBatch(angles)
+
+
+def _make_rotation_batch_call(inputs: Inputs) -> Callable[[], object]:
+    rotations, vectors = RotationBatch(inputs[0][:, 0]), VectorArray(inputs[1])
+    return lambda: rotations(vectors)
+
+
+BENCHMARKS: tuple[Benchmark, ...] = (
+    Benchmark("Vector.__init__", "scalar", _make_vector_init),
+    Benchmark("Vector.__add__", "scalar", _scalar(lambda v, w: map(add, v, w))),
+    Benchmark("Vector.__mul__(float)", "scalar", _scalar(lambda v, _: map(mul, v, repeat(0.5)))),
+    Benchmark("Vector.__mul__(Vector)", "scalar", _scalar(lambda v, w: map(mul, v, w))),
+    Benchmark("Vector.__eq__", "scalar", _scalar(lambda v, w: map(eq, v, w))),
+    Benchmark("Vector.projection", "scalar", _scalar(lambda v, w: map(Vector.projection, v, w))),
+    Benchmark("VectorArray.__init__", "batch", lambda inputs: lambda: VectorArray(inputs[0])),
+    Benchmark("VectorArray.__add__", "batch", _batch(lambda v, w: v + w)),
+    Benchmark("VectorArray.__mul__(float)", "batch", _batch(lambda v, _: v * 0.5)),
+    Benchmark("VectorArray.__mul__(VectorArray)", "batch", _batch(lambda v, w: v * w)),
+    Benchmark("VectorArray.__eq__", "batch", _batch(lambda v, w: v == w)),
+    Benchmark("VectorArray.projection", "batch", _batch(lambda v, w: v.projection(w))),
+    *_map_benchmarks(Rotation(0.5)),
+    *_map_benchmarks(Shear(1.3)),  # shear factor cot(1.3) = 0.28 keeps norms below MAX_NORM
+    # One rotation per vector, with the first coordinates as angles
+    Benchmark("RotationBatch.__init__", "batch", _make_rotation_batch_init),
+    Benchmark("RotationBatch.__call__", "batch", _make_rotation_batch_call),
+)
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of a benchmark for a given number of vectors.
+
+    Attributes:
+        name (str): name of the operation.
+        kind (str): "scalar" or "batch".
+        size (int): number of vectors processed per call.
+        number (int): calls per measurement.
+        times (list[float]): seconds per call of each measurement.
+    """
+
+    name: str
+    kind: str
+    size: int
+    number: int
+    times: list[float] = field(repr=False)
+
+    @property
+    def key(self) -> str:
+        """str: unique identifier of the benchmark, used to compare runs."""
+        return f"{self.name} [{self.kind}, {self.size}]"
+
+    @property
+    def best(self) -> float:
+        """float: fastest time per call."""
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        """float: median time per call."""
+        return statistics.median(self.times)
+
+    @property
+    def stdev(self) -> float:
+        """float: standard deviation of the time per call (0 for a single measurement)."""
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+    @property
+    def per_vector(self) -> float:
+        """float: fastest time per vector."""
+        return self.best / self.size
+
+    def to_dict(self) -> dict[str, Any]:
+        """Measurements and statistics, ready to be saved as JSON."""
+        statistics_ = {"best": self.best, "median": self.median, "stdev": self.stdev}
+        return {**asdict(self), **statistics_, "per_vector": self.per_vector}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BenchmarkResult:
+        """Recover a result saved with `to_dict` (the statistics are recomputed)."""
+        return cls(data["name"], data["kind"], data["size"], data["number"], data["times"])
+
+
+def _measure(
+    function: Callable[[], object], repeat: int, min_time: float
+) -> tuple[int, list[float]]:
+    """Time a function after a warmup call.
+
+    Returns:
+        tuple[int, list[float]]: calls per measurement and seconds per call of each
+            of the `repeat` measurements.
+    """
+    function()  # warmup
+    timer = Timer(function)  # timing a function (not a string) needs no setup code
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time:
+        # Aim a bit above min_time, but never grow more than 10 times per step
+        number = max(number + 1, min(10 * number, math.ceil(1.2 * number * min_time / elapsed)))
+    times = [seconds / number for seconds in timer.repeat(repeat, number)]
+    return number, times
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    pattern: str | None = None,
+    repeat: int = 5,
+    min_time: float = 0.05,
+    max_scalar_size: int = MAX_SCALAR_SIZE,
+    seed: int = 0,
+    progress: TextIO | None = None,
+) -> list[BenchmarkResult]:
+    """Run the benchmarks of the suite.
+
+    Args:
+        sizes (Sequence[int], optional): numbers of vectors to try. Defaults to 1 to 10^7.
+        pattern (str, optional): regular expression; only the benchmarks whose name
+            matches it are run. Defaults to None (all of them).
+        repeat (int, optional): number of measurements. Defaults to 5.
+        min_time (float, optional): minimum duration of a measurement in seconds.
+        max_scalar_size (int, optional): largest size of the scalar benchmarks.
+        seed (int, optional): seed of the random inputs, the same for every run.
+        progress (TextIO, optional): where each result is printed as soon as it is
+            ready. Defaults to None.
+
+    Returns:
+        list[BenchmarkResult]: the measurements of each benchmark and size.
+    """
+    benchmarks = [b for b in BENCHMARKS if pattern is None or re.search(pattern, b.name)]
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        shape = (size, 2)
+        inputs = (
+            rng.uniform(-_COORDINATE_RANGE, _COORDINATE_RANGE, shape),
+            rng.uniform(-_COORDINATE_RANGE, _COORDINATE_RANGE, shape),
+        )
+        for benchmark in benchmarks:
+            if benchmark.kind == "scalar" and size > max_scalar_size:
+                continue
+            function = benchmark.make(inputs)
+            number, times = _measure(function, repeat, min_time)
+            result = BenchmarkResult(benchmark.name, benchmark.kind, size, number, times)
+            results.append(result)
+            if progress is not None:
+                print(_format_row(result), file=progress, flush=True)
+            del function  # free the inputs prepared by make before the next benchmark
+    return results
+
+
+def _format_time(seconds: float) -> str:
+    """Format a duration with the most readable unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+_HEADER = f"{'benchmark':<52} {'best':>10} {'median':>10} {'stdev':>10} {'per vector':>11}"
+
+
+def _format_row(result: BenchmarkResult) -> str:
+    return (
+        f"{result.key:<52} {_format_time(result.best):>10} {_format_time(result.median):>10} "
+        f"{_format_time(result.stdev):>10} {_format_time(result.per_vector):>11}"
+    )
+
+
+def format_results(results: Iterable[BenchmarkResult]) -> str:
+    """Table with the statistics of each benchmark."""
+    return "\n".join([_HEADER, *map(_format_row, results)])
+
+
+def save_results(path: str | os.PathLike[str], results: Iterable[BenchmarkResult]) -> None:
+    """Save the results as JSON, together with the environment where they were measured."""
+    metadata = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "mypackage": __version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "backend": get_backend_name(),
+        "precision": get_precision(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+    data = {"metadata": metadata, "results": [result.to_dict() for result in results]}
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_results(path: str | os.PathLike[str]) -> list[BenchmarkResult]:
+    """Load the results saved with `save_results`."""
+    with open(path) as file:
+        data = json.load(file)
+    return [BenchmarkResult.from_dict(result) for result in data["results"]]
+
+
+@dataclass
+class Comparison:
+    """Comparison of a benchmark with its baseline.
+
+    Attributes:
+        key (str): identifier of the benchmark.
+        baseline (float): best time per call of the baseline.
+        current (float): best time per call of the current run.
+        threshold (float): relative slowdown tolerated.
+    """
+
+    key: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        """float: current time divided by the baseline time (above 1 means slower)."""
+        return self.current / self.baseline
+
+    @property
+    def regression(self) -> bool:
+        """bool: whether the benchmark is slower than the baseline beyond the threshold."""
+        return self.ratio > 1 + self.threshold
+
+    def __str__(self) -> str:
+        status = "REGRESSION" if self.regression else "ok"
+        return (
+            f"{self.key:<52} {_format_time(self.baseline):>10} -> "
+            f"{_format_time(self.current):>10} ({self.ratio:6.2f}x) {status}"
+        )
+
+
+def compare(
+    results: Iterable[BenchmarkResult],
+    baseline: Iterable[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """Compare the benchmarks present in both runs.
+
+    Args:
+        results (Iterable[BenchmarkResult]): current run.
+        baseline (Iterable[BenchmarkResult]): reference run.
+        threshold (float, optional): relative slowdown tolerated. Defaults to 0.1 (10%).
+
+    Returns:
+        list[Comparison]: one comparison for each benchmark of the current run that
+            is also in the baseline.
+    """
+    baseline_times = {result.key: result.best for result in baseline}
+    return [
+        Comparison(result.key, baseline_times[result.key], result.best, threshold)
+        for result in results
+        if result.key in baseline_times
+    ]
+
+
+def build_parser() -> ArgumentParser:
+    """Create the parser of the `vector bench` arguments."""
+    parser = ArgumentParser(prog="vector bench", description="Run the benchmark suite.")
+    parser.add_argument("--filter", metavar="REGEX", help="only run the matching benchmarks")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=DEFAULT_SIZES,
+        metavar="N",
+        help="numbers of vectors (default: powers of 10 from 1 to 10^7)",
+    )
+    parser.add_argument(
+        "--max-scalar-size",
+        type=int,
+        default=MAX_SCALAR_SIZE,
+        help="largest size of the scalar benchmarks (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per benchmark")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="minimum seconds per measurement"
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="numpy", help="batch kernels")
+    parser.add_argument(
+        "--precision", choices=PRECISIONS, default="float64", help="dtype of the batches"
+    )
+    parser.add_argument("--json", metavar="FILE", help="save the results to this file")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with these results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown considered a regression (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Returns:
+        int: exit status, 1 if there are regressions with respect to the baseline.
+    """
+    args = build_parser().parse_args(argv)
+    baseline = load_results(args.baseline) if args.baseline else None  # fail fast
+
+    print(_HEADER)
+    start_time = time.perf_counter()
+    with use_backend(args.backend), use_precision(args.precision):
+        results = run_benchmarks(
+            args.sizes,
+            args.filter,
+            args.repeat,
+            args.min_time,
+            args.max_scalar_size,
+            progress=sys.stdout,
+        )
+        if args.json:
+            save_results(args.json, results)
+    print(f"{len(results)} benchmarks in {time.perf_counter() - start_time:.1f} s")
+
+    if baseline is None:
+        return 0
+    comparisons = compare(results, baseline, args.threshold)
+    print(f"\nComparison with {args.baseline}:")
+    print("\n".join(map(str, comparisons)))
+    regressions = sum(comparison.regression for comparison in comparisons)
+    print(f"{regressions} regressions out of {len(comparisons)} benchmarks")
+    return 1 if regressions else 0
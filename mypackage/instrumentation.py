@@ -0,0 +1,251 @@
+"""This module collects statistics of the library while it runs: how many vectors are
+created, how many NormErrors are raised, how much time is spent applying linear maps
+(and their inverses) and how big the batches given to them are.
+
+A profiler like pyinstrument (see examples/8-profiling.py) tells us where the time goes
+in a script, but it slows the program down and we cannot leave it on in production.
+These statistics are cheap and can be turned on and off while the program runs.
+
+Note:
+    When the instrumentation is enabled, the methods we measure are replaced by wrapped
+    versions that update the statistics before calling the original ones; disabling it
+    puts the original methods back. That is why, when disabled, the cost is exactly zero:
+    the code that runs is the same as if this module did not exist.
+
+    The statistics are plain dictionaries updated without locks. Counts coming from
+    several threads at once may be slightly off, which is fine for monitoring.
+
+Examples:
+    Collect statistics only inside a block of code:
+
+    >>> with collect() as stats:
+    ...     Rotation(0.5)(VectorArray.zeros(1000))
+    ...     Rotation(0.5)(Vector(1, 0))
+    >>> stats.snapshot()["histograms"]
+    {'LinearMap.__call__': {'1': 1, '1000': 1}}
+
+    Or enable them for the whole program and export them periodically:
+
+    >>> enable()
+    >>> print(to_json())
+
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from collections.abc import Callable
+from functools import wraps
+from types import TracebackType
+from typing import Any
+
+from mypackage.linearmap import LinearMap
+from mypackage.vector import vector as _vector_module
+from mypackage.vector.vector import NormError, Vector
+
+
+# Names of the statistics
+VECTORS_VALIDATED = "Vector.__init__"  # vectors created with their norm checked
+VECTORS_TRUSTED = "Vector (trusted)"  # vectors created internally without the check
+NORM_ERRORS = "NormError"
+MAP_CALL = "LinearMap.__call__"
+MAP_INVERSE = "LinearMap.inverse"
+
+_counters: Counter[str] = Counter()
+_seconds: Counter[str] = Counter()  # cumulative time of each timer
+_histograms: dict[str, Counter[int]] = {MAP_CALL: Counter(), MAP_INVERSE: Counter()}
+
+# (owner, attribute name, original value) of every patched attribute
+_originals: list[tuple[Any, str, Any]] = []
+
+
+def _size_bucket(size: int) -> int:
+    """Round a batch size up to a power of 10 (1, 10, 100...), the bins of the histograms."""
+    return 1 if size <= 1 else 10 ** len(str(size - 1))
+
+
+def _count_calls(function: Callable, name: str) -> Callable:
+    @wraps(function)
+    def counted(*args: Any, **kwargs: Any) -> Any:
+        _counters[name] += 1
+        return function(*args, **kwargs)
+
+    return counted
+
+
+def _time_map_calls(method: Callable, name: str) -> Callable:
+    """Wrap LinearMap.__call__ or LinearMap.inverse to count and time the calls and
+    record the size of the batches (1 for a single Vector).
+    """
+    histogram = _histograms[name]
+
+    @wraps(method)
+    def timed(self: LinearMap, vector: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return method(self, vector, *args, **kwargs)
+        finally:
+            _seconds[name] += time.perf_counter() - start
+            _counters[name] += 1
+            histogram[1 if isinstance(vector, Vector) else _size_bucket(len(vector))] += 1
+
+    return timed
+
+
+def _linear_map_classes() -> list[type]:
+    """LinearMap and all its subclasses, since they may override the measured methods."""
+    classes, pending = [], [LinearMap]
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _patch(owner: Any, name: str, wrapper: Callable) -> None:
+    """Replace an attribute of a class or module, remembering the original."""
+    _originals.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, wrapper)
+
+
+def is_enabled() -> bool:
+    """Whether the statistics are being collected."""
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Start collecting statistics (the ones collected so far are kept)."""
+    if is_enabled():
+        return
+    _patch(Vector, "__init__", _count_calls(Vector.__init__, VECTORS_VALIDATED))
+    # Internal vectors skip __init__, but all of them are allocated by this function
+    new_object = _vector_module._new_object
+    _patch(_vector_module, "_new_object", _count_calls(new_object, VECTORS_TRUSTED))
+    _patch(NormError, "__init__", _count_calls(NormError.__init__, NORM_ERRORS))
+    for cls in _linear_map_classes():
+        if "__call__" in cls.__dict__:
+            _patch(cls, "__call__", _time_map_calls(cls.__dict__["__call__"], MAP_CALL))
+        if "inverse" in cls.__dict__:
+            _patch(cls, "inverse", _time_map_calls(cls.__dict__["inverse"], MAP_INVERSE))
+
+
+def disable() -> None:
+    """Stop collecting statistics, restoring the original methods."""
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+
+
+def reset() -> None:
+    """Set all the statistics to zero."""
+    _counters.clear()
+    _seconds.clear()
+    for histogram in _histograms.values():
+        histogram.clear()
+
+
+def _snapshot(
+    counters: Counter[str], seconds: Counter[str], histograms: dict[str, Counter[int]]
+) -> dict[str, Any]:
+    return {
+        "enabled": is_enabled(),
+        "counters": {name: counters[name] for name in sorted(counters) if counters[name]},
+        "timers": {
+            name: {"calls": counters[name], "seconds": seconds[name]}
+            for name in sorted(seconds)
+            if counters[name]
+        },
+        "histograms": {
+            name: {str(bucket): histogram[bucket] for bucket in sorted(histogram)}
+            for name, histogram in histograms.items()
+            if histogram
+        },
+    }
+
+
+def snapshot() -> dict[str, Any]:
+    """Current statistics as a dictionary.
+
+    Returns:
+        dict: with the keys
+            - "enabled": whether the statistics are being collected,
+            - "counters": number of vectors created (validated or trusted), NormErrors
+              and calls to the linear maps,
+            - "timers": calls and cumulative seconds of LinearMap.__call__ and inverse,
+            - "histograms": number of calls of the linear maps for each batch size,
+              rounded up to a power of 10 (JSON keys are strings, so they are too).
+    """
+    return _snapshot(_counters, _seconds, _histograms)
+
+
+def to_json(indent: int | None = 2) -> str:
+    """Current statistics as a JSON string (see `snapshot`)."""
+    return json.dumps(snapshot(), indent=indent)
+
+
+def collect() -> Collection:
+    """Context manager to collect statistics only inside a block of code.
+
+    Examples:
+        >>> with collect() as stats:
+        ...     Vector(1, 2) + Vector(3, 4)
+        >>> stats.snapshot()["counters"]
+        {'Vector.__init__': 3}
+
+    """
+    return Collection()
+
+
+class Collection:
+    """Statistics collected inside a `with collect()` block.
+
+    Note:
+        The statistics of the block are the difference between the global statistics
+        at the end and at the start of the block, so blocks can be nested and other
+        code that reads the global statistics is not disturbed. When the block ends,
+        the instrumentation is disabled again unless it was already enabled.
+    """
+
+    def __init__(self) -> None:
+        self._was_enabled = False
+        self._start: tuple[Counter[str], Counter[str], dict[str, Counter[int]]] | None = None
+        self._end: tuple[Counter[str], Counter[str], dict[str, Counter[int]]] | None = None
+
+    @staticmethod
+    def _copy() -> tuple[Counter[str], Counter[str], dict[str, Counter[int]]]:
+        histograms = {name: histogram.copy() for name, histogram in _histograms.items()}
+        return _counters.copy(), _seconds.copy(), histograms
+
+    def __enter__(self) -> Collection:
+        self._was_enabled = is_enabled()
+        self._start, self._end = self._copy(), None
+        enable()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._end = self._copy()
+        if not self._was_enabled:
+            disable()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Statistics collected inside the block (so far, if it has not ended)."""
+        if self._start is None:
+            raise RuntimeError("The statistics are collected inside a `with collect()` block.")
+        counters, seconds, histograms = self._end or self._copy()
+        start_counters, start_seconds, start_histograms = self._start
+        return _snapshot(
+            counters - start_counters,
+            seconds - start_seconds,
+            {name: histograms[name] - start_histograms[name] for name in histograms},
+        )
+
+    def to_json(self, indent: int | None = 2) -> str:
+        """Statistics collected inside the block as a JSON string."""
+        return json.dumps(self.snapshot(), indent=indent)
@@ -0,0 +1,16 @@
+"""To import from the text.py, binary.py and chunked.py modules we can also type
+from mypackage.io.text import transform_text
+"""
+
+from .binary import create_vectors, load_vectors, open_vectors, read_header, save_vectors
+from .chunked import (
+    Summary,
+    TransformStats,
+    centroid,
+    count_norm_violations,
+    iter_chunks,
+    max_norm,
+    summarize,
+    transform_file,
+)
+from .text import StreamStats, transform_text
@@ -0,0 +1,213 @@
+"""This module reads and writes vectors in a compact binary file format.
+
+Unlike pickle files, these files contain nothing but numbers, so they are safe to open,
+take 16 (or 8) bytes per vector, and can be memory-mapped: opening a file of several
+gigabytes takes milliseconds because the operating system only reads the pages of the
+file that are actually accessed.
+
+File format (version 1), all values little-endian:
+
+    | offset | size | content                                              |
+    |--------|------|------------------------------------------------------|
+    | 0      | 4    | magic bytes b"VECS"                                  |
+    | 4      | 2    | format version (unsigned integer, currently 1)       |
+    | 6      | 1    | dtype code: b"d" (float64) or b"f" (float32)         |
+    | 7      | 1    | reserved (zero)                                      |
+    | 8      | 8    | number of vectors N (unsigned integer)               |
+    | 16     | 16   | reserved (zeros), so the data starts 32-byte aligned |
+    | 32     | 2N*s | coordinates x0 y0 x1 y1 ... (s = 8 or 4 bytes each)  |
+
+The data is exactly the memory layout of an (N, 2) C-contiguous NumPy array (the
+layout of VectorArray), so it is mapped without any copy or conversion.
+
+Examples:
+    >>> save_vectors("points.vec", VectorArray([[1, 0], [0, 1]]))
+    >>> load_vectors("points.vec")
+    VectorArray([[1.0, 0.0], [0.0, 1.0]])
+
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from mypackage.backend.precision import get_dtype
+from mypackage.vector import Vector, VectorArray
+
+
+MAGIC: bytes = b"VECS"
+VERSION: int = 1
+HEADER_SIZE: int = 32
+_HEADER_FORMAT = "<4sHcxQ16x"  # see the table in the module docstring
+_DTYPE_CODES: dict[bytes, np.dtype] = {b"d": np.dtype("<f8"), b"f": np.dtype("<f4")}
+
+PathLike = str | os.PathLike[str]  # type alias for file paths
+
+
+@dataclass(frozen=True)
+class VectorFileHeader:
+    """Header of a binary vector file.
+
+    Attributes:
+        version (int): version of the file format.
+        dtype (np.dtype): type of the coordinates (little-endian float64 or float32).
+        count (int): number of vectors in the file.
+    """
+
+    version: int
+    dtype: np.dtype
+    count: int
+
+    def to_bytes(self) -> bytes:
+        """Pack the header in its HEADER_SIZE bytes."""
+        code = next(code for code, dtype in _DTYPE_CODES.items() if dtype == self.dtype)
+        return struct.pack(_HEADER_FORMAT, MAGIC, self.version, code, self.count)
+
+    @classmethod
+    def from_bytes(cls, header: bytes) -> VectorFileHeader:
+        """Unpack and check a header.
+
+        Raises:
+            ValueError: Not a vector file, or an unsupported version or dtype.
+        """
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+            raise ValueError("Not a binary vector file (wrong magic bytes).")
+        _, version, code, count = struct.unpack(_HEADER_FORMAT, header[:HEADER_SIZE])
+        if version != VERSION:
+            raise ValueError(f"Unsupported vector file version {version}.")
+        if code not in _DTYPE_CODES:
+            raise ValueError(f"Unsupported dtype code {code!r}.")
+        return cls(version, _DTYPE_CODES[code], count)
+
+
+def _file_dtype(dtype: DTypeLike) -> np.dtype:
+    """Little-endian version of the dtype, which must be float64 or float32."""
+    file_dtype = np.dtype(dtype).newbyteorder("<")
+    if file_dtype not in _DTYPE_CODES.values():
+        raise ValueError(f"The dtype must be float64 or float32, not {np.dtype(dtype)}.")
+    return file_dtype
+
+
+def read_header(path: PathLike) -> VectorFileHeader:
+    """Read the header of a binary vector file.
+
+    Raises:
+        ValueError: Not a vector file, or the file is shorter than the header says.
+    """
+    with open(path, "rb") as file:
+        header = VectorFileHeader.from_bytes(file.read(HEADER_SIZE))
+    expected_size = HEADER_SIZE + header.count * 2 * header.dtype.itemsize
+    if os.path.getsize(path) < expected_size:
+        raise ValueError(f"Truncated vector file: expected {expected_size} bytes.")
+    return header
+
+
+def save_vectors(
+    path: PathLike,
+    vectors: Vector | VectorArray | NDArray[np.floating],
+    dtype: DTypeLike | None = None,
+) -> None:
+    """Write a vector or a batch of vectors to a binary vector file.
+
+    Args:
+        path (str | PathLike): file to write.
+        vectors (Vector | VectorArray | NDArray): a single Vector, a VectorArray or an
+            (N, 2) array of coordinates.
+        dtype (DTypeLike, optional): np.float64 or np.float32. Defaults to None, which
+            uses the current precision (see mypackage.backend.precision).
+
+    Raises:
+        ValueError: Unsupported dtype, or the array does not have shape (N, 2).
+    """
+    if isinstance(vectors, Vector):
+        array = np.array([[vectors.x, vectors.y]])
+    elif isinstance(vectors, VectorArray):
+        array = vectors.array
+    else:
+        array = np.asarray(vectors)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"The vectors must have shape (N, 2), but got {array.shape}.")
+
+    file_dtype = _file_dtype(get_dtype() if dtype is None else dtype)
+    header = VectorFileHeader(VERSION, file_dtype, len(array))
+    with open(path, "wb") as file:
+        file.write(header.to_bytes())
+        # tofile writes the raw bytes of the array, without any intermediate copy
+        np.ascontiguousarray(array, dtype=file_dtype).tofile(file)
+
+
+def create_vectors(path: PathLike, count: int, dtype: DTypeLike | None = None) -> np.memmap:
+    """Create a binary vector file of `count` vectors and memory-map it for writing.
+
+    Note:
+        This is the way to write files that do not fit in memory: fill the returned
+        array chunk by chunk and call its `flush` method (or delete it) when done.
+
+    Args:
+        path (str | PathLike): file to create.
+        count (int): number of vectors.
+        dtype (DTypeLike, optional): np.float64 or np.float32. Defaults to None (the
+            current precision).
+
+    Returns:
+        np.memmap: writable (count, 2) array mapped to the data of the file.
+    """
+    file_dtype = _file_dtype(get_dtype() if dtype is None else dtype)
+    with open(path, "wb") as file:
+        file.write(VectorFileHeader(VERSION, file_dtype, count).to_bytes())
+        file.truncate(HEADER_SIZE + count * 2 * file_dtype.itemsize)  # allocate the data
+    if count == 0:  # memmap cannot map zero bytes
+        return np.empty((0, 2), dtype=file_dtype)  # type: ignore[return-value]
+    return np.memmap(path, dtype=file_dtype, mode="r+", offset=HEADER_SIZE, shape=(count, 2))
+
+
+def open_vectors(path: PathLike, mode: str = "r") -> np.memmap:
+    """Memory-map the vectors of a binary vector file without reading them.
+
+    Args:
+        path (str | PathLike): file to open.
+        mode (str, optional): "r" (read only, default), "r+" (read and write) or
+            "c" (copy on write: changes stay in memory).
+
+    Returns:
+        np.memmap: (N, 2) array mapped to the data of the file.
+    """
+    header = read_header(path)
+    if header.count == 0:
+        return np.empty((0, 2), dtype=header.dtype)  # type: ignore[return-value]
+    return np.memmap(
+        path, dtype=header.dtype, mode=mode, offset=HEADER_SIZE, shape=(header.count, 2)
+    )
+
+
+def load_vectors(path: PathLike, validate: bool = False) -> VectorArray:
+    """Load a binary vector file as a VectorArray backed by a read-only memory map.
+
+    Note:
+        Files with the dtype of the current precision (see mypackage.backend.precision)
+        are mapped without copying. Other files are converted to it (which reads the
+        whole file into memory).
+
+    Args:
+        path (str | PathLike): file to load.
+        validate (bool, optional): check every norm against MAX_NORM, which reads
+            the whole file. Defaults to False.
+
+    Returns:
+        VectorArray: The vectors of the file.
+
+    Raises:
+        NormError: validate is True and some vectors are too big.
+    """
+    array = open_vectors(path)
+    if array.dtype != get_dtype():
+        array = array.astype(get_dtype())
+    vectors = VectorArray._from_trusted(array)
+    if validate:
+        vectors.validate()
+    return vectors
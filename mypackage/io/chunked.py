@@ -0,0 +1,290 @@
+"""This module processes datasets of vectors that do not fit in memory.
+
+The vectors are read from a binary vector file (see binary.py) or a NumPy `.npy` file
+in chunks of a fixed number of vectors, so the memory used depends on the chunk size
+and not on the size of the dataset.
+
+Note:
+    We read the files with plain `readinto` calls into a preallocated buffer instead of
+    memory-mapping them: the pages of a memory map count as memory of our process until
+    the operating system decides to evict them, while a buffer is reused chunk after chunk.
+
+Examples:
+    Rotate a dataset into a new file and compute some statistics of the result:
+
+    >>> stats = transform_file("points.vec", Rotation(0.5), "rotated.vec")
+    >>> print(stats)
+    50000000 vectors in 0.98 s (51.1 M vectors/s, 817.6 MB/s)
+    >>> summarize("rotated.vec")
+    Summary(count=50000000, max_norm=70.705, norm_violations=0, centroid=(-0.0038, -0.0011))
+
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+from numpy.lib import format as npy_format
+from numpy.typing import NDArray
+
+from mypackage.backend.precision import PRECISIONS, get_dtype
+from mypackage.vector.vector import MAX_NORM
+
+from .binary import HEADER_SIZE, VERSION, VectorFileHeader, read_header
+
+if TYPE_CHECKING:
+    from mypackage.linearmap import LinearMap
+
+    from .binary import PathLike
+
+
+DEFAULT_CHUNK_SIZE: int = 1 << 20  # vectors per chunk (16 MB of float64 coordinates)
+
+
+def _locate_data(path: PathLike) -> tuple[int, np.dtype, int]:
+    """Return the offset of the data in the file, its dtype and the number of vectors.
+
+    Raises:
+        ValueError: The file does not contain an (N, 2) C-ordered array of vectors.
+    """
+    if not os.fspath(path).endswith(".npy"):
+        header = read_header(path)
+        return HEADER_SIZE, header.dtype, header.count
+
+    with open(path, "rb") as file:
+        version = npy_format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy_format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = npy_format.read_array_header_2_0(file)
+        offset = file.tell()
+    if len(shape) != 2 or shape[1] != 2 or fortran_order:
+        raise ValueError(f"The .npy file must hold a C-ordered (N, 2) array, not {shape}.")
+    return offset, dtype, shape[0]
+
+
+def _read_chunks(
+    source: PathLike | NDArray[np.floating], chunk_size: int, reuse_buffer: bool
+) -> Iterator[NDArray[np.floating]]:
+    """Yield chunks of at most chunk_size vectors. Arrays are sliced (no copies) and files
+    are read either into a single reusable buffer or into a new array for each chunk.
+    """
+    if isinstance(source, np.ndarray):
+        if source.ndim != 2 or source.shape[1] != 2:
+            raise ValueError(f"The vectors must have shape (N, 2), but got {source.shape}.")
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]
+        return
+
+    offset, dtype, count = _locate_data(source)
+    buffer = np.empty((min(chunk_size, count), 2), dtype=dtype)
+    with open(source, "rb") as file:
+        file.seek(offset)
+        for start in range(0, count, chunk_size):
+            size = min(chunk_size, count - start)
+            chunk = buffer[:size] if reuse_buffer else np.empty((size, 2), dtype=dtype)
+            if file.readinto(chunk) != chunk.nbytes:  # type: ignore[arg-type]
+                raise ValueError(f"Truncated file {os.fspath(source)!r}.")
+            yield chunk
+
+
+def iter_chunks(
+    source: PathLike | NDArray[np.floating], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[NDArray[np.floating]]:
+    """Yield consecutive chunks of at most chunk_size vectors of a dataset.
+
+    Args:
+        source (str | PathLike | NDArray): `.npy` or binary vector file, or an (N, 2) array
+            (whose chunks are views, not copies).
+        chunk_size (int, optional): number of vectors per chunk.
+
+    Raises:
+        ValueError: The chunk size is not positive (raised right away), the dataset does
+            not hold (N, 2) vectors, or the file is truncated.
+    """
+    _check_chunk_size(chunk_size)  # not a generator itself, so this runs when called
+    return _read_chunks(source, chunk_size, reuse_buffer=False)
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    """Raise a ValueError unless the chunk size is positive."""
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, not {chunk_size}.")
+
+
+def _file_dtype(output_path: PathLike, dtype: np.dtype) -> np.dtype:
+    """dtype of the coordinates written to a `.npy` file (any byte order, which its header
+    records) or to a binary vector file (always little-endian).
+    """
+    return dtype if os.fspath(output_path).endswith(".npy") else dtype.newbyteorder("<")
+
+
+def _write_header(file: BinaryIO, output_path: PathLike, dtype: np.dtype, count: int) -> None:
+    """Write the header of a `.npy` or binary vector file, whose data has the given dtype
+    (see _file_dtype).
+    """
+    if os.fspath(output_path).endswith(".npy"):
+        header = {"descr": npy_format.dtype_to_descr(dtype), "fortran_order": False}
+        npy_format.write_array_header_1_0(file, {**header, "shape": (count, 2)})
+    else:
+        file.write(VectorFileHeader(VERSION, dtype, count).to_bytes())
+
+
+@dataclass
+class TransformStats:
+    """Throughput of an out-of-core transformation.
+
+    Attributes:
+        vectors (int): number of vectors transformed.
+        seconds (float): wall-clock time spent.
+        bytes (int): number of bytes read.
+    """
+
+    vectors: int
+    seconds: float
+    bytes: int
+
+    @property
+    def vectors_per_second(self) -> float:
+        """float: number of vectors transformed per second."""
+        return self.vectors / self.seconds if self.seconds > 0 else math.inf
+
+    def __str__(self) -> str:
+        megabytes_per_second = self.bytes / 1e6 / self.seconds if self.seconds > 0 else math.inf
+        return (
+            f"{self.vectors} vectors in {self.seconds:.2f} s "
+            f"({self.vectors_per_second / 1e6:.1f} M vectors/s, {megabytes_per_second:.1f} MB/s)"
+        )
+
+
+def transform_file(
+    source: PathLike | NDArray[np.floating],
+    linear_map: LinearMap,
+    output_path: PathLike,
+    inverse: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> TransformStats:
+    """Apply a linear map (or its inverse) to a dataset, chunk by chunk, writing the
+    result to a new file with the same dtype (float32 or float64).
+
+    Note:
+        Each chunk of a file is read into the same buffer, transformed in place by
+        the backend kernel and written, so the memory used is a single chunk. The
+        vectors are treated as plain coordinates: their norms are not checked.
+
+        The kernels work on floats in the byte order of the machine, so other
+        coordinates are converted chunk by chunk: integers (and other types) to the
+        dtype of the current precision, and big-endian floats to native ones.
+
+    Args:
+        source (str | PathLike | NDArray): `.npy` or binary vector file, or an (N, 2) array.
+        linear_map (LinearMap): map to apply.
+        output_path (str | PathLike): file to create, a `.npy` file if it has that
+            suffix and a binary vector file otherwise.
+        inverse (bool, optional): apply the inverse of the map instead. Defaults to False.
+        chunk_size (int, optional): number of vectors processed at once.
+
+    Returns:
+        TransformStats: Number of vectors transformed and throughput.
+
+    Raises:
+        ValueError: The chunk size is not positive, or the dataset is not valid (see
+            iter_chunks).
+    """
+    _check_chunk_size(chunk_size)
+    start_time = time.perf_counter()
+    if isinstance(source, np.ndarray):
+        dtype, count = source.dtype, len(source)
+    else:
+        _, dtype, count = _locate_data(source)
+    work_dtype = np.dtype(dtype.name if dtype.name in PRECISIONS else get_dtype())
+    file_dtype = _file_dtype(output_path, work_dtype)
+
+    transform = linear_map.inverse if inverse else linear_map
+    with open(output_path, "wb") as file:
+        _write_header(file, output_path, file_dtype, count)
+        # Chunks from files live in our own buffer, so we can transform them in place
+        reuse_buffer = not isinstance(source, np.ndarray)
+        for chunk in _read_chunks(source, chunk_size, reuse_buffer):
+            owned = reuse_buffer
+            if chunk.dtype != work_dtype:
+                chunk = chunk.astype(work_dtype)  # a new array, which we can overwrite
+                owned = True
+            result = transform(chunk, out=chunk if owned else None)
+            file.write(result.astype(file_dtype, copy=False))
+
+    seconds = time.perf_counter() - start_time
+    return TransformStats(count, seconds, count * 2 * dtype.itemsize)
+
+
+@dataclass
+class Summary:
+    """Statistics of a dataset computed in a single pass.
+
+    Attributes:
+        count (int): number of vectors.
+        max_norm (float): largest norm (nan for an empty dataset).
+        norm_violations (int): number of vectors with a norm greater than MAX_NORM.
+        centroid (tuple[float, float]): mean of the vectors (nan for an empty dataset).
+    """
+
+    count: int
+    max_norm: float
+    norm_violations: int
+    centroid: tuple[float, float]
+
+
+def summarize(
+    source: PathLike | NDArray[np.floating], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Summary:
+    """Compute the max norm, the number of MAX_NORM violations and the centroid of a
+    dataset in a single read-only pass over its chunks.
+
+    Raises:
+        ValueError: The chunk size is not positive, or the dataset is not valid (see
+            iter_chunks).
+    """
+    _check_chunk_size(chunk_size)
+    count, violations = 0, 0
+    largest_squared_norm = -math.inf
+    sum_x, sum_y = 0.0, 0.0
+    for chunk in _read_chunks(source, chunk_size, reuse_buffer=True):
+        coordinates = np.asarray(chunk, dtype=np.float64)  # no copy for float64 data
+        squared_norms = np.einsum("ij,ij->i", coordinates, coordinates)
+        count += len(coordinates)
+        largest_squared_norm = max(largest_squared_norm, float(squared_norms.max()))
+        violations += int(np.count_nonzero(squared_norms > MAX_NORM**2))
+        sum_x += float(coordinates[:, 0].sum())
+        sum_y += float(coordinates[:, 1].sum())
+
+    if count == 0:
+        return Summary(0, math.nan, 0, (math.nan, math.nan))
+    mean = (sum_x / count, sum_y / count)
+    return Summary(count, math.sqrt(largest_squared_norm), violations, mean)
+
+
+def max_norm(
+    source: PathLike | NDArray[np.floating], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> float:
+    """Largest norm of the vectors of a dataset."""
+    return summarize(source, chunk_size).max_norm
+
+
+def count_norm_violations(
+    source: PathLike | NDArray[np.floating], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Number of vectors of a dataset whose norm is greater than MAX_NORM."""
+    return summarize(source, chunk_size).norm_violations
+
+
+def centroid(
+    source: PathLike | NDArray[np.floating], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> tuple[float, float]:
+    """Mean of the vectors of a dataset."""
+    return summarize(source, chunk_size).centroid
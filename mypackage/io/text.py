@@ -0,0 +1,186 @@
+"""This module streams vectors stored as text, one vector per line, with the two
+coordinates separated by whitespace or by a delimiter (e.g. a comma for CSV files).
+
+Lines are read, validated, transformed and written in fixed-size chunks, so the memory
+used does not depend on the number of vectors. Invalid lines (those that cannot be parsed
+or whose vector has a norm greater than MAX_NORM) are counted and, optionally, copied to
+a reject file instead of aborting the whole run.
+
+Examples:
+    Rotate all the vectors read from the standard input and print them:
+
+    >>> stats = transform_text(sys.stdin, sys.stdout, Rotation(0.5))
+    >>> print(stats)
+    1000000 vectors written, 2 rejected (1 parse errors, 1 norm errors)
+
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, TextIO
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mypackage.backend import get_backend
+from mypackage.vector.vector import MAX_NORM
+
+if TYPE_CHECKING:
+    from mypackage.linearmap import LinearMap
+
+
+DEFAULT_CHUNK_SIZE: int = 65_536  # lines per chunk
+
+
+@dataclass
+class StreamStats:
+    """Counters of a streaming run.
+
+    Note:
+        The @dataclass decorator writes the __init__, __repr__ and __eq__ methods
+        for us from the annotated class attributes.
+
+    Attributes:
+        vectors (int): number of vectors written to the output.
+        parse_errors (int): number of lines that could not be parsed as two finite numbers.
+        norm_errors (int): number of vectors (read or transformed) with a norm greater
+            than MAX_NORM.
+    """
+
+    vectors: int = 0
+    parse_errors: int = 0
+    norm_errors: int = 0
+
+    @property
+    def rejected(self) -> int:
+        """int: total number of rejected lines."""
+        return self.parse_errors + self.norm_errors
+
+    def __str__(self) -> str:
+        return (
+            f"{self.vectors} vectors written, {self.rejected} rejected "
+            f"({self.parse_errors} parse errors, {self.norm_errors} norm errors)"
+        )
+
+
+def read_chunks(
+    lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[list[str]]:
+    """Group the non-empty, non-comment (#) lines in lists of at most chunk_size lines.
+
+    Raises:
+        ValueError: The chunk size is not positive (islice(lines, 0) would silently end
+            the stream).
+    """
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, not {chunk_size}.")
+    data_lines = (line for line in lines if line.strip() and not line.lstrip().startswith("#"))
+    # iter(function, sentinel) calls the function until it returns the sentinel (no lines)
+    return iter(lambda: list(islice(data_lines, chunk_size)), [])
+
+
+def parse_lines(
+    lines: list[str], delimiter: str | None = None
+) -> tuple[NDArray[np.float64], list[str], list[str]]:
+    """Parse a chunk of lines into an (N, 2) array of coordinates.
+
+    Note:
+        We first try to parse the whole chunk at once with NumPy, which is fast. Only if
+        that fails we go line by line to find out which of them are invalid.
+
+    Args:
+        lines (list[str]): lines with two coordinates each.
+        delimiter (str, optional): separator of the coordinates. Defaults to None (whitespace).
+
+    Returns:
+        tuple: the array of coordinates, the lines that were parsed (one per row of the
+            array) and the lines that could not be parsed.
+    """
+    try:
+        array = np.loadtxt(lines, delimiter=delimiter, dtype=np.float64, ndmin=2)
+    except ValueError:
+        pass
+    else:
+        if array.shape[1] == 2 and np.isfinite(array).all():
+            return array, lines, []
+
+    rows, good_lines, bad_lines = [], [], []
+    for line in lines:
+        values = line.split(delimiter)
+        try:
+            x, y = float(values[0]), float(values[1])
+        except (ValueError, IndexError):
+            bad_lines.append(line)
+            continue
+        if len(values) != 2 or not (math.isfinite(x) and math.isfinite(y)):
+            bad_lines.append(line)
+            continue
+        rows.append((x, y))
+        good_lines.append(line)
+    return np.array(rows, dtype=np.float64).reshape(-1, 2), good_lines, bad_lines
+
+
+def write_vectors(sink: TextIO, array: NDArray[np.float64], delimiter: str | None = None) -> None:
+    """Write the vectors as text, one per line.
+
+    Note:
+        The repr of a float is the shortest string that reads back to the same number.
+    """
+    separator = " " if delimiter is None else delimiter
+    sink.write("".join(f"{x!r}{separator}{y!r}\n" for x, y in array.tolist()))
+
+
+def transform_text(
+    source: Iterable[str],
+    sink: TextIO,
+    linear_map: LinearMap | None = None,
+    inverse: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    delimiter: str | None = None,
+    rejects: TextIO | None = None,
+) -> StreamStats:
+    """Read vectors from a text source, optionally apply a linear map to them, and write
+    them to a text sink, chunk by chunk.
+
+    Args:
+        source (Iterable[str]): lines to read (e.g. an open file or sys.stdin).
+        sink (TextIO): where the valid (transformed) vectors are written.
+        linear_map (LinearMap, optional): map applied to the vectors. Defaults to None.
+        inverse (bool, optional): apply the inverse of the map instead. Defaults to False.
+        chunk_size (int, optional): number of lines processed at once.
+        delimiter (str, optional): separator of the coordinates. Defaults to None (whitespace).
+        rejects (TextIO, optional): where the rejected lines are copied. Defaults to None.
+
+    Returns:
+        StreamStats: Number of vectors written and of rejected lines.
+
+    Raises:
+        ValueError: The chunk size is not positive.
+    """
+    stats = StreamStats()
+    for lines in read_chunks(source, chunk_size):
+        array, good_lines, bad_lines = parse_lines(lines, delimiter)
+        stats.parse_errors += len(bad_lines)
+
+        offending = get_backend().norm_violations(array, MAX_NORM)
+        if linear_map is not None:
+            transform = linear_map.inverse if inverse else linear_map
+            transform(array, out=array)  # the chunk is ours, so we can transform it in place
+            if not linear_map.preserves_norm:
+                new_offending = get_backend().norm_violations(array, MAX_NORM)
+                offending = np.union1d(offending, new_offending)
+
+        if offending.size > 0:
+            stats.norm_errors += offending.size
+            bad_lines.extend(good_lines[i] for i in offending.tolist())
+            array = np.delete(array, offending, axis=0)
+
+        write_vectors(sink, array, delimiter)
+        stats.vectors += len(array)
+        if rejects is not None and bad_lines:
+            rejects.writelines(line if line.endswith("\n") else f"{line}\n" for line in bad_lines)
+    return stats
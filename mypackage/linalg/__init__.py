@@ -0,0 +1,6 @@
+"""To import from the linalg.py module we can also type
+from mypackage.linalg.linalg import determinant
+"""
+
+from .linalg import SINGULAR_TOLERANCE, LUFactorization, SingularMatrixError
+from .linalg import determinant, inverse, lu_factor, numpy_benchmark, solve
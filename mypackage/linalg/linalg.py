@@ -0,0 +1,248 @@
+"""This module contains the linear algebra of square matrices of any size: determinants,
+LU factorizations, inverses and solutions of linear systems.
+
+All the functions accept a single (n, n) matrix or a (B, n, n) stack of B matrices,
+which are processed at once by the kernels of the current backend (see
+mypackage.backend): the NumPy kernels vectorize every step of the elimination over the
+stack, while the Numba kernels compile the loops of examples/5-jit-compiler.ipynb.
+
+Note:
+    NumPy has all of this in numpy.linalg (calling the optimized LAPACK library), so why
+    bother? For the tiny matrices of this library, most of the time of a NumPy call is
+    spent checking the arguments and preparing the loops, not computing. The determinant
+    of a single 2x2 or 3x3 matrix is computed with a closed formula on Python floats,
+    which is about five times faster than numpy.linalg.det, and the compiled Numba
+    kernels compute the determinants of stacks of small matrices faster than
+    numpy.linalg. For anything else LAPACK wins, and the NumPy kernels are only a
+    readable reference implementation. Use `numpy_benchmark` to compare them on
+    your machine.
+
+Examples:
+    >>> determinant([[2, 1], [1, 1]])
+    1.0
+    >>> solve([[2, 1], [1, 1]], [3, 2])
+    array([1., 1.])
+
+    A stack of matrices gives a stack of results:
+
+    >>> determinant(np.stack([np.eye(3), 2 * np.eye(3)]))
+    array([1., 8.])
+
+    Factorize once to solve many systems with the same matrix:
+
+    >>> factorization = lu_factor([[0, 1], [1, 1]])
+    >>> factorization.solve([1, 2])
+    array([1., 1.])
+
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from timeit import Timer
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from mypackage.backend import get_backend
+
+
+# Relative size (with respect to the largest pivot) below which a pivot is zero, and a matrix
+# singular: numbers smaller than that are usually the rounding errors of a cancellation
+SINGULAR_TOLERANCE: float = 1e-12
+
+
+class SingularMatrixError(ValueError):
+    """Exception raised when a matrix that must be invertible is singular."""
+
+
+def _as_stack(matrix: ArrayLike) -> tuple[NDArray[np.float64], bool]:
+    """Copy of the matrix (or matrices) as a (B, n, n) stack, and whether it was a single one.
+
+    Raises:
+        ValueError: The input is not an (n, n) matrix or a (B, n, n) stack.
+    """
+    stack = np.array(matrix, dtype=np.float64)  # always a copy, the kernels overwrite it
+    single = stack.ndim == 2
+    if single:
+        stack = stack[np.newaxis]
+    if stack.ndim != 3 or stack.shape[1] != stack.shape[2]:
+        raise ValueError(f"Expected square matrices, but got shape {np.shape(matrix)}.")
+    return stack, single
+
+
+@dataclass
+class LUFactorization:
+    """LU factorization with partial pivoting P A = L U of a matrix or a stack of matrices.
+
+    Attributes:
+        lu (NDArray[np.float64]): (B, n, n) stack with L below the diagonal (its diagonal
+            is made of ones, which are not stored) and U on and above it.
+        pivots (NDArray[np.intp]): (B, n) row swapped with row k at step k.
+        signs (NDArray[np.float64]): (B,) sign of the permutation of each matrix.
+        single (bool): whether a single matrix was factorized (instead of a stack).
+    """
+
+    lu: NDArray[np.float64]
+    pivots: NDArray[np.intp]
+    signs: NDArray[np.float64]
+    single: bool
+
+    def determinant(self) -> float | NDArray[np.float64]:
+        """Determinant of the matrix (or of each matrix of the stack)."""
+        determinants = self.signs * self.lu.diagonal(0, 1, 2).prod(axis=1)
+        return float(determinants[0]) if self.single else determinants
+
+    def singular(self) -> NDArray[np.bool_]:
+        """(B,) mask of the singular matrices: those with a negligible pivot."""
+        pivots = np.abs(self.lu.diagonal(0, 1, 2))
+        if pivots.shape[1] == 0:  # 0x0 matrices
+            return np.zeros(len(pivots), dtype=bool)
+        largest_pivots = pivots.max(axis=1, keepdims=True)
+        return np.any(pivots <= SINGULAR_TOLERANCE * largest_pivots, axis=1)
+
+    def solve(self, b: ArrayLike) -> NDArray[np.float64]:
+        """Solve A x = b for the factorized matrix (or matrices).
+
+        Args:
+            b (ArrayLike): right hand side, with shape (n,) or (n, k) for a single matrix
+                and (B, n) or (B, n, k) for a stack.
+
+        Returns:
+            NDArray[np.float64]: The solution x, with the same shape as b.
+
+        Raises:
+            ValueError: b does not have a valid shape.
+            SingularMatrixError: Any of the matrices is singular.
+        """
+        singular = np.flatnonzero(self.singular())
+        if singular.size:
+            where = "The matrix" if self.single else f"The matrices {singular.tolist()}"
+            raise SingularMatrixError(f"{where} cannot be inverted (singular).")
+
+        right_hand_side = np.array(b, dtype=np.float64)  # a copy, overwritten by the solution
+        batch, size = self.lu.shape[:2]
+        if self.single:
+            right_hand_side = right_hand_side[np.newaxis]
+        vectors = right_hand_side.ndim == 2  # (B, n), not (B, n, k)
+        if vectors:
+            right_hand_side = right_hand_side[..., np.newaxis]
+        if right_hand_side.ndim != 3 or right_hand_side.shape[:2] != (batch, size):
+            raise ValueError(f"The right hand side has an invalid shape {np.shape(b)}.")
+
+        solution = get_backend().lu_solve(self.lu, self.pivots, right_hand_side)
+        if vectors:
+            solution = solution[..., 0]
+        return solution[0] if self.single else solution
+
+
+def lu_factor(matrix: ArrayLike) -> LUFactorization:
+    """LU factorization with partial pivoting of a matrix or a (B, n, n) stack of matrices.
+
+    Note:
+        Singular matrices can be factorized too (their determinant is zero), but
+        solving systems with them raises a SingularMatrixError.
+
+    Raises:
+        ValueError: The input is not an (n, n) matrix or a (B, n, n) stack.
+    """
+    stack, single = _as_stack(matrix)
+    batch, size = stack.shape[:2]
+    pivots = np.empty((batch, size), dtype=np.intp)
+    signs = get_backend().lu_factor(stack, pivots, np.empty(batch))
+    return LUFactorization(stack, pivots, signs, single)
+
+
+def determinant(matrix: ArrayLike) -> float | NDArray[np.float64]:
+    """Determinant of a matrix, or (B,) determinants of a (B, n, n) stack of matrices.
+
+    Raises:
+        ValueError: The input is not an (n, n) matrix or a (B, n, n) stack.
+    """
+    rows = matrix.tolist() if isinstance(matrix, np.ndarray) and matrix.ndim == 2 else matrix
+    if isinstance(rows, (list, tuple)) and len(rows) in (2, 3):
+        small_determinant = _small_determinant(rows)
+        if small_determinant is not None:
+            return small_determinant
+    return lu_factor(matrix).determinant()
+
+
+def _small_determinant(rows: list | tuple) -> float | None:
+    """Closed formula for the determinant of a 2x2 or 3x3 matrix given by its rows, or
+    None if they are not the rows of a single square matrix of numbers.
+    """
+    try:
+        if len(rows) == 2:
+            (a, b), (c, d) = rows
+            return float(a * d - b * c)
+        (a, b, c), (d, e, f), (g, h, i) = rows
+        return float(a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g))
+    except (TypeError, ValueError):  # not a single square matrix of numbers
+        return None
+
+
+def solve(matrix: ArrayLike, b: ArrayLike) -> NDArray[np.float64]:
+    """Solve the linear system A x = b (or a stack of them, see LUFactorization.solve).
+
+    Raises:
+        ValueError: The inputs do not have valid shapes.
+        SingularMatrixError: Any of the matrices is singular.
+    """
+    return lu_factor(matrix).solve(b)
+
+
+def inverse(matrix: ArrayLike) -> NDArray[np.float64]:
+    """Inverse of a matrix, or of each matrix of a (B, n, n) stack.
+
+    Raises:
+        ValueError: The input is not an (n, n) matrix or a (B, n, n) stack.
+        SingularMatrixError: Any of the matrices is singular.
+    """
+    factorization = lu_factor(matrix)
+    batch, size = factorization.lu.shape[:2]
+    identities = np.broadcast_to(np.eye(size), (batch, size, size))
+    return factorization.solve(identities[0] if factorization.single else identities)
+
+
+def numpy_benchmark(
+    sizes: tuple[int, ...] = (2, 3, 4, 8, 16, 32), batch_size: int = 10_000, repeat: int = 5
+) -> list[tuple[str, int, float, float]]:
+    """Compare the time of our functions (with the current backend) and numpy.linalg.
+
+    Args:
+        sizes (tuple[int, ...], optional): sizes n of the (n, n) matrices.
+        batch_size (int, optional): number of matrices of the stacks.
+        repeat (int, optional): number of measurements (we keep the best one).
+
+    Returns:
+        list[tuple[str, int, float, float]]: operation, n, our time and NumPy's time in
+            seconds per call, for the determinant and the solution of a system of a single
+            matrix and of a stack of matrices.
+    """
+    rng = np.random.default_rng(0)
+    results: list[tuple[str, int, float, float]] = []
+
+    def best_time(function: object) -> float:
+        timer = Timer(function, timer=time.perf_counter)  # type: ignore[arg-type]
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat, number)) / number
+
+    for size in sizes:
+        matrix, b = rng.normal(size=(size, size)), rng.normal(size=size)
+        stack = rng.normal(size=(batch_size, size, size))
+        stack_b = rng.normal(size=(batch_size, size))
+        cases = [
+            ("determinant", lambda: determinant(matrix), lambda: np.linalg.det(matrix)),
+            ("solve", lambda: solve(matrix, b), lambda: np.linalg.solve(matrix, b)),
+            ("determinant (stack)", lambda: determinant(stack), lambda: np.linalg.det(stack)),
+            (
+                "solve (stack)",
+                lambda: solve(stack, stack_b),
+                lambda: np.linalg.solve(stack, stack_b[..., np.newaxis]),
+            ),
+        ]
+        for name, ours, numpy_function in cases:
+            ours()  # warmup (and compilation of the Numba kernels)
+            results.append((name, size, best_time(ours), best_time(numpy_function)))
+    return results
@@ -2,4 +2,7 @@
 from .linear_transform import Rotation, Shear
 """
 
-from mypackage.linearmap.linear_map import LinearMap, Rotation, Shear
+from mypackage.linearmap.linear_map import LinearMap, Rotation, Shear, ComposedMap, MatrixMap
+from mypackage.linalg import SingularMatrixError
+from mypackage.linearmap.linear_map_batch import LinearMapBatch, RotationBatch, ShearBatch
+from mypackage.linearmap.linear_map_n import LinearMapN
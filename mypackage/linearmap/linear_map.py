@@ -1,5 +1,5 @@
-"""This module contains the LinearMap abstract class and two subclasses:
-Rotation and Shear.
+"""This module contains the LinearMap abstract class and four subclasses:
+Rotation, Shear, MatrixMap and ComposedMap.
 
 Examples:
     We can define a rotation linear map and then apply the transformation to a vector
@@ -15,34 +15,112 @@ Examples:
     >>> shear_angle = 0.5
     >>> map = Shear(shear_angle)
     >>> map.inverse(Vector(1, 1))
-    Vector(-0.830487721712452, 1)
+    Vector(-0.830487721712452, 1.0)
+
+    Maps can also be applied to a whole batch of vectors at once, either a VectorArray
+    or an (N, 2) array of coordinates, with a single matrix multiplication:
+
+    >>> map = Rotation(np.pi / 2)
+    >>> map(np.array([[1.0, 0.0], [0.0, 2.0]])).round(12)
+    array([[ 0.,  1.],
+           [-2.,  0.]])
+
+    Linear maps are composed with the @ operator, just like matrices: `map2 @ map1`
+    applies first map1 and then map2, multiplying by a single precomputed matrix
+
+    >>> pipeline = Rotation(0.5) @ Shear(0.5) @ Rotation(0.25)
+    >>> type(Rotation(0.5) @ Rotation(0.25))
+    <class 'mypackage.linearmap.linear_map.Rotation'>
+
+    Any invertible matrix defines a linear map too
+
+    >>> MatrixMap([[2, 1], [1, 1]]).inverse(Vector(3, 2))
+    Vector(1.0, 1.0)
+
+    Powers apply a map several times, and orbits store every step of the way
+
+    >>> (Rotation(0.25) ** 4).angle
+    1.0
+    >>> MatrixMap([[1, 1], [1, 0]]).orbit(Vector(1, 0), steps=5)[:, 0, 0]
+    array([1., 1., 2., 3., 5.])
 
 """
 
+from __future__ import annotations
+
+import math
+import operator
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from functools import cached_property
 from math import sin, cos, tan
 
-from mypackage.vector import Vector
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from mypackage.backend import get_kernels
+from mypackage.backend.precision import PRECISIONS, get_dtype, result_dtype
+from mypackage.linalg import SINGULAR_TOLERANCE, SingularMatrixError
+from mypackage.vector import Vector, VectorArray
+from mypackage.vector import vector as _vector_module
+from mypackage.vector.vector import _trusted_vector
+
+
+Batch = VectorArray | NDArray[np.float64]  # type alias for batches of vectors
+Entries = tuple[float, float, float, float]  # entries of a 2x2 matrix, row by row
+
+ORBIT_CHUNK_SIZE = 1 << 20  # vectors per chunk of iter_orbit (16 MiB in float64)
 
 
 class LinearMap(ABC):
     """This abstract class will serve us as a base for other linear maps that we
     will later especify in subclasses.
 
+    Note:
+        The matrices are only built when they are first used, and then cached (that is
+        what functools.cached_property does). Many maps are never inverted, and creating
+        short-lived maps in a loop should not pay for an inverse nobody asks for. The
+        methods that transform a single vector use the entries of the matrix as plain
+        Python floats, which are faster to multiply than the elements of an array.
+
     Args:
-        matrix (list[list[float]]): matrix of our linear map. It consists on a list
-            of rows, each row being a list of the numbers in each column.
+        matrix (ArrayLike): 2x2 matrix of our linear map. It can be a list of rows, each
+            row being a list of the numbers in each column, or a NumPy array.
 
     Attributes:
-        matrix (list[list[float]]): the matrix of our linear map.
-        inv_matrix (list[list[float]]): the matrix of the inverse of our linear map.
+        matrix (NDArray[np.float64]): the matrix of our linear map, as a (read only)
+            contiguous 2x2 array.
+        inv_matrix (NDArray[np.float64]): the matrix of the inverse of our linear map.
+        preserves_norm (bool): class attribute telling whether the map (and its inverse)
+            never changes the norm of a vector, so the MAX_NORM check can be skipped.
+
+    Raises:
+        ValueError: The matrix is not 2x2.
     """
 
-    def __init__(self, matrix: list[list[float]]) -> None:
-        self.matrix = matrix
-        self.inv_matrix = self._get_inverse()  # we can call an undefined abstract method
+    preserves_norm: bool = False
+
+    def __init__(self, matrix: ArrayLike) -> None:
+        self._entries: Entries = _entries(matrix)
+
+    @cached_property
+    def matrix(self) -> NDArray[np.float64]:
+        return _array(self._entries)
+
+    @cached_property
+    def _inv_entries(self) -> Entries:
+        return _entries(self._get_inverse())  # we can call an undefined abstract method
 
-    def __call__(self, vector: Vector) -> Vector:
+    @cached_property
+    def inv_matrix(self) -> NDArray[np.float64]:
+        return _array(self._inv_entries)
+
+    def __call__(
+        self,
+        vector: Vector | VectorArray | NDArray[np.float64],
+        out: Batch | None = None,
+        workers: int | None = None,
+    ) -> Vector | Batch:
         """Apply the linear map to a vector (which translates into ordinary matrix
         times vector multiplication).
 
@@ -50,18 +128,26 @@ class LinearMap(ABC):
             The call method allows an instance of this class to behave as a function.
 
         Args:
-            vector (Vector): Vector to map.
+            vector (Vector | VectorArray | NDArray): Vector to map, or a batch of vectors
+                given as a VectorArray or an (N, 2) array of coordinates.
+            out (VectorArray | NDArray, optional): Preallocated batch, with the same shape
+                as the input batch, where the result is written. It may be the input batch
+                itself to transform it in place. Defaults to None.
+            workers (int, optional): number of threads that transform (and validate)
+                chunks of the batch in parallel (see mypackage.parallel.thread_pool).
+                Defaults to None, which makes a single call to the current backend.
 
         Returns:
-            Vector: Transformed vector.
+            Vector | VectorArray | NDArray: Transformed vector(s), of the same type as the input.
         """
-        x = self.matrix[0][0] * vector.x + self.matrix[0][1] * vector.y
-        y = self.matrix[1][0] * vector.x + self.matrix[1][1] * vector.y
-        return Vector(x, y)
+        if not isinstance(vector, Vector):
+            return self._apply_batch(self.matrix, vector, out, workers)
+        m00, m01, m10, m11 = self._entries
+        return self._new_vector(m00 * vector.x + m01 * vector.y, m10 * vector.x + m11 * vector.y)
 
     @abstractmethod
-    def _get_inverse(self) -> list[list[float]]:
-        """Return the inverse of the linear map.
+    def _get_inverse(self) -> ArrayLike:
+        """Return the matrix of the inverse of the linear map.
 
         Note:
             The code for the abstract method will be specified inside each subclass. Because
@@ -72,11 +158,16 @@ class LinearMap(ABC):
             is to begin the method's name with an underscore.
 
         Returns:
-            list[list[float]]: Matrix of the inverse transformation.
+            ArrayLike: 2x2 matrix of the inverse transformation.
         """
         ...  # the three dots mean "ellipsis"
 
-    def inverse(self, vector: Vector) -> Vector:
+    def inverse(
+        self,
+        vector: Vector | VectorArray | NDArray[np.float64],
+        out: Batch | None = None,
+        workers: int | None = None,
+    ) -> Vector | Batch:
         """Apply the inverse of our map to a vector.
 
         Note:
@@ -86,15 +177,245 @@ class LinearMap(ABC):
             and guess that it applies the inverse rotation to the vector.
 
         Args:
-            vector (Vector): Vector to transform.
+            vector (Vector | VectorArray | NDArray): Vector to transform, or a batch of
+                vectors given as a VectorArray or an (N, 2) array of coordinates.
+            out (VectorArray | NDArray, optional): Preallocated batch where the result
+                is written. Defaults to None.
+            workers (int, optional): number of threads working on the batch (see
+                __call__). Defaults to None.
+
+        Returns:
+            Vector | VectorArray | NDArray: Transformed vector(s), of the same type as the input.
+        """
+        if not isinstance(vector, Vector):
+            return self._apply_batch(self.inv_matrix, vector, out, workers)
+        m00, m01, m10, m11 = self._inv_entries
+        return self._new_vector(m00 * vector.x + m01 * vector.y, m10 * vector.x + m11 * vector.y)
+
+    def __matmul__(self, other: LinearMap) -> LinearMap:
+        """Compose two linear maps: `(self @ other)(vector) == self(other(vector))`.
+
+        Note:
+            Subclasses may override this method to return a simpler map when the
+            composition has a closed form (e.g. two rotations make a rotation).
+
+        Args:
+            other (LinearMap): map applied first (right hand side).
+
+        Returns:
+            LinearMap: The composed map.
+        """
+        if not isinstance(other, LinearMap):
+            return NotImplemented  # let Python try other.__rmatmul__ or raise a TypeError
+        return ComposedMap(self, other)
+
+    def power(self, k: int) -> LinearMap:
+        """Return the map applied k times, i.e. the k-th power of its matrix.
+
+        Note:
+            Multiplying the matrix k - 1 times by itself takes k steps and accumulates k
+            rounding errors. Exponentiation by squaring computes A^2, A^4, A^8... and
+            multiplies the ones that make up k (e.g. A^13 = A^8 A^4 A), so it takes
+            about log2(k) steps. Subclasses with a closed form (e.g. rotations) do
+            better still.
+
+        Args:
+            k (int): number of times the map is applied. Negative powers apply the
+                inverse map, and the power 0 is the identity.
+
+        Returns:
+            LinearMap: The power of the map.
+
+        Raises:
+            TypeError: k is not an integer.
+            SingularMatrixError: The power is so large (or small) that its matrix is
+                singular in floating point.
+        """
+        k = operator.index(k)
+        entries = self._entries if k >= 0 else self._inv_entries
+        power = MatrixMap(_rows(_matrix_power(entries, abs(k))))
+        power.preserves_norm = self.preserves_norm  # like ComposedMap, per instance
+        return power
+
+    def __pow__(self, k: int) -> LinearMap:
+        """`linear_map ** k` is the same as `linear_map.power(k)`."""
+        return self.power(k)
+
+    def orbit(
+        self,
+        vectors: Vector | Batch,
+        steps: int,
+        out: NDArray[np.float64] | None = None,
+        workers: int | None = None,
+    ) -> NDArray[np.float64]:
+        """Compute the trajectories of the vectors when the map is applied repeatedly:
+        `orbit[i]` holds the vectors transformed i times, starting with `orbit[0]`, the
+        vectors themselves.
+
+        Note:
+            Instead of applying the map once per step, the trajectory is filled by
+            doubling: `orbit[m:2m]` is `A^m` times `orbit[:m]`, a single call to the
+            kernel for all of those steps. So a trajectory of k steps takes about
+            log2(k) calls (and log2(k) roundings per point instead of k).
+
+        Args:
+            vectors (Vector | VectorArray | NDArray): starting vector(s), as a Vector, a
+                VectorArray or an (N, 2) array.
+            steps (int): number of points of each trajectory.
+            out (NDArray, optional): preallocated C-contiguous (steps, N, 2) array where
+                the trajectories are written. Defaults to None.
+            workers (int, optional): number of threads that transform chunks of each
+                step (see __call__). Defaults to None.
 
         Returns:
-            Vector: Transformed vector.
+            NDArray: The (steps, N, 2) trajectories (N is 1 for a single Vector).
+
+        Raises:
+            ValueError: steps is negative, or out does not have the right shape.
+            TypeError: out does not hold float32 or float64 numbers.
+            NormError: The vectors are a VectorArray and some points of their
+                trajectories are too long. The indices refer to `orbit.reshape(-1, 2)`.
         """
-        x = self.inv_matrix[0][0] * vector.x + self.inv_matrix[0][1] * vector.y
-        y = self.inv_matrix[1][0] * vector.x + self.inv_matrix[1][1] * vector.y
+        if steps < 0:
+            raise ValueError(f"The number of steps must not be negative, not {steps}.")
+        start = _orbit_start(vectors)
+        shape = (steps, *start.shape)
+        if out is None:
+            out = np.empty(shape, dtype=start.dtype)
+        elif out.shape != shape or not out.flags.c_contiguous:
+            raise ValueError(f"The out buffer must be a C-contiguous array of shape {shape}.")
+        elif out.dtype.name not in PRECISIONS:
+            raise TypeError(f"The out buffer must hold float32 or float64, not {out.dtype}.")
+        if steps == 0:
+            return out
+
+        kernels = get_kernels(workers)
+        out[0] = start
+        filled, entries = 1, self._entries  # entries of A^filled
+        while filled < steps:
+            count = min(filled, steps - filled)
+            matrix = np.array(entries, dtype=out.dtype).reshape(2, 2)
+            previous, new = out[:count], out[filled : filled + count]
+            kernels.apply(matrix, previous.reshape(-1, 2), new.reshape(-1, 2))
+            filled += count
+            entries = _matrix_product(entries, entries)
+        self._check_orbit(vectors, out, workers)
+        return out
+
+    def iter_orbit(
+        self,
+        vectors: Vector | Batch,
+        steps: int,
+        chunk_steps: int | None = None,
+        workers: int | None = None,
+    ) -> Iterator[NDArray[np.float64]]:
+        """Yield the trajectories of `orbit` in chunks of `chunk_steps` steps, so that
+        long trajectories need not fit in memory.
+
+        Note:
+            Each chunk is the previous one times `A^chunk_steps`, a single call to the
+            kernel. Since the next chunk is computed from the previous one, do not
+            modify the chunks in place.
+
+        Args:
+            vectors (Vector | VectorArray | NDArray): starting vector(s).
+            steps (int): total number of points of each trajectory.
+            chunk_steps (int, optional): steps per chunk. Defaults to None, which makes
+                chunks of about ORBIT_CHUNK_SIZE vectors.
+            workers (int, optional): number of threads (see __call__). Defaults to None.
+
+        Yields:
+            NDArray: consecutive (at most chunk_steps, N, 2) pieces of the trajectories.
+        """
+        start = _orbit_start(vectors)
+        if chunk_steps is None:
+            chunk_steps = max(1, ORBIT_CHUNK_SIZE // max(len(start), 1))
+        elif chunk_steps < 1:
+            raise ValueError(f"The steps per chunk must be positive, not {chunk_steps}.")
+        chunk = self.orbit(vectors, min(chunk_steps, steps), workers=workers)
+        if not len(chunk):
+            return
+        kernels = get_kernels(workers)
+        jump_entries = _matrix_power(self._entries, chunk_steps)  # jumps a whole chunk
+        jump = np.array(jump_entries, dtype=chunk.dtype).reshape(2, 2)
+        done = len(chunk)
+        yield chunk
+        while done < steps:
+            count = min(chunk_steps, steps - done)
+            next_chunk = np.empty((count, *start.shape), dtype=chunk.dtype)
+            kernels.apply(jump, chunk[:count].reshape(-1, 2), next_chunk.reshape(-1, 2))
+            self._check_orbit(vectors, next_chunk, workers)
+            done += count
+            chunk = next_chunk
+            yield chunk
+
+    def _check_orbit(
+        self, vectors: Vector | Batch, orbit: NDArray[np.float64], workers: int | None
+    ) -> None:
+        """Validate the points of the trajectories of a VectorArray (see _apply_batch)."""
+        if isinstance(vectors, VectorArray) and not self.preserves_norm:
+            VectorArray._from_trusted(orbit.reshape(-1, 2))._check_norms(workers)
+
+    def _new_vector(self, x: float, y: float) -> Vector:
+        """Create the transformed vector, skipping the MAX_NORM check when the map
+        preserves norms or validation is turned off.
+        """
+        if self.preserves_norm or _vector_module._validation == _vector_module.OFF:
+            return _trusted_vector(x, y)
         return Vector(x, y)
 
+    def _apply_batch(
+        self,
+        matrix: NDArray[np.float64],
+        vectors: Batch,
+        out: Batch | None,
+        workers: int | None = None,
+    ) -> Batch:
+        """Multiply every vector of the batch by the matrix in a single call to the
+        kernel of the current backend (or of a thread pool, if workers are given).
+
+        Note:
+            Raw arrays are treated as plain coordinates and are not checked against
+            MAX_NORM; VectorArrays follow the validation mode.
+
+            The result has the dtype of the batch (float32 batches stay float32), and
+            the matrix is converted to it so that the kernel runs in that precision.
+
+        Raises:
+            TypeError: Not VectorArray/ndarray passed in, or an out buffer that does not
+                hold floats.
+            ValueError: The batch (or the out buffer) does not have shape (N, 2).
+            NormError: Any of the transformed vectors in a VectorArray is too big.
+        """
+        if isinstance(vectors, VectorArray):
+            array = vectors.array
+        elif isinstance(vectors, np.ndarray):
+            array = vectors
+            if array.ndim != 2 or array.shape[1] != 2:
+                raise ValueError(f"The batch must have shape (N, 2), but got {array.shape}.")
+        else:
+            raise TypeError("You must pass in a Vector, VectorArray or ndarray instance!")
+
+        out_array = out.array if isinstance(out, VectorArray) else out
+        if out_array is None:
+            out_array = np.empty(array.shape, dtype=result_dtype(array))
+        elif out_array.shape != array.shape:
+            raise ValueError(f"The out buffer must have shape {array.shape}.")
+        elif out_array.dtype.kind != "f":  # an integer matrix would be truncated
+            raise TypeError(f"The out buffer must hold floats, not {out_array.dtype}.")
+        matrix = matrix.astype(result_dtype(out_array), copy=False)  # a 2x2 copy, if any
+        get_kernels(workers).apply(matrix, array, out_array)
+
+        if isinstance(vectors, np.ndarray):
+            return out_array
+        if isinstance(out, VectorArray):
+            mapped_vectors = out
+        else:
+            mapped_vectors = VectorArray._from_trusted(out_array)
+        if not self.preserves_norm:
+            mapped_vectors._check_norms(workers)
+        return mapped_vectors
+
 
 class Rotation(LinearMap):
     """Two dimensional rotation of a certain angle.
@@ -106,13 +427,27 @@ class Rotation(LinearMap):
         angle (float): angle of the rotation.
     """
 
+    preserves_norm = True
+
     def __init__(self, angle: float) -> None:
         self.angle = angle
-        matrix = [[cos(angle), -sin(angle)], [sin(angle), cos(angle)]]
-        super().__init__(matrix)
+        cos_angle, sin_angle = cos(angle), sin(angle)  # computed only once
+        # The entries are already floats, so we skip LinearMap.__init__ (no matrix to parse)
+        self._entries = (cos_angle, -sin_angle, sin_angle, cos_angle)
+
+    def _get_inverse(self) -> ArrayLike:
+        # The inverse of a rotation is its transpose, no need for more sines and cosines
+        m00, m01, m10, m11 = self._entries
+        return [[m00, m10], [m01, m11]]
 
-    def _get_inverse(self) -> list[list[float]]:
-        return [[cos(self.angle), sin(self.angle)], [-sin(self.angle), cos(self.angle)]]
+    def __matmul__(self, other: LinearMap) -> LinearMap:
+        if isinstance(other, Rotation):  # rotation angles simply add up
+            return Rotation(self.angle + other.angle)
+        return super().__matmul__(other)
+
+    def power(self, k: int) -> Rotation:
+        # Rotating k times by an angle is rotating once by k times the angle
+        return Rotation(operator.index(k) * self.angle)
 
 
 class Shear(LinearMap):
@@ -127,8 +462,194 @@ class Shear(LinearMap):
 
     def __init__(self, shear_angle: float) -> None:
         self.shear_factor = 1 / tan(shear_angle)  # shear factor is the cotangent of the shear angle
-        matrix = [[1, self.shear_factor], [0, 1]]
-        super().__init__(matrix)
+        self._entries = (1.0, self.shear_factor, 0.0, 1.0)  # as in Rotation, nothing to parse
+
+    @classmethod
+    def from_factor(cls, shear_factor: float) -> Shear:
+        """Create a shear directly from its shear factor (instead of the shear angle).
+
+        Note:
+            Class methods receive the class instead of an instance, so they are the
+            usual way to provide alternative constructors.
+
+        Args:
+            shear_factor (float): cotangent of the shear angle.
+
+        Returns:
+            Shear: The shear transformation.
+        """
+        shear = cls.__new__(cls)  # create the instance without calling __init__
+        shear.shear_factor = shear_factor
+        shear._entries = (1.0, float(shear_factor), 0.0, 1.0)
+        return shear
 
-    def _get_inverse(self) -> list[list[float]]:
+    def _get_inverse(self) -> ArrayLike:
         return [[1, -self.shear_factor], [0, 1]]
+
+    def __matmul__(self, other: LinearMap) -> LinearMap:
+        if isinstance(other, Shear):  # shear factors simply add up
+            return Shear.from_factor(self.shear_factor + other.shear_factor)
+        return super().__matmul__(other)
+
+    def power(self, k: int) -> Shear:
+        # Shearing k times adds up k shear factors
+        return Shear.from_factor(operator.index(k) * self.shear_factor)
+
+
+class ComposedMap(LinearMap):
+    """Composition of several linear maps, whose matrix (and inverse matrix) are
+    the precomputed products of the matrices of each map.
+
+    Note:
+        The maps are given in the same order as in the matrix product, so the last
+        map is the first one applied to the vector. This way, a pipeline of any
+        length costs a single 2x2 matrix multiplication per vector.
+
+    Args:
+        *maps (LinearMap): maps to compose (nested ComposedMaps are flattened).
+
+    Attributes:
+        maps (tuple[LinearMap, ...]): the composed maps.
+
+    Raises:
+        ValueError: No maps given.
+    """
+
+    def __init__(self, *maps: LinearMap) -> None:
+        if not maps:
+            raise ValueError("At least one linear map is needed!")
+        flat_maps: list[LinearMap] = []
+        for linear_map in maps:
+            if isinstance(linear_map, ComposedMap):
+                flat_maps.extend(linear_map.maps)
+            else:
+                flat_maps.append(linear_map)
+        self.maps = tuple(flat_maps)
+        self.preserves_norm = all(linear_map.preserves_norm for linear_map in self.maps)
+
+        entries = self.maps[0]._entries
+        for linear_map in self.maps[1:]:
+            entries = _matrix_product(entries, linear_map._entries)
+        self._entries = entries
+
+    def _get_inverse(self) -> ArrayLike:
+        # The inverse of a product is the product of the inverses in reverse order
+        inv_entries = self.maps[-1]._inv_entries
+        for linear_map in reversed(self.maps[:-1]):
+            inv_entries = _matrix_product(inv_entries, linear_map._inv_entries)
+        return _rows(inv_entries)
+
+    def __repr__(self) -> str:
+        return f"ComposedMap{self.maps!r}"
+
+
+class MatrixMap(LinearMap):
+    """Linear map given by any invertible 2x2 matrix.
+
+    Note:
+        The inverse of a 2x2 matrix [[a, b], [c, d]] has the closed form
+        [[d, -b], [-c, a]] / (ad - bc), much cheaper than a general matrix inversion.
+        The determinant is checked when the map is created, so a singular matrix fails
+        right away instead of producing infinities when its inverse is first used.
+
+    Args:
+        matrix (ArrayLike): 2x2 matrix, as a list of rows or a NumPy array.
+
+    Attributes:
+        determinant (float): determinant of the matrix.
+
+    Raises:
+        ValueError: The matrix is not 2x2 or has non-finite entries.
+        SingularMatrixError: The matrix is singular (or so close to singular that its
+            determinant is lost in rounding errors).
+    """
+
+    def __init__(self, matrix: ArrayLike) -> None:
+        super().__init__(matrix)
+        m00, m01, m10, m11 = self._entries
+        if not all(map(math.isfinite, self._entries)):
+            raise ValueError(f"The matrix has non-finite entries: {_rows(self._entries)}.")
+        self.determinant = m00 * m11 - m01 * m10
+        # A determinant negligible with respect to its two terms is just rounding error
+        scale = max(abs(m00 * m11), abs(m01 * m10))
+        if abs(self.determinant) <= SINGULAR_TOLERANCE * scale:
+            raise SingularMatrixError(f"The matrix {_rows(self._entries)} is singular.")
+
+    def _get_inverse(self) -> ArrayLike:
+        m00, m01, m10, m11 = self._entries
+        determinant = self.determinant
+        return [[m11 / determinant, -m01 / determinant], [-m10 / determinant, m00 / determinant]]
+
+    def __repr__(self) -> str:
+        return f"MatrixMap({[list(row) for row in _rows(self._entries)]!r})"
+
+
+def _entries(matrix: ArrayLike) -> Entries:
+    """Entries of a 2x2 matrix (list of rows or array) as Python floats, row by row.
+
+    Raises:
+        ValueError: The matrix is not 2x2.
+    """
+    if isinstance(matrix, np.ndarray):
+        if matrix.shape != (2, 2):
+            raise ValueError(f"The matrix must be 2x2, but got shape {matrix.shape}.")
+        return tuple(matrix.astype(np.float64).ravel().tolist())  # type: ignore[return-value]
+    try:
+        (m00, m01), (m10, m11) = matrix  # type: ignore[misc]
+    except (TypeError, ValueError):
+        raise ValueError(f"The matrix must be 2x2, but got {matrix!r}.") from None
+    # float(x) returns x itself when it is already a float, so this is cheap
+    return float(m00), float(m01), float(m10), float(m11)
+
+
+def _rows(entries: Entries) -> tuple[tuple[float, float], tuple[float, float]]:
+    """Matrix as a tuple of rows from its entries."""
+    return (entries[0], entries[1]), (entries[2], entries[3])
+
+
+def _array(entries: Entries) -> NDArray[np.float64]:
+    """Read only 2x2 array from the entries of a matrix."""
+    matrix = np.array(entries, dtype=np.float64).reshape(2, 2)
+    matrix.flags.writeable = False  # it is cached, so nobody should change it
+    return matrix
+
+
+def _matrix_product(entries_1: Entries, entries_2: Entries) -> Entries:
+    """Product of two 2x2 matrices given by their entries.
+
+    Note:
+        For such small matrices plain Python is faster than converting to NumPy arrays.
+    """
+    a00, a01, a10, a11 = entries_1
+    b00, b01, b10, b11 = entries_2
+    return (
+        a00 * b00 + a01 * b10,
+        a00 * b01 + a01 * b11,
+        a10 * b00 + a11 * b10,
+        a10 * b01 + a11 * b11,
+    )
+
+
+def _matrix_power(entries: Entries, k: int) -> Entries:
+    """k-th power (k >= 0) of a 2x2 matrix given by its entries, by repeated squaring."""
+    result: Entries = (1.0, 0.0, 0.0, 1.0)
+    while k:
+        if k & 1:  # the current power of two is part of k
+            result = _matrix_product(result, entries)
+        entries = _matrix_product(entries, entries)
+        k >>= 1
+    return result
+
+
+def _orbit_start(vectors: Vector | Batch) -> NDArray[np.float64]:
+    """Starting (N, 2) array of an orbit, in the dtype of its result.
+
+    Raises:
+        ValueError: The array does not have shape (N, 2).
+    """
+    if isinstance(vectors, Vector):
+        return np.array([[vectors.x, vectors.y]], dtype=get_dtype())
+    array = vectors.array if isinstance(vectors, VectorArray) else np.asarray(vectors)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"The vectors must have shape (N, 2), not {array.shape}.")
+    return array.astype(result_dtype(array), copy=False)
@@ -0,0 +1,226 @@
+"""This module contains batches of linear maps: N maps of the same kind, one for each
+vector of a batch of N vectors (e.g. each point rotated by its own angle).
+
+Building a million Rotation objects computes a million sines and cosines one by one in
+Python (and creates a million objects). A RotationBatch computes them all at once with
+NumPy and stores the N matrices in a single (N, 2, 2) array, so that applying the maps
+is a single pass over the vectors.
+
+Examples:
+    Rotate each vector by its own angle:
+
+    >>> rotations = RotationBatch(np.array([0, np.pi / 2]))
+    >>> rotations(np.array([[1.0, 0.0], [1.0, 0.0]])).round(12)
+    array([[1., 0.],
+           [0., 1.]])
+
+    Or the same vector by many angles:
+
+    >>> rotations(Vector(1, 0)).array.round(12)
+    array([[1., 0.],
+           [0., 1.]])
+
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from functools import cached_property
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+from mypackage.backend import get_kernels
+from mypackage.backend.precision import resolve_dtype, result_dtype
+from mypackage.vector import Vector, VectorArray
+
+from .linear_map import Batch, Rotation, Shear
+
+
+class LinearMapBatch(ABC):
+    """Base class of the batches of N linear maps, stored as (N, 2, 2) stacks of matrices.
+
+    Args:
+        matrices (ArrayLike): the (N, 2, 2) stack of matrices.
+        dtype (DTypeLike, optional): np.float64 or np.float32. Defaults to None, which
+            uses the current precision (see mypackage.backend.precision).
+
+    Attributes:
+        matrices (NDArray[np.float64]): the (N, 2, 2) stack of matrices.
+        inv_matrices (NDArray[np.float64]): the (N, 2, 2) stack of inverse matrices.
+        preserves_norm (bool): class attribute telling whether all the maps (and their
+            inverses) preserve the norm of the vectors, so the results need no check.
+
+    Raises:
+        ValueError: The matrices do not have shape (N, 2, 2).
+    """
+
+    preserves_norm: bool = False
+
+    def __init__(self, matrices: ArrayLike, dtype: DTypeLike | None = None) -> None:
+        self.matrices = np.ascontiguousarray(matrices, dtype=resolve_dtype(dtype))
+        if self.matrices.ndim != 3 or self.matrices.shape[1:] != (2, 2):
+            raise ValueError(f"The matrices must have shape (N, 2, 2), not {self.matrices.shape}.")
+
+    @property
+    @abstractmethod
+    def inv_matrices(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: the (N, 2, 2) stack of the matrices of the inverse maps."""
+        ...
+
+    def __len__(self) -> int:
+        return len(self.matrices)
+
+    def __call__(
+        self, vectors: Vector | Batch, out: Batch | None = None, workers: int | None = None
+    ) -> Batch:
+        """Apply the i-th map to the i-th vector of the batch.
+
+        Args:
+            vectors (Vector | VectorArray | NDArray): batch of N vectors, given as a
+                VectorArray or an (N, 2) array of coordinates, or a single Vector to
+                which every map is applied.
+            out (VectorArray | NDArray, optional): Preallocated (N, 2) batch where the
+                result is written. It may be the input batch itself. Defaults to None.
+            workers (int, optional): number of threads that transform chunks of the batch
+                in parallel (see mypackage.parallel.thread_pool). Defaults to None, which
+                makes a single call to the current backend.
+
+        Returns:
+            VectorArray | NDArray: The N transformed vectors, an array if the input was
+                an array and a VectorArray otherwise.
+        """
+        return self._apply_each(self.matrices, vectors, out, workers)
+
+    def inverse(
+        self, vectors: Vector | Batch, out: Batch | None = None, workers: int | None = None
+    ) -> Batch:
+        """Apply the inverse of the i-th map to the i-th vector of the batch (see __call__)."""
+        return self._apply_each(self.inv_matrices, vectors, out, workers)
+
+    def _apply_each(
+        self,
+        matrices: NDArray[np.float64],
+        vectors: Vector | Batch,
+        out: Batch | None,
+        workers: int | None = None,
+    ) -> Batch:
+        """Multiply every vector by its matrix in a single call to the backend kernel.
+
+        Raises:
+            TypeError: Not Vector/VectorArray/ndarray passed in.
+            ValueError: The batch (or the out buffer) does not have shape (N, 2).
+            NormError: Any of the transformed vectors in a VectorArray is too big.
+        """
+        shape = (len(self), 2)
+        if isinstance(vectors, Vector):  # the kernel repeats it N times
+            array = np.array([[vectors.x, vectors.y]], dtype=matrices.dtype)
+        elif isinstance(vectors, VectorArray):
+            array = vectors.array
+        elif isinstance(vectors, np.ndarray):
+            array = vectors
+        else:
+            raise TypeError("You must pass in a Vector, VectorArray or ndarray instance!")
+        if array.shape != shape and array.shape != (1, 2):
+            raise ValueError(f"The batch must have shape {shape}, but got {array.shape}.")
+
+        out_array = out.array if isinstance(out, VectorArray) else out
+        if out_array is None:
+            out_array = np.empty(shape, dtype=np.result_type(result_dtype(array), matrices))
+        elif out_array.shape != shape:
+            raise ValueError(f"The out buffer must have shape {shape}.")
+        get_kernels(workers).apply_each(matrices, array, out_array)
+
+        if isinstance(vectors, np.ndarray):
+            return out_array
+        if isinstance(out, VectorArray):
+            mapped_vectors = out
+        else:
+            mapped_vectors = VectorArray._from_trusted(out_array)
+        if not self.preserves_norm:
+            mapped_vectors._check_norms(workers)
+        return mapped_vectors
+
+
+class RotationBatch(LinearMapBatch):
+    """N two dimensional rotations.
+
+    Args:
+        angles (ArrayLike): the N angles of the rotations.
+        dtype (DTypeLike, optional): dtype of the matrices. Defaults to None (the current
+            precision).
+
+    Attributes:
+        angles (NDArray[np.float64]): the N angles of the rotations.
+    """
+
+    preserves_norm = True
+
+    def __init__(self, angles: ArrayLike, dtype: DTypeLike | None = None) -> None:
+        self.angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+        cos, sin = np.cos(self.angles), np.sin(self.angles)  # once per angle
+        matrices = np.empty((len(self.angles), 2, 2))
+        matrices[:, 0, 0], matrices[:, 0, 1] = cos, -sin
+        matrices[:, 1, 0], matrices[:, 1, 1] = sin, cos
+        super().__init__(matrices, dtype)
+
+    @property
+    def inv_matrices(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: the inverse of a rotation is its transpose, which
+        NumPy gives us as a view of the matrices (no copy, no computation).
+        """
+        return self.matrices.transpose(0, 2, 1)
+
+    def __getitem__(self, index: int) -> Rotation:
+        return Rotation(float(self.angles[index]))
+
+    def __repr__(self) -> str:
+        return f"RotationBatch({self.angles!r})"
+
+
+class ShearBatch(LinearMapBatch):
+    """N shear transformations parallel to the x axis.
+
+    Args:
+        shear_angles (ArrayLike): the N angles of the shear transformations.
+        dtype (DTypeLike, optional): dtype of the matrices. Defaults to None (the current
+            precision).
+
+    Attributes:
+        shear_factors (NDArray[np.float64]): the N cotangents of the shear angles.
+    """
+
+    def __init__(self, shear_angles: ArrayLike, dtype: DTypeLike | None = None) -> None:
+        shear_angles = np.asarray(shear_angles, dtype=np.float64).reshape(-1)
+        self._set_factors(1 / np.tan(shear_angles), dtype)
+
+    @classmethod
+    def from_factors(cls, shear_factors: ArrayLike, dtype: DTypeLike | None = None) -> ShearBatch:
+        """Create the shears directly from their shear factors (instead of the angles)."""
+        shears = cls.__new__(cls)  # create the instance without calling __init__
+        shears._set_factors(np.asarray(shear_factors, dtype=np.float64).reshape(-1), dtype)
+        return shears
+
+    def _set_factors(self, shear_factors: NDArray[np.float64], dtype: DTypeLike | None) -> None:
+        self.shear_factors = shear_factors
+        LinearMapBatch.__init__(self, self._shear_matrices(shear_factors), dtype)
+
+    @staticmethod
+    def _shear_matrices(shear_factors: NDArray[np.float64]) -> NDArray[np.float64]:
+        matrices = np.zeros((len(shear_factors), 2, 2))
+        matrices[:, 0, 0] = matrices[:, 1, 1] = 1
+        matrices[:, 0, 1] = shear_factors
+        return matrices
+
+    @cached_property
+    def inv_matrices(self) -> NDArray[np.float64]:  # type: ignore[override]
+        """NDArray[np.float64]: the inverse of a shear is the shear with the opposite
+        factor. It is computed the first time it is needed and then cached.
+        """
+        return self._shear_matrices(-self.shear_factors).astype(self.matrices.dtype, copy=False)
+
+    def __getitem__(self, index: int) -> Shear:
+        return Shear.from_factor(float(self.shear_factors[index]))
+
+    def __repr__(self) -> str:
+        return f"ShearBatch.from_factors({self.shear_factors!r})"
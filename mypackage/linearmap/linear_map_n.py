@@ -0,0 +1,155 @@
+"""This module contains LinearMapN, a linear map of vectors with any number of components.
+
+The maps of linear_map.py multiply 2x2 matrices by hand, entry by entry, which is the
+fastest way for the plane. LinearMapN instead keeps an (n, n) NumPy matrix and lets
+BLAS do the matrix products, so it works for 3D vectors and beyond. Its inverse is
+computed (once, when first needed) by mypackage.linalg.
+
+Examples:
+    A rotation around the z axis in 3D:
+
+    >>> rotation = LinearMapN([[0, -1, 0], [1, 0, 0], [0, 0, 1]], preserves_norm=True)
+    >>> rotation(VectorN([1, 0, 5]))
+    VectorN([0.0, 1.0, 5.0])
+    >>> rotation.inverse(VectorN([0, 1, 5]))
+    VectorN([1.0, 0.0, 5.0])
+
+    Like the 2D maps, they also transform (N, n) arrays of coordinates at once:
+
+    >>> rotation(np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 2.0]]))
+    array([[0., 1., 0.],
+           [0., 0., 2.]])
+
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from mypackage.linalg import inverse
+from mypackage.vector import vector as _vector_module
+from mypackage.vector.vector_n import VectorN
+
+from .linear_map import LinearMap
+
+
+class LinearMapN:
+    """Linear map of n dimensional vectors given by any (n, n) matrix.
+
+    Args:
+        matrix (ArrayLike): the (n, n) matrix of the map.
+        preserves_norm (bool, optional): whether the map (and its inverse) never changes
+            the norm of a vector, e.g. a rotation, so the MAX_NORM check can be skipped.
+            Defaults to False.
+
+    Attributes:
+        matrix (NDArray[np.float64]): the matrix of the map, as a read only contiguous array.
+        inv_matrix (NDArray[np.float64]): the matrix of the inverse map.
+        preserves_norm (bool): whether the map preserves the norm of the vectors.
+
+    Raises:
+        ValueError: The matrix is not square.
+    """
+
+    def __init__(self, matrix: ArrayLike, preserves_norm: bool = False) -> None:
+        array = np.array(matrix, dtype=np.float64)  # a contiguous copy nobody else can change
+        if array.ndim != 2 or array.shape[0] != array.shape[1]:
+            raise ValueError(f"The matrix must be square, but got shape {array.shape}.")
+        array.flags.writeable = False
+        self.matrix: NDArray[np.float64] = array
+        self.preserves_norm = preserves_norm
+
+    @classmethod
+    def from_linear_map(cls, linear_map: LinearMap) -> LinearMapN:
+        """Create the equivalent LinearMapN of a two dimensional LinearMap."""
+        return cls(linear_map.matrix, linear_map.preserves_norm)
+
+    @property
+    def dimension(self) -> int:
+        """int: number of components of the vectors the map transforms."""
+        return self.matrix.shape[0]
+
+    @cached_property
+    def inv_matrix(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: the matrix of the inverse map, computed the first time
+        it is needed (raises a SingularMatrixError if the map has no inverse).
+        """
+        inv_matrix = inverse(self.matrix)
+        inv_matrix.flags.writeable = False
+        return inv_matrix
+
+    def __call__(
+        self, vector: VectorN | NDArray[np.float64], out: NDArray[np.float64] | None = None
+    ) -> VectorN | NDArray[np.float64]:
+        """Apply the linear map to a vector or to an (N, n) array of coordinates.
+
+        Args:
+            vector (VectorN | NDArray): Vector to map, or a batch of N vectors given as
+                an (N, n) array of coordinates (which are not checked against MAX_NORM).
+            out (NDArray, optional): Preallocated (N, n) array where the transformed
+                batch is written. Defaults to None.
+
+        Returns:
+            VectorN | NDArray: Transformed vector(s), of the same type as the input.
+
+        Raises:
+            TypeError: Not VectorN/ndarray passed in.
+            ValueError: The dimensions of the vector(s) and the map do not match.
+            NormError: The transformed vector is too big.
+        """
+        return self._apply(self.matrix, vector, out)
+
+    def inverse(
+        self, vector: VectorN | NDArray[np.float64], out: NDArray[np.float64] | None = None
+    ) -> VectorN | NDArray[np.float64]:
+        """Apply the inverse of the map to a vector or a batch of vectors (see __call__).
+
+        Raises:
+            SingularMatrixError: The map has no inverse.
+        """
+        return self._apply(self.inv_matrix, vector, out)
+
+    def __matmul__(self, other: LinearMapN) -> LinearMapN:
+        """Compose two maps: `(self @ other)(vector) == self(other(vector))`.
+
+        Raises:
+            ValueError: The maps have different dimensions.
+        """
+        if not isinstance(other, LinearMapN):
+            return NotImplemented
+        if other.dimension != self.dimension:
+            raise ValueError(
+                f"Maps of different dimensions: {self.dimension} and {other.dimension}."
+            )
+        return LinearMapN(self.matrix @ other.matrix, self.preserves_norm and other.preserves_norm)
+
+    def __repr__(self) -> str:
+        return f"LinearMapN({self.matrix.tolist()})"
+
+    def _apply(
+        self,
+        matrix: NDArray[np.float64],
+        vector: VectorN | NDArray[np.float64],
+        out: NDArray[np.float64] | None,
+    ) -> VectorN | NDArray[np.float64]:
+        """Multiply the vector (a single matrix-vector product) or every vector of the
+        batch (a single matrix-matrix product) by the matrix.
+        """
+        if isinstance(vector, VectorN):
+            if len(vector) != self.dimension:
+                raise ValueError(f"Expected a vector of dimension {self.dimension}.")
+            components = matrix @ vector.components
+            if self.preserves_norm or _vector_module._validation == _vector_module.OFF:
+                return VectorN._from_trusted(components)
+            return VectorN(components)
+
+        if not isinstance(vector, np.ndarray):
+            raise TypeError("You must pass in a VectorN or ndarray instance!")
+        if vector.ndim != 2 or vector.shape[1] != self.dimension:
+            expected_shape = f"(N, {self.dimension})"
+            raise ValueError(f"The batch must have shape {expected_shape}, not {vector.shape}.")
+        # Our vectors are the rows of the batch, so we compute batch @ matrix.T
+        return np.matmul(vector, matrix.T, out=out)
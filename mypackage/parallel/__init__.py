@@ -0,0 +1,6 @@
+"""To import from the process_pool.py module we can also type
+from mypackage.parallel.process_pool import ProcessPool
+"""
+
+from .process_pool import ProcessPool, SharedArray, scaling_benchmark
+from .thread_pool import ThreadPool, get_thread_pool, thread_scaling_benchmark
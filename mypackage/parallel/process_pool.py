@@ -0,0 +1,301 @@
+"""This module spreads batch operations over several processes.
+
+Each process has its own interpreter (and its own GIL), so a pool of processes can use
+all the cores of the machine. The problem is that sending big arrays to other processes
+usually means pickling and copying them. Instead, we keep the vectors in shared memory
+(see SharedArray): every worker maps the same memory, reads its shard of the input and
+writes its shard of the output in place. The only things sent to the workers are the
+name of the shared memory blocks, the bounds of the shard and the four numbers of the
+matrix of the linear map.
+
+Examples:
+    The pool is created once and reused, so the processes are only spawned once:
+
+    >>> with ProcessPool(workers=4) as pool, SharedArray.from_array(points) as vectors:
+    ...     rotated = pool.apply(Rotation(0.5), vectors)
+    ...     violations = pool.norm_violations(rotated)
+
+    As with any multiprocessing code, scripts must create the pool under an
+    `if __name__ == "__main__":` guard, since the workers import the main module.
+
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context, shared_memory
+from multiprocessing.context import BaseContext
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+from mypackage.backend import numpy_kernels
+from mypackage.vector.vector import MAX_NORM
+
+if TYPE_CHECKING:
+    from mypackage.linearmap import LinearMap
+
+
+class SharedArray:
+    """Array of vectors stored in a block of shared memory that other processes can map.
+
+    Note:
+        The process that creates the block owns it and must `unlink` it when it is no
+        longer needed (using the object as a context manager does it for us). Any view of
+        `array` must be deleted before closing, since the memory disappears with it.
+
+    Args:
+        shape (tuple[int, ...]): shape of the array, usually (N, 2).
+        dtype (DTypeLike, optional): type of the elements. Defaults to np.float64.
+        name (str, optional): name of an existing block to attach to. Defaults to None,
+            which creates a new block.
+
+    Attributes:
+        array (NDArray): the array, whose data lives in the shared memory block.
+        name (str): name of the shared memory block.
+    """
+
+    def __init__(
+        self, shape: tuple[int, ...], dtype: DTypeLike = np.float64, name: str | None = None
+    ) -> None:
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)  # blocks cannot be empty
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._memory = _attach(name)
+        self.name: str = self._memory.name
+        self.array: NDArray[Any] = np.ndarray(shape, dtype=dtype, buffer=self._memory.buf)
+
+    @classmethod
+    def from_array(cls, array: ArrayLike) -> SharedArray:
+        """Create a new shared array with a copy of the given array."""
+        array = np.asarray(array)
+        shared_array = cls(array.shape, array.dtype)
+        shared_array.array[...] = array
+        return shared_array
+
+    def close(self) -> None:
+        """Stop using the shared memory from this process."""
+        del self.array  # the memory cannot be closed while an array points to it
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory block (only its creator should call this)."""
+        self._memory.unlink()
+
+    def __enter__(self) -> SharedArray:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+        self.unlink()
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block.
+
+    Note:
+        Before Python 3.13, attaching registers the block in the resource tracker, which
+        may then try to free it when the worker exits. Newer versions let us opt out.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+# Tasks run by the workers. They must be module-level functions so they can be pickled.
+
+
+def _apply_shard(
+    matrix: tuple[float, float, float, float],
+    input_name: str,
+    output_name: str,
+    shape: tuple[int, int],
+    dtype: str,
+    start: int,
+    stop: int,
+) -> None:
+    vectors = SharedArray(shape, dtype, input_name)
+    # Two mappings of the same block live at different addresses, so NumPy would not
+    # notice that they overlap and would overwrite the input while still reading it
+    out = vectors if output_name == input_name else SharedArray(shape, dtype, output_name)
+    try:
+        matrix_array = np.array(matrix, dtype=np.float64).reshape(2, 2)
+        numpy_kernels.apply(matrix_array, vectors.array[start:stop], out.array[start:stop])
+    finally:
+        vectors.close()
+        if out is not vectors:
+            out.close()
+
+
+def _norm_violations_shard(
+    name: str, shape: tuple[int, int], dtype: str, start: int, stop: int, max_norm: float
+) -> NDArray[np.intp]:
+    vectors = SharedArray(shape, dtype, name)
+    try:
+        return numpy_kernels.norm_violations(vectors.array[start:stop], max_norm) + start
+    finally:
+        vectors.close()
+
+
+def _warm_up(_: int) -> int:
+    return os.getpid()
+
+
+class ProcessPool:
+    """Pool of worker processes that apply linear maps and validate norms of batches
+    of vectors stored in shared memory.
+
+    Note:
+        Each worker uses the NumPy kernels: the parallelism comes from the processes,
+        so multi-threaded kernels would only compete for the same cores.
+
+        The workers are started by a fork server (or spawned where there is none) instead
+        of forking our process: forking a process that runs threads, like the ones of the
+        Numba backend, can leave it deadlocked.
+
+    Args:
+        workers (int, optional): number of processes. Defaults to the number of CPUs.
+        mp_context (BaseContext, optional): multiprocessing context used to start the
+            processes (e.g. multiprocessing.get_context("spawn")). Defaults to None,
+            which uses the "forkserver" start method if available and "spawn" otherwise.
+
+    Attributes:
+        workers (int): number of processes.
+    """
+
+    def __init__(self, workers: int | None = None, mp_context: BaseContext | None = None) -> None:
+        self.workers: int = workers or os.cpu_count() or 1
+        if mp_context is None:
+            start_method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+            mp_context = get_context(start_method)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context)
+        # Spawn all the processes now, so the first call is not slower than the others
+        list(self._executor.map(_warm_up, range(self.workers)))
+
+    def __enter__(self) -> ProcessPool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown()
+
+    def _shards(self, size: int) -> list[tuple[int, int]]:
+        """Split range(size) in (at most) one contiguous shard per worker."""
+        bounds = np.linspace(0, size, self.workers + 1).astype(int).tolist()
+        return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    def apply(
+        self,
+        linear_map: LinearMap,
+        vectors: SharedArray,
+        out: SharedArray | None = None,
+        inverse: bool = False,
+    ) -> SharedArray:
+        """Apply a linear map (or its inverse) to every vector of a shared array.
+
+        Note:
+            The vectors are treated as plain coordinates: their norms are not checked
+            (see `norm_violations`).
+
+        Args:
+            linear_map (LinearMap): map to apply.
+            vectors (SharedArray): (N, 2) shared array with the vectors.
+            out (SharedArray, optional): (N, 2) shared array where the result is written.
+                It may be `vectors` itself. Defaults to None, which creates a new one
+                (that the caller must close and unlink).
+            inverse (bool, optional): apply the inverse of the map instead. Defaults to False.
+
+        Returns:
+            SharedArray: The shared array with the transformed vectors.
+
+        Raises:
+            ValueError: The arrays do not have shape (N, 2) or are different.
+        """
+        shape = vectors.array.shape
+        if len(shape) != 2 or shape[1] != 2:
+            raise ValueError(f"The vectors must have shape (N, 2), but got {shape}.")
+        if out is None:
+            out = SharedArray(shape, vectors.array.dtype)
+        elif out.array.shape != shape or out.array.dtype != vectors.array.dtype:
+            raise ValueError("The out array must have the same shape and dtype as the vectors.")
+
+        matrix = np.asarray(linear_map.inv_matrix if inverse else linear_map.matrix, dtype=float)
+        parameters = tuple(matrix.ravel().tolist())
+        dtype = vectors.array.dtype.str
+        futures = [
+            self._executor.submit(
+                _apply_shard, parameters, vectors.name, out.name, shape, dtype, start, stop
+            )
+            for start, stop in self._shards(shape[0])
+        ]
+        for future in futures:
+            future.result()  # raises here any exception of the workers
+        return out
+
+    def norm_violations(self, vectors: SharedArray) -> NDArray[np.intp]:
+        """Indices of the vectors of a shared array whose norm is greater than MAX_NORM."""
+        shape, dtype = vectors.array.shape, vectors.array.dtype.str
+        futures = [
+            self._executor.submit(
+                _norm_violations_shard, vectors.name, shape, dtype, start, stop, MAX_NORM
+            )
+            for start, stop in self._shards(shape[0])
+        ]
+        indices = [future.result() for future in futures]
+        return np.concatenate(indices) if indices else np.empty(0, dtype=np.intp)
+
+
+def scaling_benchmark(
+    size: int = 10_000_000, max_workers: int | None = None, repeat: int = 5
+) -> list[tuple[int, float, float]]:
+    """Measure how the time to rotate `size` vectors scales with the number of workers.
+
+    Args:
+        size (int, optional): number of vectors. Defaults to 10_000_000.
+        max_workers (int, optional): largest pool to try. Defaults to the number of CPUs.
+        repeat (int, optional): number of measurements per pool (we keep the best one).
+
+    Returns:
+        list[tuple[int, float, float]]: workers, best time in seconds and speedup with
+            respect to a single worker, for 1, 2, ..., max_workers workers.
+    """
+    from mypackage.linearmap import Rotation
+
+    rotation = Rotation(0.5)
+    results: list[tuple[int, float, float]] = []
+    rng = np.random.default_rng(0)
+    with SharedArray.from_array(rng.uniform(-50, 50, size=(size, 2))) as vectors:
+        with SharedArray((size, 2)) as out:
+            for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+                with ProcessPool(workers) as pool:
+                    times = []
+                    for _ in range(repeat):
+                        start_time = time.perf_counter()
+                        pool.apply(rotation, vectors, out)
+                        times.append(time.perf_counter() - start_time)
+                best_time = min(times)
+                results.append((workers, best_time, results[0][1] / best_time if results else 1.0))
+    return results
@@ -0,0 +1,222 @@
+"""This module spreads batch operations over several threads of the same process.
+
+Threads share the memory of the process, so unlike a ProcessPool they need no shared
+memory blocks, and starting a task costs microseconds instead of milliseconds. Python
+threads usually cannot run at the same time because of the GIL, but NumPy releases it
+while its ufuncs (and matmul and einsum) crunch the numbers in C. Therefore a pool of
+threads, each running the NumPy kernels on its own chunk of the batch, keeps all the
+cores busy from a single process.
+
+A ThreadPool offers the same functions as the kernel modules of mypackage.backend (with
+the same arguments), so the batch methods of VectorArray and LinearMap accept a
+`workers=` argument and simply use a pool instead of the current backend.
+
+Note:
+    Small batches are not worth splitting: sending a chunk to a thread costs around ten
+    microseconds, as much as transforming tens of thousands of vectors. Chunks have at
+    least MIN_CHUNK_SIZE vectors, and a batch smaller than that runs in the calling
+    thread.
+
+    The pool uses the NumPy kernels whatever the backend: the Numba kernels already
+    spread each call over all the cores with their own threads.
+
+Examples:
+    >>> rotated = Rotation(0.5)(points, workers=4)
+    >>> VectorArray(points).validate(workers=4)
+
+    Or, to call the kernels directly:
+
+    >>> pool = get_thread_pool(4)
+    >>> pool.apply(Rotation(0.5).matrix, points, out=points)
+
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mypackage.backend import numpy_kernels
+
+
+MIN_CHUNK_SIZE: int = 1 << 15  # vectors
+
+_pools: dict[int, ThreadPool] = {}
+_pools_lock = threading.Lock()
+
+
+class ThreadPool:
+    """Pool of threads that run the NumPy kernels on chunks of a batch of vectors.
+
+    Note:
+        The calling thread processes the first chunk itself instead of waiting idle, so
+        the pool only starts `workers - 1` threads.
+
+    Args:
+        workers (int, optional): number of threads working on each batch, including
+            the calling one. Defaults to the number of CPUs.
+
+    Attributes:
+        workers (int): number of threads working on each batch.
+
+    Raises:
+        ValueError: The number of workers is not positive.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers: int = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError(f"The number of workers must be positive, not {self.workers}.")
+        self._executor = (
+            ThreadPoolExecutor(self.workers - 1, thread_name_prefix="mypackage")
+            if self.workers > 1
+            else None
+        )
+
+    def __enter__(self) -> ThreadPool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop the threads."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _chunks(self, size: int) -> list[slice]:
+        """Split range(size) in at most one contiguous chunk per worker, none of them
+        (except for a lone chunk) smaller than MIN_CHUNK_SIZE.
+        """
+        count = max(min(self.workers, size // MIN_CHUNK_SIZE), 1)
+        bounds = np.linspace(0, size, count + 1).astype(int).tolist()
+        return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def _run(self, task: Callable[[slice], Any], size: int) -> list[Any]:
+        """Call the task with every chunk of range(size) and return the results in order."""
+        chunks = self._chunks(size)
+        if self._executor is None or len(chunks) == 1:
+            return [task(chunk) for chunk in chunks]
+        futures = [self._executor.submit(task, chunk) for chunk in chunks[1:]]
+        first_result = task(chunks[0])
+        return [first_result] + [future.result() for future in futures]
+
+    def apply(
+        self, matrix: NDArray[np.float64], a: NDArray[np.float64], out: NDArray[np.float64]
+    ) -> NDArray:
+        """Multiplication of every vector by a 2x2 matrix (see numpy_kernels.apply)."""
+        self._run(lambda chunk: numpy_kernels.apply(matrix, a[chunk], out[chunk]), len(a))
+        return out
+
+    def apply_each(
+        self, matrices: NDArray[np.float64], a: NDArray[np.float64], out: NDArray[np.float64]
+    ) -> NDArray:
+        """Multiplication of the i-th vector by the i-th matrix (see
+        numpy_kernels.apply_each). If `a` has shape (1, 2), every matrix multiplies it.
+        """
+
+        def task(chunk: slice) -> None:
+            numpy_kernels.apply_each(matrices[chunk], a if len(a) == 1 else a[chunk], out[chunk])
+
+        self._run(task, len(out))
+        return out
+
+    def norm(self, a: NDArray[np.float64], out: NDArray[np.float64]) -> NDArray:
+        """Euclidean norms of the vectors, written in an (N,) array."""
+        self._run(lambda chunk: numpy_kernels.norm(a[chunk], out[chunk]), len(a))
+        return out
+
+    def norm_violations(self, a: NDArray[np.float64], max_norm: float) -> NDArray[np.intp]:
+        """Indices of the vectors whose norm is greater than max_norm."""
+        indices = self._run(
+            lambda chunk: numpy_kernels.norm_violations(a[chunk], max_norm) + chunk.start, len(a)
+        )
+        return np.concatenate(indices)
+
+    def project(
+        self, a: NDArray[np.float64], s: NDArray[np.float64], out: NDArray[np.float64]
+    ) -> NDArray:
+        """Projection of every vector of `a` onto the subspace spanned by `s`, which has
+        shape (N, 2) or (1, 2) (see numpy_kernels.project).
+        """
+
+        def task(chunk: slice) -> None:
+            numpy_kernels.project(a[chunk], s if len(s) == 1 else s[chunk], out[chunk])
+
+        self._run(task, len(a))
+        return out
+
+
+def get_thread_pool(workers: int | None = None) -> ThreadPool:
+    """Return the pool with the given number of workers, which is created the first time
+    and then reused (starting threads for every call would waste the gain).
+
+    Args:
+        workers (int, optional): number of threads. Defaults to the number of CPUs.
+    """
+    workers = workers or os.cpu_count() or 1
+    with _pools_lock:  # two threads could ask for a new pool at the same time
+        if workers not in _pools:
+            _pools[workers] = ThreadPool(workers)
+        return _pools[workers]
+
+
+def thread_scaling_benchmark(
+    size: int = 10_000_000,
+    max_workers: int | None = None,
+    repeat: int = 5,
+    operation: str = "apply",
+) -> list[tuple[int, float, float]]:
+    """Measure how the time of a batch operation scales with the number of threads.
+
+    Args:
+        size (int, optional): number of vectors. Defaults to 10_000_000.
+        max_workers (int, optional): largest pool to try. Defaults to the number of CPUs.
+        repeat (int, optional): number of measurements per pool (we keep the best one).
+        operation (str, optional): "apply" (rotate the vectors), "validate" (check their
+            norms) or "project" (project them onto a vector). Defaults to "apply".
+
+    Returns:
+        list[tuple[int, float, float]]: workers, best time in seconds and speedup with
+            respect to a single worker, for 1, 2, ..., max_workers workers.
+
+    Raises:
+        ValueError: Unknown operation.
+    """
+    rng = np.random.default_rng(0)
+    vectors = rng.uniform(-50, 50, size=(size, 2))
+    out = np.empty_like(vectors)
+    matrix = np.array([[np.cos(0.5), -np.sin(0.5)], [np.sin(0.5), np.cos(0.5)]])
+    subspace = np.array([[3.0, 4.0]])
+    operations: dict[str, Callable[[ThreadPool], object]] = {
+        "apply": lambda pool: pool.apply(matrix, vectors, out),
+        "validate": lambda pool: pool.norm_violations(vectors, 100.0),
+        "project": lambda pool: pool.project(vectors, subspace, out),
+    }
+    if operation not in operations:
+        raise ValueError(f"The operation must be one of {tuple(operations)}, not {operation!r}.")
+
+    results: list[tuple[int, float, float]] = []
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        with ThreadPool(workers) as pool:
+            times = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                operations[operation](pool)
+                times.append(time.perf_counter() - start_time)
+        best_time = min(times)
+        results.append((workers, best_time, results[0][1] / best_time if results else 1.0))
+    return results
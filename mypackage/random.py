@@ -0,0 +1,196 @@
+"""This module generates batches of random vectors and linear maps.
+
+Drawing the coordinates of each Vector with its own call to the random number generator
+(`Vector(*rng.integers(-10, 10, 2))`) pays the overhead of a NumPy call per vector, which
+takes longer than the arithmetic we want to test. The functions of this module draw all
+the coordinates of a batch with a single call, directly into the (N, 2) array of a
+VectorArray (in the dtype of the current precision, see mypackage.backend.precision).
+
+Every function takes a `seed`: an integer (or None) creates a new generator, while a
+Generator is used as it is, so successive calls continue its sequence. Parallel jobs
+must not share a generator, nor use seeds like 0, 1, 2...: `spawn_generators` creates
+independent generators from a single seed, so the results are reproducible whatever
+worker runs each job.
+
+Attributes:
+    Seed (type): what the functions accept as seed.
+
+Examples:
+    >>> points = in_disk(1_000_000, seed=42)  # norms below MAX_NORM, no NormError
+    >>> maps = rotations(1_000_000, seed=43)
+    >>> maps(points)
+
+    Independent streams for 4 workers of a Monte Carlo simulation:
+
+    >>> generators = spawn_generators(2024, 4)
+    >>> with ThreadPoolExecutor(4) as executor:
+    ...     results = list(executor.map(simulate, generators))
+
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from mypackage.backend.precision import resolve_dtype
+from mypackage.linearmap import RotationBatch, ShearBatch
+from mypackage.vector import Vector, VectorArray
+from mypackage.vector.vector import MAX_NORM
+
+
+Seed = int | np.random.SeedSequence | np.random.Generator | None
+
+
+def spawn_generators(
+    seed: int | np.random.SeedSequence | None, count: int
+) -> list[np.random.Generator]:
+    """Create `count` independent random number generators from a single seed.
+
+    Note:
+        SeedSequence.spawn derives the seeds of the children so that their streams do
+        not overlap, unlike consecutive integer seeds, which may be correlated.
+
+    Args:
+        seed (int | SeedSequence | None): root seed. None takes fresh entropy from the
+            operating system (print `SeedSequence().entropy` to reproduce the run).
+        count (int): number of generators, e.g. one per worker or per job.
+
+    Returns:
+        list[np.random.Generator]: the independent generators.
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in root.spawn(count)]
+
+
+def uniform(
+    size: int, low: float = -1.0, high: float = 1.0, seed: Seed = None, dtype: DTypeLike = None
+) -> VectorArray:
+    """Vectors with coordinates uniformly distributed in [low, high).
+
+    Args:
+        size (int): number of vectors.
+        low (float, optional): lower bound of the coordinates. Defaults to -1.
+        high (float, optional): upper bound of the coordinates. Defaults to 1.
+        seed (Seed, optional): seed or generator. Defaults to None.
+        dtype (DTypeLike, optional): Defaults to None (the current precision).
+
+    Raises:
+        NormError: The box reaches beyond MAX_NORM and some vectors are too long
+            (only if the validation mode is EAGER).
+    """
+    array = np.random.default_rng(seed).random((size, 2), dtype=resolve_dtype(dtype))
+    array *= high - low  # in place: no temporary arrays
+    array += low
+    return _batch(array, bound=math.hypot(max(abs(low), abs(high)), max(abs(low), abs(high))))
+
+
+def integers(
+    size: int, low: int = -10, high: int = 10, seed: Seed = None, dtype: DTypeLike = None
+) -> VectorArray:
+    """Vectors with integer coordinates uniformly distributed in [low, high).
+
+    Raises:
+        NormError: Some vectors are longer than MAX_NORM (only if the validation mode
+            is EAGER).
+    """
+    coordinates = np.random.default_rng(seed).integers(low, high, size=(size, 2), dtype=np.int32)
+    largest = max(abs(low), abs(high - 1))
+    return _batch(coordinates.astype(resolve_dtype(dtype)), bound=math.hypot(largest, largest))
+
+
+def normal(
+    size: int,
+    mean: Vector | tuple[float, float] = (0.0, 0.0),
+    std: float = 1.0,
+    seed: Seed = None,
+    dtype: DTypeLike = None,
+) -> VectorArray:
+    """Vectors with independent Gaussian coordinates.
+
+    Args:
+        size (int): number of vectors.
+        mean (Vector | tuple[float, float], optional): mean of the vectors. Defaults to 0.
+        std (float, optional): standard deviation of each coordinate. Defaults to 1.
+        seed (Seed, optional): seed or generator. Defaults to None.
+        dtype (DTypeLike, optional): Defaults to None (the current precision).
+
+    Raises:
+        NormError: Some vectors are longer than MAX_NORM (only if the validation mode
+            is EAGER).
+    """
+    mean_x, mean_y = (mean.x, mean.y) if isinstance(mean, Vector) else mean
+    rng = np.random.default_rng(seed)
+    array = rng.standard_normal((size, 2), dtype=resolve_dtype(dtype))
+    array *= std
+    array += np.array([mean_x, mean_y], dtype=array.dtype)
+    return _batch(array, bound=math.inf)
+
+
+def in_disk(
+    size: int, radius: float = MAX_NORM, seed: Seed = None, dtype: DTypeLike = None
+) -> VectorArray:
+    """Vectors uniformly distributed in the disk of the given radius centered at 0.
+
+    Note:
+        Rejection sampling (drawing points in a square until one falls in the disk)
+        needs a loop and a random number of draws. Instead, we draw an angle and a
+        radius: the area within a distance r of the center grows as r^2, so the
+        distance must be `radius * sqrt(u)` for u uniform in [0, 1) (with `radius * u`
+        the points would pile up near the center).
+
+    Args:
+        size (int): number of vectors.
+        radius (float, optional): radius of the disk, at most MAX_NORM. Defaults to
+            MAX_NORM, so the vectors are never too long.
+        seed (Seed, optional): seed or generator. Defaults to None.
+        dtype (DTypeLike, optional): Defaults to None (the current precision).
+
+    Raises:
+        ValueError: The radius is negative or greater than MAX_NORM.
+    """
+    if not 0 <= radius <= MAX_NORM:
+        raise ValueError(f"The radius must be between 0 and {MAX_NORM}, not {radius}.")
+    dtype = resolve_dtype(dtype)
+    rng = np.random.default_rng(seed)
+    distances = rng.random(size, dtype=dtype)
+    np.sqrt(distances, out=distances)
+    # Shrink the disk by a few roundings, so that cos and sin never push a norm past it
+    distances *= radius * (1 - 4 * np.finfo(dtype).eps)
+    angles = rng.random(size, dtype=dtype)
+    angles *= 2 * np.pi
+    array = np.empty((size, 2), dtype=dtype)
+    np.cos(angles, out=array[:, 0])
+    array[:, 0] *= distances
+    np.sin(angles, out=angles)
+    np.multiply(angles, distances, out=array[:, 1])
+    return VectorArray._from_trusted(array)
+
+
+def rotations(
+    size: int, low: float = 0.0, high: float = 2 * math.pi, seed: Seed = None
+) -> RotationBatch:
+    """Rotations with angles uniformly distributed in [low, high)."""
+    return RotationBatch(np.random.default_rng(seed).uniform(low, high, size))
+
+
+def shears(
+    size: int, low: float = math.pi / 4, high: float = 3 * math.pi / 4, seed: Seed = None
+) -> ShearBatch:
+    """Shears with angles uniformly distributed in [low, high).
+
+    Note:
+        The shear factor is the cotangent of the angle, so the default angles give
+        factors between -1 and 1. Angles close to 0 or pi give huge factors.
+    """
+    return ShearBatch(np.random.default_rng(seed).uniform(low, high, size))
+
+
+def _batch(array: np.ndarray, bound: float) -> VectorArray:
+    """Wrap the array, checking its norms unless none can be longer than `bound`."""
+    vectors = VectorArray._from_trusted(array)
+    if bound > MAX_NORM:
+        vectors._check_norms()
+    return vectors
@@ -0,0 +1,7 @@
+"""To import from the server.py module we can also type
+from mypackage.server.server import TransformServer
+"""
+
+from .client import LoadReport, ServerError, TransformClient, run_load
+from .protocol import ProtocolError
+from .server import BatchStats, MicroBatcher, TransformServer
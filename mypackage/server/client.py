@@ -0,0 +1,257 @@
+"""This module contains the client of the transform server and a load generator to
+measure the server, also available from the terminal as `vector loadgen`.
+
+Examples:
+    Send vectors to a server (inside a coroutine):
+
+    >>> async with await TransformClient.connect(path="/tmp/vector.sock") as client:
+    ...     rotated = await client.transform([[1, 0], [0, 1]])
+
+    Measure the latency and the throughput of a running server with 64 clients that send
+    a request as soon as they get the response of the previous one:
+
+    >>> vector loadgen --unix /tmp/vector.sock --connections 64 --requests 20000
+    20000 requests (20000 vectors) in 1.71 s: 11680 requests/s, 11680 vectors/s,
+    latency p50 5.47 ms, p99 8.50 ms
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from argparse import ArgumentParser
+from collections.abc import Sequence
+from dataclasses import dataclass
+from types import TracebackType
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .protocol import CALL, ERROR, INVERSE, encode, read_frame
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class ServerError(RuntimeError):
+    """Exception raised when the server answers a request with an error."""
+
+
+class TransformClient:
+    """Connection to a transform server.
+
+    Note:
+        Many coroutines can use the same client at once: every request is tagged with
+        an id, and a background task gives each response to the request with its id.
+        Create clients with `TransformClient.connect`.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+        self._request_ids = itertools.count()
+        self._waiting: dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.create_task(self._read_responses(reader))
+
+    @classmethod
+    async def connect(
+        cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None
+    ) -> TransformClient:
+        """Connect to a server on a Unix socket (if a path is given) or a TCP port."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def transform(self, vectors: ArrayLike, inverse: bool = False) -> NDArray[np.float64]:
+        """Apply the map of the server (or its inverse) to an (N, 2) batch of vectors.
+
+        Raises:
+            ServerError: The server could not transform the vectors.
+            ConnectionError: The connection was closed before the response arrived.
+        """
+        if self._reader_task.done():  # nobody would ever set the result of the future
+            raise ConnectionError("The server closed the connection.")
+        request_id = next(self._request_ids) & 0xFFFFFFFF  # the ids are 32-bit integers
+        frame = encode(request_id, INVERSE if inverse else CALL, vectors)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        try:
+            self._writer.write(frame)
+            await self._writer.drain()
+        except BaseException:  # including cancellation: the response will not be awaited
+            self._waiting.pop(request_id, None)
+            raise
+        return await future
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        error: Exception = ConnectionError("The server closed the connection.")
+        try:
+            while True:
+                request_id, code, payload = await read_frame(reader)
+                future = self._waiting.pop(request_id, None)
+                if future is None or future.done():
+                    continue
+                if code == ERROR:
+                    future.set_exception(ServerError(payload))
+                else:
+                    future.set_result(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as exception:  # e.g. a corrupt frame: nothing else can be read
+            error = exception
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._reader_task
+
+    async def __aenter__(self) -> TransformClient:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+@dataclass
+class LoadReport:
+    """Results of a load test.
+
+    Attributes:
+        requests (int): number of requests answered.
+        vectors (int): number of vectors transformed.
+        seconds (float): wall-clock duration of the test.
+        latencies (NDArray[np.float64]): seconds from sending each request until its
+            response arrived.
+    """
+
+    requests: int
+    vectors: int
+    seconds: float
+    latencies: NDArray[np.float64]
+
+    def percentile(self, percent: float) -> float:
+        """Latency (in seconds) that `percent`% of the requests did not exceed."""
+        return float(np.percentile(self.latencies, percent)) if len(self.latencies) else 0.0
+
+    @property
+    def p50(self) -> float:
+        """float: median latency in seconds."""
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        """float: 99th percentile of the latency in seconds (the slowest 1% took longer)."""
+        return self.percentile(99)
+
+    @property
+    def requests_per_second(self) -> float:
+        """float: throughput in requests per second."""
+        return self.requests / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests ({self.vectors} vectors) in {self.seconds:.2f} s: "
+            f"{self.requests_per_second:.0f} requests/s, "
+            f"{self.vectors / self.seconds if self.seconds > 0 else 0.0:.0f} vectors/s, "
+            f"latency p50 {self.p50 * 1e3:.2f} ms, p99 {self.p99 * 1e3:.2f} ms"
+        )
+
+
+async def run_load(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    path: str | None = None,
+    connections: int = 32,
+    requests: int = 10_000,
+    vectors_per_request: int = 1,
+    inverse: bool = False,
+    seed: int = 0,
+) -> LoadReport:
+    """Measure a server with several clients that send requests back to back.
+
+    Note:
+        Each connection waits for a response before sending its next request (a
+        "closed loop"), so `connections` is the number of requests in flight, which is
+        what lets the server coalesce them.
+
+    Args:
+        host, port, path: address of the server (see TransformClient.connect).
+        connections (int, optional): number of concurrent clients. Defaults to 32.
+        requests (int, optional): total number of requests. Defaults to 10_000.
+        vectors_per_request (int, optional): vectors sent in each request. Defaults to 1.
+        inverse (bool, optional): request the inverse map. Defaults to False.
+        seed (int, optional): seed of the random vectors. Defaults to 0.
+
+    Returns:
+        LoadReport: latencies and throughput.
+    """
+    rng = np.random.default_rng(seed)
+    # Generated in advance, so we measure the server and not the random number generator
+    payloads = rng.uniform(-50, 50, size=(min(requests, 1024), vectors_per_request, 2))
+    latencies = np.empty(requests)
+    counter = itertools.count()
+
+    async def client_loop(client: TransformClient) -> None:
+        for index in counter:  # the clients share the counter: each request is sent once
+            if index >= requests:
+                return
+            start_time = time.perf_counter()
+            await client.transform(payloads[index % len(payloads)], inverse)
+            latencies[index] = time.perf_counter() - start_time
+
+    clients = [await TransformClient.connect(host, port, path) for _ in range(connections)]
+    try:
+        start_time = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for client in clients))
+        seconds = time.perf_counter() - start_time
+    finally:
+        for client in clients:
+            await client.close()
+    return LoadReport(requests, requests * vectors_per_request, seconds, latencies)
+
+
+def build_parser() -> ArgumentParser:
+    """Create the parser of the `vector loadgen` arguments."""
+    parser = ArgumentParser(prog="vector loadgen", description="Load test a `vector serve`.")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="TCP host (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="(default: %(default)s)")
+    parser.add_argument("--connections", type=int, default=32, help="(default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=10_000, help="(default: %(default)s)")
+    parser.add_argument(
+        "--vectors", type=int, default=1, help="vectors per request (default: %(default)s)"
+    )
+    parser.add_argument("--inverse", action="store_true", help="request the inverse map")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the load generator from the command line."""
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(
+        run_load(
+            args.host,
+            args.port,
+            args.unix,
+            args.connections,
+            args.requests,
+            args.vectors,
+            args.inverse,
+        )
+    )
+    print(report)
+    return 0
@@ -0,0 +1,85 @@
+"""This module defines how the transform server and its clients talk to each other.
+
+Every message (request or response) is a frame: a 12-byte header followed by a payload.
+All the values are little-endian:
+
+    | offset | size | content                                                     |
+    |--------|------|-------------------------------------------------------------|
+    | 0      | 4    | request id (unsigned integer chosen by the client)          |
+    | 4      | 4    | N, number of vectors (or bytes of the message of an ERROR)  |
+    | 8      | 1    | code (see below)                                            |
+    | 9      | 3    | reserved (zeros)                                            |
+    | 12     | 16N  | coordinates x0 y0 x1 y1 ... as float64                      |
+
+Requests have the code CALL (apply the map) or INVERSE (apply its inverse). Responses
+have the same request id as their request and the code OK, followed by the N transformed
+vectors, or ERROR, followed by a UTF-8 message.
+
+Note:
+    Like the files of binary.py, the payload is exactly the memory of an (N, 2) float64
+    array, so encoding is a `tobytes` and decoding a `frombuffer`, with no parsing at
+    all. A text format like JSON would take longer to parse than to rotate the vectors.
+
+    The request id lets a client send many requests through the same connection without
+    waiting for the responses, which may come back in a different order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+HEADER = struct.Struct("<IIB3x")  # request id, N, code (see the table in the module docstring)
+CALL: int = 0
+INVERSE: int = 1
+OK: int = 0
+ERROR: int = 255
+MAX_VECTORS: int = 1 << 20  # per request: a larger N is more likely a corrupt header
+_DTYPE = np.dtype("<f8")
+
+
+class ProtocolError(ValueError):
+    """Exception raised when a frame does not follow the protocol."""
+
+
+def encode(request_id: int, code: int, vectors: ArrayLike) -> bytes:
+    """Encode a frame with a batch of vectors (a request, or an OK response).
+
+    Raises:
+        ValueError: The vectors do not have shape (N, 2).
+    """
+    array = np.ascontiguousarray(vectors, dtype=_DTYPE)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"The vectors must have shape (N, 2), but got {array.shape}.")
+    return HEADER.pack(request_id, len(array), code) + array.tobytes()
+
+
+def encode_error(request_id: int, message: str) -> bytes:
+    """Encode an ERROR response."""
+    payload = message.encode()
+    return HEADER.pack(request_id, len(payload), ERROR) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, int, NDArray[np.float64] | str]:
+    """Read the next frame of a stream.
+
+    Returns:
+        tuple[int, int, NDArray | str]: request id, code and payload, which is the (N, 2)
+            array of vectors or, for ERROR responses, the message.
+
+    Raises:
+        asyncio.IncompleteReadError: The stream ended (at the start of a frame, if the
+            other side simply closed the connection).
+        ProtocolError: The frame announces too many vectors.
+    """
+    request_id, count, code = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if code == ERROR:
+        return request_id, code, (await reader.readexactly(count)).decode(errors="replace")
+    if count > MAX_VECTORS:
+        raise ProtocolError(f"Frame with {count} vectors, but the limit is {MAX_VECTORS}.")
+    payload = await reader.readexactly(count * 2 * _DTYPE.itemsize)
+    return request_id, code, np.frombuffer(payload, dtype=_DTYPE).reshape(count, 2)
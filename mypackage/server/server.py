@@ -0,0 +1,348 @@
+"""This module contains an asyncio server that applies a linear map to the vectors sent
+by its clients, also available from the terminal as `vector serve`.
+
+Each request usually carries a handful of vectors. Transforming them one request at
+a time would spend most of the CPU on overhead (one NumPy call, or one Vector object,
+per request), so the server coalesces the requests that arrive at about the same time
+into a micro-batch: it gathers the requests that are already waiting (and, optionally,
+the ones arriving up to `max_wait` seconds after the first one) until `max_batch_size`
+vectors are gathered, applies the map to all of them with a single call and sends each
+client its share of the result.
+
+Note:
+    By default `max_wait` is 0: under load many requests arrive in each iteration of
+    the event loop, so the batches fill up without delaying anyone, and a lone request
+    is answered right away. A positive `max_wait` rarely pays off, since the event loop
+    cannot sleep for less than about a millisecond, which is longer than transforming a
+    few thousand vectors. See client.py for a load generator that measures both the
+    latency and the throughput.
+
+Examples:
+    Serve the rotations of 0.5 radians on a Unix socket:
+
+    >>> vector serve --rotate 0.5 --unix /tmp/vector.sock --max-batch-size 4096
+
+    Or from Python (inside a coroutine):
+
+    >>> async with TransformServer(Rotation(0.5)) as server:
+    ...     await server.start(host="127.0.0.1", port=8765)
+    ...     await server.serve_forever()
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from types import TracebackType
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mypackage.linearmap import LinearMap, Rotation, Shear
+
+from .protocol import CALL, INVERSE, OK, ProtocolError, encode, encode_error, read_frame
+
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+DEFAULT_MAX_BATCH_SIZE: int = 4096  # vectors
+DEFAULT_MAX_WAIT: float = 0.0  # seconds
+
+
+@dataclass
+class BatchStats:
+    """Statistics of the micro-batches processed by a MicroBatcher.
+
+    Attributes:
+        requests (int): number of requests.
+        vectors (int): number of vectors transformed.
+        batches (int): number of calls to the linear map.
+        largest_batch (int): most vectors transformed in a single call.
+    """
+
+    requests: int = 0
+    vectors: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+
+    @property
+    def requests_per_batch(self) -> float:
+        """float: average number of requests coalesced in a batch."""
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class MicroBatcher:
+    """Coalesce the vectors of concurrent requests into batches for a single transform.
+
+    Args:
+        transform (Callable): function applied to an (N, 2) array, e.g. a linear map or
+            its inverse. It receives the batch also as the `out` argument, so it can
+            transform it in place.
+        max_batch_size (int, optional): stop gathering requests when the batch has at least
+            this many vectors. Defaults to DEFAULT_MAX_BATCH_SIZE.
+        max_wait (float, optional): seconds to wait for more requests after the first one
+            of a batch. Defaults to DEFAULT_MAX_WAIT.
+
+    Attributes:
+        stats (BatchStats): statistics of the batches processed so far.
+    """
+
+    def __init__(
+        self,
+        transform: Callable[..., NDArray[np.float64]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ) -> None:
+        self.transform = transform
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = BatchStats()
+        self._queue: asyncio.Queue[tuple[NDArray[np.float64], asyncio.Future]] = asyncio.Queue()
+
+    async def submit(self, vectors: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Queue the vectors of a request and wait for them to be transformed."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((vectors, future))
+        return await future
+
+    async def run(self) -> None:
+        """Process batches forever (run it as a task and cancel it to stop)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            yielded = False
+            while size < self.max_batch_size:
+                if self._queue.empty() and not yielded:
+                    # Let the requests read in the same event loop iteration join the batch
+                    await asyncio.sleep(0)
+                    yielded = True
+                    continue
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:  # not the builtin TimeoutError before 3.11
+                        break
+                else:  # requests that are already waiting cost nothing to gather
+                    pending.append(self._queue.get_nowait())
+                size += len(pending[-1][0])
+            self._process(pending)
+
+    def _process(self, pending: list[tuple[NDArray[np.float64], asyncio.Future]]) -> None:
+        """Transform the vectors of all the pending requests with a single call."""
+        sizes = [len(vectors) for vectors, _ in pending]
+        try:
+            batch = np.concatenate([vectors for vectors, _ in pending])  # a writable copy
+            result = self.transform(batch, out=batch)
+        except Exception as error:  # every caller gets the error
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), vectors in zip(pending, np.split(result, np.cumsum(sizes)[:-1])):
+            if not future.done():  # the client may have gone away
+                future.set_result(vectors)
+        self.stats.requests += len(pending)
+        self.stats.vectors += len(batch)
+        self.stats.batches += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+
+
+class TransformServer:
+    """Server that applies a linear map (or its inverse) to the vectors of its clients.
+
+    Note:
+        The vectors are plain coordinates, like the arrays given to a LinearMap: their
+        norms are not checked against MAX_NORM.
+
+    Args:
+        linear_map (LinearMap): the map applied to the vectors.
+        max_batch_size (int, optional): see MicroBatcher. Defaults to DEFAULT_MAX_BATCH_SIZE.
+        max_wait (float, optional): see MicroBatcher. Defaults to DEFAULT_MAX_WAIT.
+
+    Attributes:
+        linear_map (LinearMap): the map applied to the vectors.
+        batchers (dict[int, MicroBatcher]): the batcher of each request code (CALL and
+            INVERSE), whose `stats` tell how well the requests are being coalesced.
+    """
+
+    def __init__(
+        self,
+        linear_map: LinearMap,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ) -> None:
+        self.linear_map = linear_map
+        self.batchers = {
+            CALL: MicroBatcher(linear_map, max_batch_size, max_wait),
+            INVERSE: MicroBatcher(linear_map.inverse, max_batch_size, max_wait),
+        }
+        self._tasks: list[asyncio.Task] = []
+        self._listener: asyncio.Server | None = None
+        self._path: str | None = None
+
+    async def start(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, path: str | None = None
+    ) -> None:
+        """Start listening on a Unix socket (if a path is given) or on a TCP port (port 0
+        picks a free one, see `address`).
+        """
+        if self._listener is not None:
+            raise RuntimeError("The server is already listening.")
+        if path is not None:
+            self._listener = await asyncio.start_unix_server(self._handle, path)
+            self._path = path
+        else:
+            self._listener = await asyncio.start_server(self._handle, host, port)
+        self._tasks = [asyncio.create_task(batcher.run()) for batcher in self.batchers.values()]
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        """str | tuple[str, int]: path of the Unix socket or (host, port) of the server."""
+        if self._listener is None:
+            raise RuntimeError("The server is not listening.")
+        address = self._listener.sockets[0].getsockname()
+        return address if isinstance(address, str) else tuple(address[:2])
+
+    async def serve_forever(self) -> None:
+        """Serve the clients until the task running this coroutine is cancelled."""
+        if self._listener is None:
+            raise RuntimeError("Call start() before serve_forever().")
+        await self._listener.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and processing batches."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._listener is not None:
+            self._listener.close()
+            await self._listener.wait_closed()
+            self._listener = None
+        if self._path is not None:  # the file of a Unix socket outlives the server
+            with suppress(FileNotFoundError):
+                os.unlink(self._path)
+            self._path = None
+
+    async def __aenter__(self) -> TransformServer:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read the requests of a connection, each answered by its own task so that the
+        requests of a client can be batched together (and with those of other clients).
+        """
+        responses: set[asyncio.Task] = set()
+        try:
+            while True:
+                try:
+                    request_id, code, vectors = await read_frame(reader)
+                except asyncio.IncompleteReadError:  # the client closed the connection
+                    break
+                except ProtocolError as error:  # we cannot find the next frame: give up
+                    writer.write(encode_error(0, str(error)))
+                    break
+                task = asyncio.create_task(self._respond(writer, request_id, code, vectors))
+                responses.add(task)  # keep a reference, or the task may be garbage collected
+                task.add_done_callback(responses.discard)
+            await asyncio.gather(*responses)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, request_id: int, code: int, vectors: object
+    ) -> None:
+        if code not in self.batchers or not isinstance(vectors, np.ndarray):
+            writer.write(encode_error(request_id, f"Unknown request code {code}."))
+            return
+        try:
+            result = await self.batchers[code].submit(vectors)
+        except Exception as error:
+            writer.write(encode_error(request_id, f"{type(error).__name__}: {error}"))
+        else:
+            writer.write(encode(request_id, OK, result))
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def build_parser() -> ArgumentParser:
+    """Create the parser of the `vector serve` arguments."""
+    parser = ArgumentParser(prog="vector serve", description="Serve a linear map over a socket.")
+    transform = parser.add_mutually_exclusive_group(required=True)
+    transform.add_argument("--rotate", type=float, metavar="ANGLE", help="serve a rotation")
+    transform.add_argument("--shear", type=float, metavar="ANGLE", help="serve a shear")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="TCP host (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="(default: %(default)s)")
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=DEFAULT_MAX_BATCH_SIZE,
+        help="vectors transformed at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=DEFAULT_MAX_WAIT * 1000,
+        help="milliseconds to wait for a batch to fill up (default: %(default)s)",
+    )
+    return parser
+
+
+async def serve(server: TransformServer, path: str | None, host: str, port: int) -> None:
+    """Run the server until it is cancelled (e.g. with Ctrl+C), then print its statistics."""
+    async with server:
+        await server.start(host, port, path)
+        address = server.address if path else "{}:{}".format(*server.address)
+        name = type(server.linear_map).__name__
+        print(f"Serving a {name} on {address} (Ctrl+C to stop)", file=sys.stderr)
+        # Ctrl+C (or a kill) cancels this coroutine, so the server closes cleanly
+        loop, this_task = asyncio.get_running_loop(), asyncio.current_task()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            with suppress(NotImplementedError):  # there are no signal handlers on Windows
+                loop.add_signal_handler(signal_number, this_task.cancel)  # type: ignore[union-attr]
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for code, batcher in server.batchers.items():
+                stats = batcher.stats
+                print(
+                    f"{'inverse' if code == INVERSE else 'call'}: {stats.requests} requests, "
+                    f"{stats.vectors} vectors in {stats.batches} batches "
+                    f"({stats.requests_per_batch:.1f} requests per batch)",
+                    file=sys.stderr,
+                )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the server from the command line."""
+    args = build_parser().parse_args(argv)
+    linear_map = Rotation(args.rotate) if args.rotate is not None else Shear(args.shear)
+    server = TransformServer(linear_map, args.max_batch_size, args.max_wait_ms / 1000)
+    asyncio.run(serve(server, args.unix, args.host, args.port))
+    return 0
@@ -0,0 +1,522 @@
+"""This module processes unbounded streams of vectors with a pipeline of stages.
+
+A pipeline is a chain of generators, like the ones of the generators notebook in the
+examples: a source yields chunks of vectors, as (N, 2) NumPy arrays, and each stage
+pulls chunks from the previous one and yields new chunks to the next one. Since the
+stages handle whole chunks, the Python overhead of each step is paid once per chunk
+and not once per vector.
+
+Generators only produce a chunk when the next stage asks for it, so a slow stage
+automatically slows down the ones before it (this is called backpressure) and no chunks
+pile up in memory. The `buffer` stage runs the stages before it in another thread, with
+a queue of at most `size` chunks in between: reading the next chunks (from a file or a
+socket) then overlaps with processing the current one, and the memory used is still
+bounded. NumPy releases the GIL while it computes, so both threads do make progress.
+
+Note:
+    Sources yield chunks with the dtype of the current precision (float64 or float32,
+    see mypackage.backend.precision), except from_array, which yields views of the
+    array. The stages keep the dtype of the chunks they receive.
+
+    The stages never modify the chunks they receive, which may be views of an array
+    given by the user, and sources must yield a new array for each chunk (instead of
+    reusing a buffer), since several chunks can be alive at once.
+
+Examples:
+    Rotate the vectors of a socket, drop the ones that are too long and add them up:
+
+    >>> pipeline = Pipeline(
+    ...     from_socket(connection),
+    ...     buffer(),
+    ...     validate_norm(on_error="drop"),
+    ...     apply(Rotation(0.5)),
+    ... )
+    >>> pipeline.run(reduce(lambda total, chunk: total + chunk.sum(axis=0), np.zeros(2)))
+    array([ 1.53, -2.31])
+    >>> print(pipeline.report())
+    stage                          chunks     vectors  seconds  M vectors/s
+    source                             16     1000000    0.012        83.33
+    ...
+
+"""
+
+from __future__ import annotations
+
+import math
+import queue
+import socket
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, BinaryIO, TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+from mypackage.backend import get_backend
+from mypackage.backend.precision import get_dtype, result_dtype
+from mypackage.io.chunked import iter_chunks
+from mypackage.io.text import parse_lines, read_chunks
+from mypackage.linearmap import LinearMap
+from mypackage.vector.vector import MAX_NORM, NormError, Vector
+
+
+DEFAULT_CHUNK_SIZE: int = 65_536  # vectors per chunk
+DEFAULT_BUFFER_SIZE: int = 4  # chunks
+BUFFER_JOIN_TIMEOUT: float = 1.0  # seconds to wait for the thread of a buffer that stops
+
+Chunks = Iterator[NDArray[np.float64]]
+T = TypeVar("T")
+_DTYPE = np.dtype("<f8")  # coordinates of binary streams, as in mypackage/server
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Step of a pipeline.
+
+    Attributes:
+        name (str): name shown in the statistics of the pipeline.
+        function (Callable[[Chunks], Chunks]): generator function that receives the
+            chunks of the previous stage and yields the chunks of the next one.
+    """
+
+    name: str
+    function: Callable[[Chunks], Chunks]
+
+
+@dataclass(frozen=True)
+class Sink:
+    """Final step of a pipeline, which consumes all the chunks and returns a result.
+
+    Attributes:
+        name (str): name shown in the statistics of the pipeline.
+        function (Callable[[Chunks], Any]): function that consumes the chunks.
+    """
+
+    name: str
+    function: Callable[[Chunks], Any]
+
+
+@dataclass
+class StageStats:
+    """Throughput of a stage of a pipeline.
+
+    Attributes:
+        name (str): name of the stage.
+        chunks (int): number of chunks the stage yielded.
+        vectors (int): number of vectors the stage yielded.
+        seconds (float): time spent in the stage itself, not in the stages before it.
+    """
+
+    name: str
+    chunks: int = 0
+    vectors: int = 0
+    seconds: float = 0.0
+
+    @property
+    def vectors_per_second(self) -> float:
+        """float: number of vectors yielded per second spent in the stage."""
+        return self.vectors / self.seconds if self.seconds > 0 else math.inf
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name[:28]:<28} {self.chunks:>8} {self.vectors:>11} {self.seconds:>8.3f} "
+            f"{self.vectors_per_second / 1e6:>12.2f}"
+        )
+
+
+# Sources
+
+
+def from_iterable(
+    items: Iterable[Vector | ArrayLike], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Chunks:
+    """Group an iterable of Vectors or (x, y) pairs in chunks."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, chunk_size)):
+        if isinstance(batch[0], Vector):
+            yield np.array([(vector.x, vector.y) for vector in batch], dtype=get_dtype())
+        else:
+            yield np.array(batch, dtype=get_dtype()).reshape(-1, 2)
+
+
+def from_array(array: ArrayLike, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Chunks:
+    """Yield consecutive chunks (views, not copies) of an (N, 2) array.
+
+    Raises:
+        ValueError: The array does not have shape (N, 2).
+    """
+    array = np.asarray(array)
+    array = array.astype(result_dtype(array), copy=False)  # integers are converted
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"The vectors must have shape (N, 2), but got {array.shape}.")
+    for start in range(0, len(array), chunk_size):
+        yield array[start : start + chunk_size]
+
+
+def from_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Chunks:
+    """Read the vectors of a `.npy` or binary vector file (see mypackage.io) in chunks."""
+    for chunk in iter_chunks(path, chunk_size):
+        yield chunk.astype(get_dtype(), copy=False)
+
+
+def from_text(
+    lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE, delimiter: str | None = None
+) -> Chunks:
+    """Parse text lines with two coordinates each (see mypackage.io.text) in chunks,
+    skipping the lines that cannot be parsed.
+    """
+    for chunk_lines in read_chunks(lines, chunk_size):
+        array, _, _ = parse_lines(chunk_lines, delimiter)
+        if len(array):
+            yield array.astype(get_dtype(), copy=False)
+
+
+def from_stream(
+    stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE, dtype: DTypeLike = _DTYPE
+) -> Chunks:
+    """Read the coordinates x0 y0 x1 y1 ... of a binary stream until the stream ends.
+
+    Note:
+        A chunk is yielded when it is full or the stream ends, so a slow stream may
+        take a while to fill a chunk: use a smaller chunk size if latency matters.
+
+    Args:
+        stream (BinaryIO): binary file, pipe or socket file.
+        chunk_size (int, optional): vectors per chunk. Defaults to DEFAULT_CHUNK_SIZE.
+        dtype (DTypeLike, optional): type of the coordinates in the stream. Defaults
+            to little-endian float64, as in mypackage.server.
+
+    Raises:
+        ValueError: The stream ended in the middle of a vector.
+    """
+    dtype = np.dtype(dtype)
+    vector_size = 2 * dtype.itemsize
+    while True:
+        chunk = np.empty((chunk_size, 2), dtype=dtype)
+        view = memoryview(chunk).cast("B")
+        filled = 0
+        while filled < len(view):
+            read = stream.readinto(view[filled:])
+            if not read:
+                break
+            filled += read
+        if filled % vector_size:
+            raise ValueError("The stream ended in the middle of a vector.")
+        if filled:
+            yield chunk[: filled // vector_size].astype(get_dtype(), copy=False)
+        if filled < len(view):
+            return
+
+
+def from_socket(
+    connection: socket.socket, chunk_size: int = DEFAULT_CHUNK_SIZE, dtype: DTypeLike = _DTYPE
+) -> Chunks:
+    """Read binary coordinates (see from_stream) from a socket until it is closed."""
+    with connection.makefile("rb") as stream:
+        yield from from_stream(stream, chunk_size, dtype)
+
+
+# Stages
+
+
+def chunk(size: int = DEFAULT_CHUNK_SIZE) -> Stage:
+    """Regroup the vectors in chunks of exactly `size` vectors (except the last one).
+
+    Note:
+        Small chunks waste time in overhead and huge ones waste memory, and sources do
+        not always let us choose (e.g. a socket yields what it receives).
+    """
+    if size < 1:
+        raise ValueError(f"The chunk size must be positive, not {size}.")
+
+    def regroup(chunks: Chunks) -> Chunks:
+        pending: list[NDArray[np.float64]] = []
+        count = 0
+        for array in chunks:
+            start = 0
+            while start < len(array):
+                take = min(size - count, len(array) - start)
+                if count == 0 and take == size:  # a whole chunk: no copy needed
+                    yield array[start : start + size]
+                else:
+                    pending.append(array[start : start + take])
+                    count += take
+                    if count == size:
+                        yield np.concatenate(pending)
+                        pending, count = [], 0
+                start += take
+        if pending:
+            yield np.concatenate(pending)
+
+    return Stage(f"chunk({size})", regroup)
+
+
+def validate_norm(on_error: str = "raise") -> Stage:
+    """Check that the norms of the vectors are not greater than MAX_NORM.
+
+    Args:
+        on_error (str, optional): "raise" a NormError with the positions (in the whole
+            stream) of the offending vectors of the chunk, or "drop" them. Defaults
+            to "raise".
+
+    Raises:
+        ValueError: Unknown on_error.
+    """
+    if on_error not in ("raise", "drop"):
+        raise ValueError(f"on_error must be 'raise' or 'drop', not {on_error!r}.")
+
+    def validate(chunks: Chunks) -> Chunks:
+        position = 0
+        for array in chunks:
+            offending = get_backend().norm_violations(array, MAX_NORM)
+            if offending.size:
+                if on_error == "raise":
+                    norms = np.hypot(array[offending, 0], array[offending, 1])
+                    raise NormError(float(norms.max()), (offending + position).tolist())
+                position += len(array)
+                array = np.delete(array, offending, axis=0)
+            else:
+                position += len(array)
+            yield array
+
+    return Stage(f"validate_norm({on_error})", validate)
+
+
+def apply(linear_map: LinearMap, inverse: bool = False) -> Stage:
+    """Apply a linear map (or its inverse) to the vectors."""
+    transform = linear_map.inverse if inverse else linear_map
+
+    def apply_map(chunks: Chunks) -> Chunks:
+        for array in chunks:
+            yield transform(array)
+
+    return Stage(f"apply({'inverse ' if inverse else ''}{type(linear_map).__name__})", apply_map)
+
+
+def project_onto(subspace: Vector) -> Stage:
+    """Project the vectors onto the subspace spanned by a vector.
+
+    Raises:
+        ZeroDivisionError: The subspace is the zero vector, as in Vector.projection.
+    """
+    if subspace * subspace == 0:  # checked now, not as NaN chunks in the middle of a run
+        raise ZeroDivisionError("Cannot project onto the zero vector.")
+    subspace_array = np.array([[subspace.x, subspace.y]], dtype=np.float64)
+
+    def project(chunks: Chunks) -> Chunks:
+        for array in chunks:
+            subspace_chunk = subspace_array.astype(array.dtype, copy=False)
+            yield get_backend().project(array, subspace_chunk, np.empty_like(array))
+
+    return Stage(f"project_onto({subspace!r})", project)
+
+
+def buffer(size: int = DEFAULT_BUFFER_SIZE) -> Stage:
+    """Run the stages before this one in a background thread, keeping at most `size`
+    chunks ready in a queue.
+
+    Note:
+        When the queue is full, the background thread waits (backpressure); when it is
+        empty, the next stages wait. The time reported for this stage is how long the
+        next stages waited for chunks beyond the work of the previous stages.
+
+        When the next stages stop early (an error, or a consumer that breaks out of the
+        loop), the background thread stops as soon as it tries to queue its next chunk.
+        But a thread cannot be interrupted while it waits for the source, e.g. a socket
+        with no data: after BUFFER_JOIN_TIMEOUT seconds we leave it behind (it is a
+        daemon thread, so it does not keep the program alive). Close the source to stop
+        it for good.
+    """
+    if size < 1:
+        raise ValueError(f"The buffer size must be positive, not {size}.")
+
+    def run_in_background(chunks: Chunks) -> Chunks:
+        chunk_queue: queue.Queue[Any] = queue.Queue(maxsize=size)
+        stopped = threading.Event()
+        end = object()
+
+        def put(item: object) -> bool:
+            while not stopped.is_set():  # the consumer may leave without emptying the queue
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce() -> None:
+            try:
+                for array in chunks:
+                    if not put(array):
+                        return
+            except BaseException as error:  # raised again in the consumer thread
+                put(_Failure(error))
+            else:
+                put(end)
+
+        thread = threading.Thread(target=produce, name="mypackage-stream", daemon=True)
+        thread.start()
+        try:
+            while (item := chunk_queue.get()) is not end:
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stopped.set()
+            thread.join(timeout=BUFFER_JOIN_TIMEOUT)  # do not hang on a blocked source
+
+    return Stage(f"buffer({size})", run_in_background)
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+# Sinks
+
+
+def to_array() -> Sink:
+    """Gather all the vectors in a single (N, 2) array."""
+
+    def concatenate(chunks: Chunks) -> NDArray[np.float64]:
+        arrays = list(chunks)
+        return np.concatenate(arrays) if arrays else np.empty((0, 2), dtype=get_dtype())
+
+    return Sink("to_array()", concatenate)
+
+
+def to_stream(stream: BinaryIO, dtype: DTypeLike = _DTYPE) -> Sink:
+    """Write the coordinates (as little-endian float64 by default, see from_stream) and
+    return the number of vectors written.
+    """
+    dtype = np.dtype(dtype)
+
+    def write(chunks: Chunks) -> int:
+        count = 0
+        for array in chunks:
+            stream.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+            count += len(array)
+        return count
+
+    return Sink("to_stream()", write)
+
+
+def reduce(function: Callable[[T, NDArray[np.float64]], T], initial: T) -> Sink:
+    """Combine the chunks one by one, e.g. `reduce(lambda count, chunk: count + len(chunk), 0)`.
+
+    Args:
+        function (Callable[[T, NDArray], T]): receives the result so far and a chunk, and
+            returns the new result.
+        initial (T): result for an empty stream.
+    """
+
+    def fold(chunks: Chunks) -> T:
+        result = initial
+        for array in chunks:
+            result = function(result, array)
+        return result
+
+    return Sink(f"reduce({getattr(function, '__name__', 'function')})", fold)
+
+
+def for_each(function: Callable[[NDArray[np.float64]], Any]) -> Sink:
+    """Call a function with every chunk (e.g. to send it somewhere)."""
+
+    def call(chunks: Chunks) -> None:
+        for array in chunks:
+            function(array)
+
+    return Sink(f"for_each({getattr(function, '__name__', 'function')})", call)
+
+
+# Pipeline
+
+
+class Pipeline:
+    """Source followed by a chain of stages.
+
+    Args:
+        source (Iterable[NDArray]): iterable of (N, 2) chunks, e.g. from_file(path).
+        stages (Stage): the stages, applied in order.
+
+    Attributes:
+        stats (list[StageStats]): statistics of the source, the stages and the sink of
+            the last run (or of the current one, while it runs).
+    """
+
+    def __init__(self, source: Iterable[NDArray[np.float64]], *stages: Stage) -> None:
+        self.source = source
+        self.stages = stages
+        self.stats: list[StageStats] = []
+        self._inclusive: list[StageStats] = []
+
+    def __iter__(self) -> Chunks:
+        """Yield the chunks of the last stage (the statistics are updated as we go)."""
+        inclusive = [StageStats("source")]
+        chunks = _measure(iter(self.source), inclusive[0])
+        for stage in self.stages:
+            inclusive.append(StageStats(stage.name))
+            chunks = _measure(stage.function(chunks), inclusive[-1])
+        self._inclusive = inclusive
+        self.stats = [StageStats(stats.name) for stats in inclusive]
+        try:
+            for array in chunks:
+                self._update_stats()
+                yield array
+        finally:
+            self._update_stats()
+
+    def _update_stats(self) -> None:
+        """Compute the time of each stage alone from the time it took to yield its
+        chunks, which includes the time spent pulling chunks from the previous stages.
+        """
+        previous_seconds = 0.0
+        for stats, inclusive in zip(self.stats, self._inclusive):
+            stats.chunks, stats.vectors = inclusive.chunks, inclusive.vectors
+            stats.seconds = max(inclusive.seconds - previous_seconds, 0.0)
+            previous_seconds = inclusive.seconds
+
+    def run(self, sink: Sink | None = None) -> Any:
+        """Run the pipeline until the source is exhausted.
+
+        Args:
+            sink (Sink, optional): consumer of the chunks, whose result is returned.
+                Defaults to None, which gathers all the vectors with to_array().
+
+        Returns:
+            Any: The result of the sink.
+        """
+        sink = to_array() if sink is None else sink
+        start_time = time.perf_counter()
+        result = sink.function(iter(self))
+        seconds = time.perf_counter() - start_time
+        last = self.stats[-1]
+        pipeline_seconds = sum(stats.seconds for stats in self.stats)
+        self.stats.append(
+            StageStats(sink.name, last.chunks, last.vectors, max(seconds - pipeline_seconds, 0.0))
+        )
+        return result
+
+    def report(self) -> str:
+        """Table with the statistics of every stage."""
+        header = f"{'stage':<28} {'chunks':>8} {'vectors':>11} {'seconds':>8} {'M vectors/s':>12}"
+        return "\n".join([header, *(str(stats) for stats in self.stats)])
+
+
+def _measure(chunks: Chunks, stats: StageStats) -> Chunks:
+    """Yield the same chunks, adding up how long each one took to arrive."""
+    while True:
+        start_time = time.perf_counter()
+        try:
+            array = next(chunks)
+        except StopIteration:
+            stats.seconds += time.perf_counter() - start_time
+            return
+        stats.seconds += time.perf_counter() - start_time
+        stats.chunks += 1
+        stats.vectors += len(array)
+        yield array
@@ -1,5 +1,56 @@
 """To import from the vector.py module we can also type
 from mylibrary.vector.vector import Vector2D, NormError
+
+Note:
+    VectorArray, VectorN, VectorIndex and the reductions are imported lazily (see
+    mypackage/__init__.py), so that using the scalar Vector class does not import NumPy.
 """
 
+from __future__ import annotations
+
+from importlib import import_module
+
 from .vector import Vector, NormError
+from .frozen_vector import FrozenVector, frozen_vector
+
+
+TYPE_CHECKING = False  # same as typing.TYPE_CHECKING, without importing typing (slow)
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .reductions import Accumulator, argmax_norm, energy, max_norm, mean, min_norm
+    from .reductions import vector_sum, weighted_sum
+    from .vector_array import VectorArray
+    from .vector_index import VectorIndex, deduplicate
+    from .vector_n import VectorN
+
+
+_REDUCTIONS = (
+    "Accumulator",
+    "argmax_norm",
+    "energy",
+    "max_norm",
+    "mean",
+    "min_norm",
+    "vector_sum",
+    "weighted_sum",
+)
+_LAZY_IMPORTS = {  # attribute: module of the package that defines it
+    "VectorArray": "vector_array",
+    "VectorN": "vector_n",
+    "VectorIndex": "vector_index",
+    "deduplicate": "vector_index",
+    **dict.fromkeys(_REDUCTIONS, "reductions"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import an object the first time it is accessed, and cache it in the module
+    globals so that this function is never called again for it (as in mypackage).
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{_LAZY_IMPORTS[name]}"), name)
+    globals()[name] = value
+    return value
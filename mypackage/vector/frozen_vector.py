@@ -0,0 +1,177 @@
+"""This module contains FrozenVector, an immutable and hashable Vector, and
+`frozen_vector`, a factory that shares the instances of small integer vectors.
+
+Vector instances can change (`vector.x = 3`) and compare with a tolerance, so they
+cannot be dict keys or set members: a hash must never change, and equal objects must
+have equal hashes, which no tolerance allows (1e-10 apart is equal, 2e-10 apart is
+equal, but not transitively). FrozenVector fixes both: its coordinates cannot be set,
+and two frozen vectors are equal when their coordinates round to the same multiple of
+QUANTUM, so the hash of the rounded coordinates agrees with the equality.
+
+Like CPython does with the integers from -5 to 256, `frozen_vector` returns the same
+instance every time for vectors with integer coordinates between -INTERN_LIMIT and
+INTERN_LIMIT, which are very common (e.g. the vectors of our benchmarks), so creating
+them allocates nothing.
+
+Note:
+    Unlike the tolerance of Vector.__eq__, QUANTUM does not follow the precision (see
+    mypackage.backend.precision): the hash of a vector must never change, even if the
+    precision does while it is in a dict. Frozen vectors always compare with the
+    float64 resolution, so round coordinates computed in float32 before freezing them
+    if they must match.
+
+Attributes:
+    QUANTUM (float): resolution of the equality (and hash) of frozen vectors.
+    INTERN_LIMIT (int): largest absolute value of the coordinates of interned vectors.
+
+Examples:
+    Frozen vectors can be dict keys, so the results of expensive functions of a
+    vector can be memoized:
+
+    >>> @functools.cache
+    ... def slow_function(vector: FrozenVector) -> float: ...
+    >>> slow_function(frozen_vector(3, 4))
+
+    Small integer vectors are shared:
+
+    >>> frozen_vector(3, 4) is frozen_vector(3, 4)
+    True
+    >>> {frozen_vector(3, 4), FrozenVector(3.0, 4.0)}
+    {FrozenVector(3, 4)}
+
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from numbers import Integral
+
+from .vector import _MAX_NORM_SQUARED, Vector, _norm_violation
+
+
+QUANTUM: float = 1e-9
+INTERN_LIMIT: int = 32  # interned vectors have norms below MAX_NORM
+
+# FrozenVector.__setattr__ always raises, so we set the slots through their descriptors
+_set_x, _set_y = Vector.x.__set__, Vector.y.__set__  # type: ignore[attr-defined]
+_set_key = None  # the descriptor of FrozenVector._key, set after the class is created
+_interned: dict[tuple[int, int], FrozenVector] = {}
+
+
+def _quantize(value: float) -> float:
+    """Round the value to an integer number of QUANTUM (infinities and NaN stay as
+    they are, since they cannot be rounded).
+    """
+    try:
+        return round(value / QUANTUM)
+    except (OverflowError, ValueError):
+        return value
+
+
+class FrozenVector(Vector):
+    """Immutable two dimensional vector that can be used as a dict key or set member.
+
+    Note:
+        Arithmetic works as with any Vector, but returns plain (mutable) Vectors.
+        Comparing a frozen vector with a plain Vector uses the tolerance of
+        Vector.__eq__.
+
+    Args:
+        x (float): first component of the vector.
+        y (float): second component of the vector.
+
+    Attributes:
+        x (float): first component of the vector (read only).
+        y (float): second component of the vector (read only).
+
+    Raises:
+        NormError: the norm of the vector is greater than MAX_NORM (only if the
+            validation mode is EAGER).
+    """
+
+    __slots__ = ("_key",)
+    _key: tuple[float, float] | None
+
+    def __init__(self, x: float, y: float) -> None:
+        _set_x(self, x)
+        _set_y(self, y)
+        _set_key(self, None)
+
+        if x * x + y * y > _MAX_NORM_SQUARED:
+            _norm_violation(math.hypot(x, y))
+
+    @property
+    def key(self) -> tuple[float, float]:
+        """tuple[float, float]: the coordinates as integer multiples of QUANTUM, which
+        decide the equality and the hash. Computed the first time it is needed, since
+        most vectors are never hashed.
+        """
+        key = self._key
+        if key is None:
+            key = (_quantize(self.x), _quantize(self.y))
+            _set_key(self, key)
+        return key
+
+    @classmethod
+    def from_vector(cls, vector: Vector) -> FrozenVector:
+        """Create a frozen copy of a vector (interned if possible, see frozen_vector)."""
+        return vector if isinstance(vector, FrozenVector) else frozen_vector(vector.x, vector.y)
+
+    def to_vector(self) -> Vector:
+        """Create a mutable copy of the vector."""
+        return Vector(self.x, self.y)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"FrozenVector is immutable: cannot set {name!r}.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"FrozenVector is immutable: cannot delete {name!r}.")
+
+    def __reduce__(self) -> tuple[object, tuple[float, float]]:
+        """Pickle (and copy) the vector by its coordinates, since they cannot be set."""
+        return frozen_vector, (self.x, self.y)
+
+    def __repr__(self) -> str:
+        return f"FrozenVector({self.x}, {self.y})"
+
+    def __eq__(self, other_vector: object) -> bool:
+        """Check if the coordinates of two frozen vectors round to the same multiples of
+        QUANTUM (or, for a plain Vector, if they are equal up to its tolerance).
+        """
+        if isinstance(other_vector, FrozenVector):
+            return (self._key or self.key) == (other_vector._key or other_vector.key)
+        return super().__eq__(other_vector)
+
+    def __hash__(self) -> int:
+        return hash(self._key or self.key)  # skip the property once the key is computed
+
+
+_set_key = FrozenVector._key.__set__  # type: ignore[attr-defined]
+
+
+def frozen_vector(x: float, y: float) -> FrozenVector:
+    """Return a FrozenVector, which is shared if both coordinates are integers between
+    -INTERN_LIMIT and INTERN_LIMIT.
+
+    Note:
+        Sharing is safe because frozen vectors cannot change. The interned instances
+        are created the first time they are asked for. Other integer types, like the
+        NumPy integers of `rng.integers`, are converted to Python ints first, so they
+        share the same instances.
+    """
+    if type(x) is not int and isinstance(x, Integral) and not isinstance(x, bool):
+        x = operator.index(x)
+    if type(y) is not int and isinstance(y, Integral) and not isinstance(y, bool):
+        y = operator.index(y)
+    if (
+        type(x) is int  # not bools or floats, whose repr would change
+        and type(y) is int
+        and -INTERN_LIMIT <= x <= INTERN_LIMIT
+        and -INTERN_LIMIT <= y <= INTERN_LIMIT
+    ):
+        vector = _interned.get((x, y))
+        if vector is None:
+            vector = _interned.setdefault((x, y), FrozenVector(x, y))  # atomic with threads
+        return vector
+    return FrozenVector(x, y)
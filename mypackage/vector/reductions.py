@@ -0,0 +1,291 @@
+"""This module contains the Accumulator class and functions that reduce many vectors to
+a single result (sum, mean, norms...) in one pass.
+
+`sum(vectors, Vector(0, 0))` creates a new Vector for every partial sum, and each one
+checks its norm: N objects and N checks for a single result. Worse, a partial sum may
+be longer than MAX_NORM, raising a NormError, even if the final sum is fine (e.g. the
+mean of vectors that point in opposite directions). The Accumulator keeps the running
+sum in two floats instead, and only the final result is a (validated) Vector.
+
+The reductions accept a VectorArray, an (N, 2) array or any iterable of Vectors, and
+also iterables of chunks (arrays or VectorArrays) like the pipelines of mypackage.stream.
+They walk the vectors one chunk at a time, so they run at NumPy speed and use constant
+memory, whatever the number of vectors.
+
+Examples:
+    The mean of vectors whose partial sums are too long:
+
+    >>> vectors = [Vector(60, 0), Vector(60, 0), Vector(-60, 0)]
+    >>> sum(vectors, Vector(0, 0))
+    NormError: Norm = 120, but it cannot be greater than 100.
+    >>> mean(vectors)
+    Vector(20.0, 0.0)
+
+    An exponentially weighted mean of a stream of vectors:
+
+    >>> average = Accumulator()
+    >>> for vector in vectors:
+    ...     average *= 0.9
+    ...     average += vector
+    >>> average.mean
+    Vector(15.719557195571959, 0.0)
+
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
+from operator import attrgetter
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from mypackage.backend import get_backend
+
+from .vector import Vector
+from .vector_array import VectorArray
+
+
+CHUNK_SIZE: int = 65_536  # vectors reduced at once, which bounds the memory used
+_get_coordinates = attrgetter("x", "y")
+
+Vectors = VectorArray | NDArray[np.float64] | Iterable[Vector | VectorArray | NDArray[np.float64]]
+
+
+class Accumulator:
+    """Running (weighted) sum of vectors that does not create intermediate Vectors.
+
+    Note:
+        `accumulator += vector` adds a Vector, VectorArray or (N, 2) array with weight
+        1 per vector, and `accumulator *= factor` scales both the sum and the total
+        weight, so it does not change the mean: repeating both gives an exponentially
+        weighted mean. Nothing is validated until the sum or the mean is read.
+
+    Args:
+        x (float, optional): initial first component of the sum. Defaults to 0.
+        y (float, optional): initial second component of the sum. Defaults to 0.
+        weight (float, optional): initial total weight. Defaults to 0.
+
+    Attributes:
+        x (float): first component of the sum.
+        y (float): second component of the sum.
+        weight (float): sum of the weights of the vectors added (their number, if all
+            the weights are 1).
+    """
+
+    __slots__ = ("x", "y", "weight")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, weight: float = 0.0) -> None:
+        self.x = x
+        self.y = y
+        self.weight = weight
+
+    def add(self, vectors: Vector | VectorArray | ArrayLike, weights: ArrayLike = 1.0) -> None:
+        """Add a vector, or a batch of vectors, multiplied by its weight(s).
+
+        Args:
+            vectors (Vector | VectorArray | ArrayLike): a Vector or (N, 2) coordinates.
+            weights (ArrayLike, optional): a weight for every vector, or the same weight
+                for all of them. Defaults to 1.
+        """
+        if isinstance(vectors, Vector):
+            weight = float(weights)  # type: ignore[arg-type]
+            self.x += weight * vectors.x
+            self.y += weight * vectors.y
+            self.weight += weight
+            return
+        array = _as_array(vectors)
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 0:
+            x, y = array.sum(axis=0, dtype=np.float64).tolist()  # float64 sums of float32
+            self.x += float(weights) * x
+            self.y += float(weights) * y
+            self.weight += float(weights) * len(array)
+        else:
+            if weights.shape != (len(array),):
+                raise ValueError(f"Expected {len(array)} weights, but got {weights.shape}.")
+            x, y = (weights @ array).tolist()
+            self.x += x
+            self.y += y
+            self.weight += float(weights.sum())
+
+    def __iadd__(self, vectors: Vector | VectorArray | NDArray[np.float64]) -> Accumulator:
+        if not isinstance(vectors, (Vector, VectorArray, np.ndarray)):
+            return NotImplemented
+        if type(vectors) is Vector:  # fast path for loops over single vectors
+            self.x += vectors.x
+            self.y += vectors.y
+            self.weight += 1.0
+        else:
+            self.add(vectors)
+        return self
+
+    def __imul__(self, factor: float) -> Accumulator:
+        if not isinstance(factor, (int, float)):
+            return NotImplemented
+        self.x *= factor
+        self.y *= factor
+        self.weight *= factor
+        return self
+
+    def __repr__(self) -> str:
+        return f"Accumulator({self.x}, {self.y}, weight={self.weight})"
+
+    @property
+    def sum(self) -> Vector:
+        """Vector: the (weighted) sum of the vectors.
+
+        Raises:
+            NormError: the sum is longer than MAX_NORM (only if the validation mode is EAGER).
+        """
+        return Vector(self.x, self.y)
+
+    @property
+    def mean(self) -> Vector:
+        """Vector: the (weighted) mean, or centroid, of the vectors.
+
+        Raises:
+            ValueError: The total weight is 0 (e.g. no vectors were added).
+            NormError: the mean is longer than MAX_NORM (only if the validation mode is EAGER).
+        """
+        if self.weight == 0:
+            raise ValueError("The mean of no vectors is undefined.")
+        return Vector(self.x / self.weight, self.y / self.weight)
+
+
+def vector_sum(vectors: Vectors) -> Vector:
+    """Sum of the vectors (only the result is checked against MAX_NORM)."""
+    accumulator = Accumulator()
+    for array in _chunks(vectors):
+        accumulator.add(array)
+    return accumulator.sum
+
+
+def mean(vectors: Vectors) -> Vector:
+    """Mean (centroid) of the vectors.
+
+    Raises:
+        ValueError: There are no vectors.
+    """
+    accumulator = Accumulator()
+    for array in _chunks(vectors):
+        accumulator.add(array)
+    return accumulator.mean
+
+
+def weighted_sum(vectors: Vectors, weights: Iterable[float] | ArrayLike) -> Vector:
+    """Sum of the vectors multiplied by their weights, e.g. the total force or momentum.
+
+    Raises:
+        ValueError: There are fewer weights than vectors.
+    """
+    accumulator = Accumulator()
+    if isinstance(weights, np.ndarray):
+        weights = weights.ravel()
+        start = 0
+        for array in _chunks(vectors):
+            accumulator.add(array, weights[start : start + len(array)])
+            start += len(array)
+    else:
+        weight_iterator = iter(weights)
+        for array in _chunks(vectors):
+            chunk_weights = np.fromiter(islice(weight_iterator, len(array)), dtype=np.float64)
+            accumulator.add(array, chunk_weights)
+    return accumulator.sum
+
+
+def energy(vectors: Vectors) -> float:
+    """Sum of the squared norms of the vectors."""
+    return math.fsum(
+        float(np.einsum("ij,ij->", array, array, dtype=np.float64)) for array in _chunks(vectors)
+    )
+
+
+def max_norm(vectors: Vectors) -> float:
+    """Largest norm of the vectors.
+
+    Raises:
+        ValueError: There are no vectors.
+    """
+    return _extreme_norm(vectors, longest=True)[1]
+
+
+def min_norm(vectors: Vectors) -> float:
+    """Smallest norm of the vectors.
+
+    Raises:
+        ValueError: There are no vectors.
+    """
+    return _extreme_norm(vectors, longest=False)[1]
+
+
+def argmax_norm(vectors: Vectors) -> int:
+    """Position of the (first) longest vector.
+
+    Raises:
+        ValueError: There are no vectors.
+    """
+    return _extreme_norm(vectors, longest=True)[0]
+
+
+def _extreme_norm(vectors: Vectors, longest: bool) -> tuple[int, float]:
+    """Position and norm of the first longest (or shortest) vector."""
+    best_position, best_norm = -1, math.nan
+    start = 0
+    kernels = get_backend()
+    for array in _chunks(vectors):
+        if len(array):
+            norms = kernels.norm(array, np.empty(len(array), dtype=array.dtype))
+            position = int(norms.argmax() if longest else norms.argmin())
+            norm = float(norms[position])
+            if best_position < 0 or (norm > best_norm if longest else norm < best_norm):
+                best_position, best_norm = start + position, norm
+        start += len(array)
+    if best_position < 0:
+        raise ValueError("The vectors are empty.")
+    return best_position, best_norm
+
+
+def _as_array(vectors: VectorArray | ArrayLike) -> NDArray[np.float64]:
+    """(N, 2) float array of a batch, without copying it if possible."""
+    if isinstance(vectors, VectorArray):
+        return vectors.array
+    array = np.asarray(vectors)
+    if array.dtype not in (np.float64, np.float32):
+        array = array.astype(np.float64)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError(f"The vectors must have shape (N, 2), but got {array.shape}.")
+    return array
+
+
+def _chunks(vectors: Vectors) -> Iterator[NDArray[np.float64]]:
+    """Yield the vectors as (at most CHUNK_SIZE, 2) arrays: views of a batch, the chunks
+    of an iterable of chunks, or the coordinates of consecutive Vectors.
+    """
+    if isinstance(vectors, (VectorArray, np.ndarray)):
+        array = _as_array(vectors)
+        for start in range(0, len(array), CHUNK_SIZE):
+            yield array[start : start + CHUNK_SIZE]
+        return
+    pending: list[Vector] = []
+    for item in vectors:
+        if isinstance(item, Vector):
+            pending.append(item)
+            if len(pending) == CHUNK_SIZE:
+                yield _coordinates(pending)
+                pending = []
+        else:
+            if pending:
+                yield _coordinates(pending)
+                pending = []
+            yield from _chunks(_as_array(item))
+    if pending:
+        yield _coordinates(pending)
+
+
+def _coordinates(vectors: list[Vector]) -> NDArray[np.float64]:
+    """(N, 2) array with the coordinates of a list of Vectors."""
+    coordinates = chain.from_iterable(map(_get_coordinates, vectors))
+    return np.fromiter(coordinates, dtype=np.float64, count=2 * len(vectors)).reshape(-1, 2)
@@ -2,6 +2,17 @@
 
 Attributes:
     MAX_NORM (float): Maximum norm allowed for a Vector instance.
+    EAGER (str): Validation mode that raises a NormError as soon as a vector is too big.
+    DEFERRED (str): Validation mode that records norm violations and raises a single
+        NormError when the deferred block ends.
+    OFF (str): Validation mode that skips the MAX_NORM check altogether.
+
+Examples:
+    Hot loops that are known to stay within MAX_NORM can switch validation off:
+
+    >>> with validation(OFF):
+    ...     vector = Vector(300, 0)  # no NormError raised
+
 
 Note:
     Imports should follow always the same order:
@@ -17,12 +28,30 @@ from __future__ import annotations  # We import this module to use the Vector ty
 import math
 import warnings
 
-import numpy as np
+
+TYPE_CHECKING = False  # same as typing.TYPE_CHECKING, without importing typing (slow)
+if TYPE_CHECKING:  # only needed for the type hints, which are not evaluated at runtime
+    from collections.abc import Sequence
+    from types import TracebackType
 
 
 # Module level variables should be on top
 # If a constant, its name shoud be UPPER_CASE_WITH_UNDERSCORES
 MAX_NORM: float = 100
+_MAX_NORM_SQUARED: float = MAX_NORM**2  # comparing squares saves a square root per vector
+
+EAGER: str = "eager"
+DEFERRED: str = "deferred"
+OFF: str = "off"
+_VALIDATION_MODES = (EAGER, DEFERRED, OFF)
+
+# Private module state (not constants, hence the lower case)
+_validation: str = EAGER
+_deferred_norm: float | None = None  # largest norm that broke MAX_NORM while deferred
+_new_object = object.__new__  # local alias to skip an attribute lookup in the hot path
+# Tolerances of Vector.__eq__, which follow the precision (see mypackage.backend.precision)
+_absolute_tolerance: float = 1e-10
+_relative_tolerance: float = 1e-9
 
 
 class NormError(ValueError):
@@ -32,17 +61,145 @@ class NormError(ValueError):
         Custom exception classes are very useful for exception handling.
 
     Args:
-        norm (float): The norm of the vector.
+        norm (float): The norm of the vector. When many vectors are validated at once,
+            this is the largest of the offending norms.
+        indices (Sequence[int], optional): Positions of the offending vectors inside
+            a batch of vectors. Defaults to None (a single vector was validated).
 
     Attributes:
+        norm (float): The (largest) norm that exceeded MAX_NORM.
+        indices (list[int] | None): Positions of the offending vectors, if any.
         message (str): The message to display when the exception is raised.
     """
 
-    def __init__(self, norm: float) -> None:
-        message = f"Norm = {norm}, but it cannot be greater than {MAX_NORM}."
+    def __init__(self, norm: float, indices: Sequence[int] | None = None) -> None:
+        self.norm = norm
+        self.indices = None if indices is None else [int(index) for index in indices]
+        if self.indices is None:
+            message = f"Norm = {norm}, but it cannot be greater than {MAX_NORM}."
+        else:
+            # Only show the first few indices: a batch may contain millions of vectors
+            shown = ", ".join(str(index) for index in self.indices[:10])
+            if len(self.indices) > 10:
+                shown += ", ..."
+            message = (
+                f"{len(self.indices)} vectors at indices [{shown}] have a norm greater than "
+                f"{MAX_NORM} (largest norm = {norm})."
+            )
         super().__init__(message)
 
 
+def get_validation() -> str:
+    """Return the current validation mode (EAGER, DEFERRED or OFF)."""
+    return _validation
+
+
+def set_validation(mode: str) -> None:
+    """Change how vectors are checked against MAX_NORM when they are created.
+
+    Note:
+        Leaving the DEFERRED mode raises the norm violations recorded so far.
+
+    Args:
+        mode (str): EAGER (default), DEFERRED or OFF.
+
+    Raises:
+        ValueError: Unknown validation mode.
+        NormError: Norm violations were recorded while validation was deferred.
+    """
+    global _validation  # we need to modify the module variable
+    if mode not in _VALIDATION_MODES:
+        raise ValueError(f"Validation mode must be one of {_VALIDATION_MODES}, not {mode!r}.")
+    leaving_deferred = _validation == DEFERRED and mode != DEFERRED
+    _validation = mode
+    if leaving_deferred:
+        _raise_deferred()
+
+
+def _raise_deferred() -> None:
+    """Raise the largest norm violation recorded while validation was deferred, if any."""
+    global _deferred_norm
+    deferred_norm, _deferred_norm = _deferred_norm, None
+    if deferred_norm is not None:
+        raise NormError(deferred_norm)
+
+
+def validation(mode: str) -> _ValidationContext:
+    """Context manager to use a validation mode only inside a block of code.
+
+    Args:
+        mode (str): EAGER, DEFERRED or OFF.
+
+    Raises:
+        ValueError: Unknown validation mode (when entering the block).
+        NormError: When leaving a DEFERRED block in which some vector was too big,
+            unless another exception is leaving the block. Blocks nested inside a
+            DEFERRED block leave its violations for the end of the outer block.
+
+    Examples:
+        >>> with validation(DEFERRED):
+        ...     too_big = Vector(300, 0)  # the error is raised when the block ends
+        Traceback (most recent call last):
+        ...
+        mypackage.vector.vector.NormError: Norm = 300.0, but it cannot be greater than 100.
+
+    """
+    return _ValidationContext(mode)
+
+
+class _ValidationContext:
+    """Context manager returned by `validation`.
+
+    Note:
+        We write the __enter__ and __exit__ methods ourselves instead of using
+        `contextlib.contextmanager` because importing contextlib would slow down
+        `import mypackage`, and this module must stay light.
+    """
+
+    __slots__ = ("mode", "previous_mode")
+
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self.previous_mode = _validation
+
+    def __enter__(self) -> None:
+        global _validation
+        if self.mode not in _VALIDATION_MODES:
+            raise ValueError(
+                f"Validation mode must be one of {_VALIDATION_MODES}, not {self.mode!r}."
+            )
+        # Unlike set_validation, entering a block inside a DEFERRED block (e.g. to turn
+        # validation OFF for a moment) keeps the violations for the end of that block
+        self.previous_mode = _validation
+        _validation = self.mode
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        global _validation, _deferred_norm
+        _validation = self.previous_mode
+        if self.mode != DEFERRED or self.previous_mode == DEFERRED:
+            return  # the violations belong to an enclosing DEFERRED block, if any
+        if exc_type is not None:
+            _deferred_norm = None  # do not hide the exception that is propagating
+        else:
+            _raise_deferred()
+
+
+def _norm_violation(norm: float, indices: Sequence[int] | None = None) -> None:
+    """Handle a vector (or batch of vectors) whose norm is greater than MAX_NORM
+    according to the current validation mode.
+    """
+    global _deferred_norm
+    if _validation == EAGER:
+        raise NormError(norm, indices)
+    if _validation == DEFERRED and (_deferred_norm is None or norm > _deferred_norm):
+        _deferred_norm = norm
+
+
 class Vector:
     """Two dimensional vector.
 
@@ -50,6 +207,9 @@ class Vector:
         Remember that class docstrings in Google format should contain the arguments
         of the __init__ method and the attributes of the class, but not the methods.
 
+        Declaring `__slots__` stores the attributes in fixed slots instead of a
+        `__dict__`, which makes instances smaller and faster to create.
+
     Args:
         x (float): first component of the vector.
         y (float): second component of the vector.
@@ -59,15 +219,18 @@ class Vector:
         y (float): second component of the vector.
 
     Raises:
-        NormError: the norm of the vector is greater than MAX_NORM.
+        NormError: the norm of the vector is greater than MAX_NORM (only if the
+            validation mode is EAGER).
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float) -> None:
         self.x: float = x
         self.y: float = y
 
-        if self.norm > MAX_NORM:
-            raise NormError(self.norm)
+        if x * x + y * y > _MAX_NORM_SQUARED:
+            _norm_violation(math.hypot(x, y))
 
     def __repr__(self) -> str:
         """Return the vector representation.
@@ -127,6 +290,8 @@ class Vector:
             raise TypeError("You must pass in a Vector instance!")
         x = self.x + other_vector.x
         y = self.y + other_vector.y
+        if _validation == OFF:
+            return _trusted_vector(x, y)
         return Vector(x, y)
 
     def __mul__(self, other: Vector | float) -> Vector | float:
@@ -153,14 +318,20 @@ class Vector:
         if isinstance(other, Vector):
             return self.x * other.x + self.y * other.y
 
-        if not isinstance(other, int | float):
+        if not isinstance(other, (int, float)):  # tuples are faster than int | float here
             raise TypeError("You must pass in an int/float!")
 
+        if _validation == OFF or -1 <= other <= 1:  # shrinking can't break MAX_NORM
+            return _trusted_vector(self.x * other, self.y * other)
         return Vector(self.x * other, self.y * other)
 
     def __eq__(self, other_vector: object) -> bool:
         """Check if the vectors have the same values up to some tolerance.
 
+        Note:
+            The tolerance grows with the rounding errors of the precision of the batches
+            (see mypackage.backend.precision), since vectors often come out of them.
+
         Args:
             other_vector: Other vector (right hand side).
 
@@ -177,8 +348,9 @@ class Vector:
         if not isinstance(other_vector, Vector):
             return False
         # math.isclose returns true if the numbers are equal up to a small error
-        equal_x: bool = math.isclose(self.x, other_vector.x, abs_tol=1e-10)
-        equal_y: bool = math.isclose(self.y, other_vector.y, abs_tol=1e-10)
+        rel_tol, abs_tol = _relative_tolerance, _absolute_tolerance
+        equal_x: bool = math.isclose(self.x, other_vector.x, rel_tol=rel_tol, abs_tol=abs_tol)
+        equal_y: bool = math.isclose(self.y, other_vector.y, rel_tol=rel_tol, abs_tol=abs_tol)
         return equal_x and equal_y
 
     @property
@@ -189,6 +361,9 @@ class Vector:
             Since the method doesn't accept any input, we can treat it as an attribute.
             To do that we just have to add the @property decorator on top of the method.
 
+            We use `math.hypot` instead of `np.sqrt`: NumPy functions are very fast for
+            arrays, but calling them on plain Python numbers has a big overhead.
+
         Returns:
             float: the euclidean norm of the vector.
 
@@ -198,7 +373,7 @@ class Vector:
             1.0
 
         """
-        return np.sqrt(self.x**2 + self.y**2)
+        return math.hypot(self.x, self.y)
 
     def projection(self, subspace: Vector | None = None) -> Vector:
         """By default projects the vector onto its first component. If a vector spanning
@@ -208,6 +383,10 @@ class Vector:
             subspace (Vector, optional): vector that spans the subspace onto which to project
                 the vector. Defaults to None.
 
+        Note:
+            The projection of a vector is never longer than the vector itself, so the
+            result can skip the MAX_NORM check.
+
         Returns:
             Vector: The projected vector.
 
@@ -220,8 +399,21 @@ class Vector:
             warnings.warn(
                 "No subspace given: the vector is projected onto the first component!", stacklevel=2
             )
-            return Vector(self.x, 0)
+            return _trusted_vector(self.x, 0)
         else:
             # Note that self is the instance of the Vector class
-            projection_coef: float = (subspace * self) / subspace.norm**2
-            return subspace * projection_coef
+            projection_coef: float = (subspace * self) / (subspace * subspace)
+            return _trusted_vector(subspace.x * projection_coef, subspace.y * projection_coef)
+
+
+def _trusted_vector(x: float, y: float) -> Vector:
+    """Create a Vector without calling __init__, that is, without the MAX_NORM check.
+
+    Note:
+        Only for internal use, when the result is provably within MAX_NORM
+        (e.g. a rotation or a projection) or validation is turned OFF.
+    """
+    vector = _new_object(Vector)
+    vector.x = x
+    vector.y = y
+    return vector
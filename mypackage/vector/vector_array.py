@@ -0,0 +1,356 @@
+"""This module contains the VectorArray class, a batch of two dimensional vectors.
+
+A VectorArray stores N vectors in a single contiguous NumPy array of shape (N, 2),
+so that arithmetic and norm validation are carried out by NumPy over the whole batch
+instead of one Python object (and one norm check) per vector. The loops themselves
+are run by the kernels of the selected backend (see mypackage.backend).
+
+Examples:
+    We can create a batch of vectors from a list of coordinates and operate with it
+    as we would with a single Vector:
+
+    >>> vectors = VectorArray([[1, 0], [0, 1]])
+    >>> vectors + Vector(1, 1)
+    VectorArray([[2.0, 1.0], [1.0, 2.0]])
+
+    >>> vectors.norm
+    array([1., 1.])
+
+"""
+
+from __future__ import annotations
+
+import warnings
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+from mypackage.backend import get_backend, get_kernels
+from mypackage.backend.precision import get_tolerance, resolve_dtype
+
+from .vector import MAX_NORM, OFF, NormError, Vector, get_validation, _norm_violation
+
+
+class VectorArray:
+    """Batch of two dimensional vectors stored as an (N, 2) array.
+
+    Note:
+        The first column holds the x components and the second column the y components,
+        which can be accessed (without copying) through the `x` and `y` attributes.
+
+        The results of operations have the dtype of the left operand.
+
+    Args:
+        coordinates (ArrayLike): coordinates of the vectors, with shape (N, 2).
+        dtype (DTypeLike, optional): np.float64 or np.float32. Defaults to None, which
+            uses the current precision (see mypackage.backend.precision).
+
+    Attributes:
+        array (NDArray[np.float64]): C-contiguous array of shape (N, 2) with the vectors
+            (float64 or float32).
+
+    Raises:
+        ValueError: the coordinates do not have shape (N, 2).
+        NormError: the norm of any of the vectors is greater than MAX_NORM (only if
+            the validation mode is EAGER).
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, coordinates: ArrayLike, dtype: DTypeLike | None = None) -> None:
+        array = np.array(coordinates, dtype=resolve_dtype(dtype), order="C", ndmin=2)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError(f"Coordinates must have shape (N, 2), but got {array.shape}.")
+        self.array: NDArray[np.float64] = array
+        self._check_norms()
+
+    @classmethod
+    def _from_trusted(cls, array: NDArray[np.float64]) -> VectorArray:
+        """Wrap an (N, 2) float array without copying nor validating it.
+
+        Note:
+            Only for internal use, when the array is known to be well formed
+            (e.g. the result of an operation that was already validated).
+        """
+        vectors = object.__new__(cls)
+        vectors.array = array
+        return vectors
+
+    @classmethod
+    def from_vectors(
+        cls, vectors: Sequence[Vector], dtype: DTypeLike | None = None
+    ) -> VectorArray:
+        """Create a batch from a sequence of Vector instances.
+
+        Args:
+            vectors (Sequence[Vector]): the vectors to gather in the batch.
+            dtype (DTypeLike, optional): Defaults to None (the current precision).
+
+        Returns:
+            VectorArray: a batch with the same vectors.
+        """
+        array = np.empty((len(vectors), 2), dtype=resolve_dtype(dtype))
+        for i, vector in enumerate(vectors):
+            array[i, 0] = vector.x
+            array[i, 1] = vector.y
+        return cls(array, array.dtype)
+
+    @classmethod
+    def zeros(cls, size: int, dtype: DTypeLike | None = None) -> VectorArray:
+        """Create a batch of `size` null vectors (handy as a preallocated buffer)."""
+        return cls._from_trusted(np.zeros((size, 2), dtype=resolve_dtype(dtype)))
+
+    @property
+    def dtype(self) -> np.dtype:
+        """np.dtype: type of the coordinates, float64 or float32."""
+        return self.array.dtype
+
+    def astype(self, dtype: DTypeLike) -> VectorArray:
+        """Return a copy of the batch with another dtype (float64 or float32).
+
+        Raises:
+            NormError: Rounding to float32 made a vector longer than MAX_NORM (only if
+                the validation mode is EAGER).
+        """
+        return VectorArray(self.array, dtype)
+
+    @property
+    def x(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: view of the first components of the vectors."""
+        return self.array[:, 0]
+
+    @property
+    def y(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: view of the second components of the vectors."""
+        return self.array[:, 1]
+
+    def _norm_violations(self, workers: int | None = None) -> tuple[float, list[int]] | None:
+        """Return the largest offending norm and the indices of the vectors whose
+        norm is greater than MAX_NORM, or None if all of them are fine.
+
+        Note:
+            We only compute the actual norms of the offending vectors.
+        """
+        offending = get_kernels(workers).norm_violations(self.array, MAX_NORM)
+        if offending.size == 0:
+            return None
+        offending_vectors = self.array[offending]
+        largest_norm = float(np.hypot(offending_vectors[:, 0], offending_vectors[:, 1]).max())
+        return largest_norm, offending.tolist()
+
+    def _check_norms(self, workers: int | None = None) -> None:
+        """Validate the norms according to the current validation mode."""
+        if get_validation() == OFF:
+            return
+        violations = self._norm_violations(workers)
+        if violations is not None:
+            _norm_violation(*violations)
+
+    def validate(self, workers: int | None = None) -> None:
+        """Check all the norms at once against MAX_NORM, whatever the validation mode.
+
+        Args:
+            workers (int, optional): number of threads that check chunks of the batch in
+                parallel (see mypackage.parallel.thread_pool). Defaults to None, which
+                uses the current backend.
+
+        Raises:
+            NormError: listing the indices of every vector whose norm is too big.
+        """
+        violations = self._norm_violations(workers)
+        if violations is not None:
+            raise NormError(*violations)
+
+    def __len__(self) -> int:
+        return self.array.shape[0]
+
+    def __iter__(self) -> Iterator[Vector]:
+        for x, y in self.array.tolist():
+            yield Vector(x, y)
+
+    def __getitem__(self, index: int | slice) -> Vector | VectorArray:
+        """Return a single Vector (integer index) or a new batch (slice)."""
+        if isinstance(index, slice):
+            return VectorArray._from_trusted(self.array[index])
+        x, y = self.array[index].tolist()
+        return Vector(x, y)
+
+    def __repr__(self) -> str:
+        return f"VectorArray({self.array.tolist()})"
+
+    def __str__(self) -> str:
+        return str(self.array)
+
+    def _other_array(self, other: VectorArray | Vector) -> NDArray[np.float64]:
+        """Return the array to operate with: a single Vector becomes a (1, 2) array
+        that the kernels broadcast to every element of the batch.
+        """
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(f"Batches of different lengths: {len(self)} and {len(other)}.")
+            return other.array.astype(self.array.dtype, copy=False)
+        if isinstance(other, Vector):
+            return np.array([[other.x, other.y]], dtype=self.array.dtype)
+        raise TypeError("You must pass in a VectorArray or Vector instance!")
+
+    def __add__(self, other: VectorArray | Vector) -> VectorArray:
+        """Return the element-wise addition with another batch (or a single vector).
+
+        Args:
+            other: Other batch of the same length, or a Vector added to every element.
+
+        Raises:
+            TypeError: Not VectorArray/Vector passed in.
+            ValueError: Batches of different lengths.
+            NormError: Any of the resulting vectors is too big.
+
+        Returns:
+            The addition of both batches.
+
+        Examples:
+
+            >>> VectorArray([[1, 0], [2, 2]]) + VectorArray([[0, 1], [1, 1]])
+            VectorArray([[1.0, 1.0], [3.0, 3.0]])
+
+        """
+        other_array = self._other_array(other)
+        result = VectorArray._from_trusted(
+            get_backend().add(self.array, other_array, np.empty_like(self.array))
+        )
+        result._check_norms()
+        return result
+
+    def __mul__(self, other: VectorArray | Vector | float) -> VectorArray | NDArray[np.float64]:
+        """Return the dot products with other vectors or the scaled batch.
+
+        Note:
+            As with Vector, multiplying by a vector (or a batch of vectors) means taking
+            the dot product, while multiplying by a number scales every vector.
+
+        Args:
+            other: Other batch, a single Vector or a scalar value (right hand side).
+
+        Raises:
+            TypeError: Not VectorArray/Vector/int/float passed in.
+            NormError: Any of the scaled vectors is too big.
+
+        Returns:
+            An array with the N dot products or the scaled batch.
+
+        Examples:
+
+            >>> VectorArray([[1, 0], [1, 1]]) * Vector(2, 3)
+            array([2., 5.])
+
+            >>> VectorArray([[1, 0], [1, 1]]) * 2
+            VectorArray([[2.0, 0.0], [2.0, 2.0]])
+
+        """
+        if isinstance(other, VectorArray | Vector):
+            other_array = self._other_array(other)
+            dot_products: NDArray[np.float64] = get_backend().dot(
+                self.array, other_array, np.empty(len(self), dtype=self.array.dtype)
+            )
+            return dot_products
+
+        if not isinstance(other, int | float | np.number):
+            raise TypeError("You must pass in an int/float!")
+
+        result = VectorArray._from_trusted(
+            get_backend().scale(self.array, float(other), np.empty_like(self.array))
+        )
+        if abs(other) > 1:  # shrinking the vectors can never break MAX_NORM
+            result._check_norms()
+        return result
+
+    def __rmul__(self, other: float) -> VectorArray:
+        # Only numbers get here (2 * vectors): Vector.__mul__ raises a TypeError for
+        # batches instead of returning NotImplemented, so write `vectors * vector`
+        return self.__mul__(other)  # type: ignore[return-value]
+
+    def isclose(self, other: VectorArray | Vector) -> NDArray[np.bool_]:
+        """Element-wise comparison with the same tolerance as Vector.__eq__ (which
+        depends on the precision, see mypackage.backend.precision).
+
+        Args:
+            other: Other batch (or a single vector compared with every element).
+
+        Returns:
+            NDArray[np.bool_]: True where both vectors have the same values.
+        """
+        other_array = self._other_array(other)
+        # Same rule as math.isclose (which, unlike np.isclose, is symmetric)
+        absolute_tolerance, relative_tolerance = get_tolerance()
+        scale = np.maximum(abs(self.array), abs(other_array))
+        tolerance = np.maximum(relative_tolerance * scale, absolute_tolerance)
+        close: NDArray[np.bool_] = (abs(self.array - other_array) <= tolerance).all(axis=1)
+        return close
+
+    def __eq__(self, other: object) -> bool:
+        """Check if both batches have the same vectors up to some tolerance.
+
+        Args:
+            other: Other batch (right hand side).
+
+        Returns:
+            True, if both batches have the same length and values.
+            False, else.
+
+        Examples:
+
+            >>> VectorArray([[1, 0]]) == VectorArray([[1, 1e-12]])
+            True
+
+        """
+        if not isinstance(other, VectorArray) or len(self) != len(other):
+            return False
+        return bool(self.isclose(other).all())
+
+    __hash__ = None  # type: ignore[assignment]  # mutable container, like lists
+
+    @property
+    def norm(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: the Euclidean norms of the N vectors."""
+        norms: NDArray[np.float64] = get_backend().norm(
+            self.array, np.empty(len(self), dtype=self.array.dtype)
+        )
+        return norms
+
+    def projection(
+        self, subspace: VectorArray | Vector | None = None, workers: int | None = None
+    ) -> VectorArray:
+        """By default projects the vectors onto their first component. If a vector
+        (or a batch of vectors) spanning a subspace is given, then every vector is
+        projected along its subspace.
+
+        Note:
+            Projections never increase the norm, so no validation is needed.
+
+        Args:
+            subspace (VectorArray | Vector, optional): vector(s) that span the subspace onto
+                which to project the vectors. Defaults to None.
+            workers (int, optional): number of threads that project chunks of the batch
+                in parallel. Defaults to None, which uses the current backend.
+
+        Returns:
+            VectorArray: The projected vectors.
+
+        Examples:
+            >>> VectorArray([[1, 1], [2, 0]]).projection(Vector(0, 1))
+            VectorArray([[0.0, 1.0], [0.0, 0.0]])
+
+        """
+        if subspace is None:
+            warnings.warn(
+                "No subspace given: the vectors are projected onto the first component!",
+                stacklevel=2,
+            )
+            result = np.zeros_like(self.array)
+            result[:, 0] = self.array[:, 0]
+            return VectorArray._from_trusted(result)
+
+        subspace_array = self._other_array(subspace)
+        return VectorArray._from_trusted(
+            get_kernels(workers).project(self.array, subspace_array, np.empty_like(self.array))
+        )
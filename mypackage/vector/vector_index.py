@@ -0,0 +1,437 @@
+"""This module contains VectorIndex, a spatial index of two dimensional vectors, and
+`deduplicate`, which removes the repeated vectors of a large batch.
+
+Vector.__eq__ compares the coordinates up to a tolerance, so equal vectors can have
+different bits and a dict (or a set) cannot find them. Comparing every pair instead
+takes O(N^2) time: a million vectors mean half a trillion comparisons. Grid hashing
+solves it: we cut the plane in square cells at least as big as the tolerance, so two
+equal vectors are always in the same cell or in neighbouring ones, and finding the
+equals of a vector only needs to check the vectors of 9 cells.
+
+VectorIndex keeps the cells in a dict, which is best to insert and look up vectors one
+by one. `deduplicate` works on a whole (N, 2) array at once: it sorts the cell numbers
+with NumPy and only compares the vectors of neighbouring cells, which is much faster
+for tens of millions of vectors.
+
+Note:
+    Tolerant equality is not transitive: a may equal b and b equal c, but not a and c.
+    Deduplicating therefore keeps the first vector of every group and drops each later
+    vector equal to a vector already kept (like inserting them one by one in a set).
+
+The default tolerances are the ones of Vector.__eq__, which follow the precision (see
+mypackage.backend.precision): vectors computed in float32 are equal when they agree to
+about 5 significant digits.
+
+Attributes:
+    PAIR_BLOCK (int): pairs of vectors that `deduplicate` compares at once, which bounds
+        its memory when many distinct vectors fall in the same cell.
+
+Examples:
+    >>> index = VectorIndex()
+    >>> index.insert(Vector(1, 2)), index.insert(Vector(3, 4))
+    (0, 1)
+    >>> index.find_equal(Vector(1 + 1e-12, 2))
+    [0]
+    >>> index.within(Vector(0, 0), radius=3)
+    [0]
+
+    >>> deduplicate(np.array([[1.0, 2.0], [3.0, 4.0], [1.0 + 1e-12, 2.0]]))
+    array([0, 1])
+
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from . import vector as _vector_module
+from .vector import MAX_NORM, Vector
+
+
+PAIR_BLOCK: int = 1 << 20  # pairs of vectors compared at once by `deduplicate`
+_MAX_CELLS: int = 1 << 31  # cells per axis in `deduplicate`, so the cell numbers fit in int64
+
+
+class VectorIndex:
+    """Grid hash of two dimensional vectors for tolerant equality and radius lookups.
+
+    Note:
+        Two vectors are equal if every pair of coordinates a, b satisfies
+        `abs(a - b) <= max(relative_tolerance * max(abs(a), abs(b)), absolute_tolerance)`,
+        which with the default tolerances is exactly Vector.__eq__ in the precision
+        current when the index is created (the cells depend on the tolerance, so a
+        later change of precision does not change the index).
+
+    Args:
+        absolute_tolerance (float, optional): Defaults to None, the absolute tolerance
+            of Vector.__eq__.
+        relative_tolerance (float, optional): Defaults to None, the relative tolerance
+            of Vector.__eq__.
+        cell_size (float, optional): side of the cells. Defaults to None, which uses the
+            largest tolerance of vectors within MAX_NORM. Lookups work for any size, but
+            a cell smaller than the tolerance means checking more cells, and a bigger one
+            checking more vectors.
+
+    Attributes:
+        cell_size (float): side of the cells.
+
+    Raises:
+        ValueError: The tolerances are negative or the cell size is not positive.
+    """
+
+    def __init__(
+        self,
+        absolute_tolerance: float | None = None,
+        relative_tolerance: float | None = None,
+        cell_size: float | None = None,
+    ) -> None:
+        absolute_tolerance, relative_tolerance = _tolerances(absolute_tolerance, relative_tolerance)
+        if absolute_tolerance < 0 or relative_tolerance < 0:
+            raise ValueError("The tolerances cannot be negative.")
+        self.absolute_tolerance = absolute_tolerance
+        self.relative_tolerance = relative_tolerance
+        if cell_size is None:
+            cell_size = max(absolute_tolerance, relative_tolerance * MAX_NORM, 1e-300)
+        if not cell_size > 0:
+            raise ValueError(f"The cell size must be positive, not {cell_size}.")
+        self.cell_size: float = cell_size
+        self._x: list[float] = []
+        self._y: list[float] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+    @classmethod
+    def from_array(cls, points: ArrayLike, unique: bool = False, **kwargs: float) -> VectorIndex:
+        """Create an index with the vectors of an (N, 2) array (see `insert`).
+
+        Args:
+            points (ArrayLike): the (N, 2) coordinates of the vectors.
+            unique (bool, optional): skip the vectors equal to one already inserted.
+                Defaults to False.
+            kwargs: the tolerances and cell size of the index.
+        """
+        index = cls(**kwargs)
+        for x, y in np.asarray(points, dtype=np.float64).reshape(-1, 2).tolist():
+            index._insert(x, y, unique)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._x)
+
+    def __iter__(self) -> Iterator[Vector]:
+        return (Vector(x, y) for x, y in zip(self._x, self._y))
+
+    def __contains__(self, vector: object) -> bool:
+        return isinstance(vector, Vector) and self.first_equal(vector) is not None
+
+    def __getitem__(self, index: int) -> Vector:
+        return Vector(self._x[index], self._y[index])
+
+    @property
+    def points(self) -> NDArray[np.float64]:
+        """NDArray[np.float64]: (N, 2) array with the vectors, in insertion order."""
+        return np.array([self._x, self._y], dtype=np.float64).T.reshape(-1, 2)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, vector: Vector, unique: bool = False) -> int:
+        """Add a vector to the index.
+
+        Args:
+            vector (Vector): the vector to add.
+            unique (bool, optional): if an equal vector is already in the index, return
+                its position instead of adding the vector. Defaults to False.
+
+        Returns:
+            int: position of the vector in the index.
+
+        Raises:
+            ValueError: Infinite or NaN coordinates, which have no cell.
+        """
+        return self._insert(vector.x, vector.y, unique)
+
+    def _insert(self, x: float, y: float, unique: bool) -> int:
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise ValueError(f"Cannot index a vector with coordinates ({x}, {y}).")
+        if unique:
+            position = self._first_equal(x, y)
+            if position is not None:
+                return position
+        position = len(self._x)
+        self._x.append(x)
+        self._y.append(y)
+        self._cells.setdefault(self._cell(x, y), []).append(position)
+        return position
+
+    def _candidates(self, x: float, y: float, dx: float, dy: float) -> Iterator[int]:
+        """Positions of the vectors in the cells that overlap the rectangle
+        [x - dx, x + dx] x [y - dy, y + dy], in no particular order.
+        """
+        i_min, j_min = self._cell(x - dx, y - dy)
+        i_max, j_max = self._cell(x + dx, y + dy)
+        if (i_max - i_min + 1) * (j_max - j_min + 1) > len(self._cells):
+            # The rectangle spans more cells than are occupied, so we check these instead
+            for (i, j), positions in self._cells.items():
+                if i_min <= i <= i_max and j_min <= j <= j_max:
+                    yield from positions
+            return
+        for i in range(i_min, i_max + 1):
+            for j in range(j_min, j_max + 1):
+                yield from self._cells.get((i, j), ())
+
+    def _tolerance(self, value: float) -> float:
+        """Largest difference with `value` that a coordinate equal to it can have."""
+        # The other coordinate can be a bit bigger than value, hence the extra factor
+        relative = self.relative_tolerance * abs(value) * (1 + 2 * self.relative_tolerance)
+        return max(relative, self.absolute_tolerance)
+
+    def _equal(self, a: float, b: float) -> bool:
+        return abs(a - b) <= max(
+            self.relative_tolerance * max(abs(a), abs(b)), self.absolute_tolerance
+        )
+
+    def _equal_positions(self, x: float, y: float) -> Iterator[int]:
+        xs, ys, equal = self._x, self._y, self._equal
+        for position in self._candidates(x, y, self._tolerance(x), self._tolerance(y)):
+            if equal(xs[position], x) and equal(ys[position], y):
+                yield position
+
+    def _first_equal(self, x: float, y: float) -> int | None:
+        return min(self._equal_positions(x, y), default=None)
+
+    def find_equal(self, vector: Vector) -> list[int]:
+        """Positions (in insertion order) of the vectors of the index equal to the vector."""
+        return sorted(self._equal_positions(vector.x, vector.y))
+
+    def first_equal(self, vector: Vector) -> int | None:
+        """Position of the first inserted vector equal to the vector, or None if there
+        is no such vector.
+        """
+        return self._first_equal(vector.x, vector.y)
+
+    def within(self, vector: Vector, radius: float) -> list[int]:
+        """Positions (in insertion order) of the vectors at a distance from the vector
+        not greater than the radius.
+
+        Note:
+            The cells are as small as the tolerance, so a big radius overlaps a lot of
+            cells. When they are more than the occupied cells, we go through the
+            occupied cells instead, which then takes O(N) time.
+        """
+        x, y = vector.x, vector.y
+        xs, ys = self._x, self._y
+        squared_radius = radius * radius
+        return sorted(
+            position
+            for position in self._candidates(x, y, radius, radius)
+            if (xs[position] - x) ** 2 + (ys[position] - y) ** 2 <= squared_radius
+        )
+
+
+def deduplicate(
+    points: ArrayLike,
+    absolute_tolerance: float | None = None,
+    relative_tolerance: float | None = None,
+    return_inverse: bool = False,
+) -> NDArray[np.intp] | tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """Find the vectors of an (N, 2) array that are not equal to a previous one.
+
+    Note:
+        The result is the same as inserting the vectors one by one in a VectorIndex
+        with `unique=True`, but everything runs in NumPy. Exact copies (the usual case,
+        e.g. integer coordinates) are collapsed first with np.unique, since a later copy
+        is always dropped. Then the cell numbers of the distinct vectors are sorted, and
+        only the pairs of vectors in the same or neighbouring cells are compared, in
+        blocks of PAIR_BLOCK pairs. Sorting takes O(N log N) time and comparing O(N)
+        for spread-out vectors; k distinct vectors within a cell cost k^2 comparisons.
+
+    Args:
+        points (ArrayLike): the (N, 2) coordinates of the vectors.
+        absolute_tolerance (float, optional): Defaults to None, the absolute tolerance
+            of Vector.__eq__ (which follows the precision).
+        relative_tolerance (float, optional): Defaults to None, the relative tolerance
+            of Vector.__eq__.
+        return_inverse (bool, optional): also return, for every vector, the position
+            in the result of the kept vector it equals. Defaults to False.
+
+    Returns:
+        NDArray[np.intp] | tuple[NDArray[np.intp], NDArray[np.intp]]: the increasing
+            indices of the kept vectors (`points[indices]` has no repeated vectors) and,
+            if requested, the inverse, such that `points[indices][inverse]` equals
+            `points` up to the tolerance.
+
+    Raises:
+        ValueError: The points do not have shape (N, 2) or are not finite.
+    """
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"The points must have shape (N, 2), but got {points.shape}.")
+    if not np.isfinite(points).all():
+        raise ValueError("Cannot deduplicate infinite or NaN coordinates.")
+    absolute_tolerance, relative_tolerance = _tolerances(absolute_tolerance, relative_tolerance)
+    if len(points) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return (empty, empty.copy()) if return_inverse else empty
+
+    # Viewed as complex numbers, the rows are sorted by x and then y in a single 1D sort
+    _, first_positions, copy_of = np.unique(
+        points.view(np.complex128).ravel(), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_positions)  # distinct vectors in the order they first appear
+    distinct_positions = first_positions[order]
+    result = _deduplicate_distinct(
+        points[distinct_positions], absolute_tolerance, relative_tolerance, return_inverse
+    )
+    if not return_inverse:
+        return distinct_positions[result]
+    indices, inverse = result
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))  # position of each np.unique value in `order`
+    return distinct_positions[indices], inverse[rank[copy_of.ravel()]]
+
+
+def _tolerances(absolute: float | None, relative: float | None) -> tuple[float, float]:
+    """The given tolerances, or the current ones of Vector.__eq__ for those that are None."""
+    if absolute is None:
+        absolute = _vector_module._absolute_tolerance
+    if relative is None:
+        relative = _vector_module._relative_tolerance
+    return absolute, relative
+
+
+def _deduplicate_distinct(
+    points: NDArray[np.float64],
+    absolute_tolerance: float,
+    relative_tolerance: float,
+    return_inverse: bool,
+) -> NDArray[np.intp] | tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """`deduplicate` for points without exact copies."""
+    size = len(points)
+    # Cells as big as the largest tolerance, and not so small that they do not fit in int64
+    lowest, highest = float(points.min()), float(points.max())  # faster than per column
+    cell_size = max(
+        absolute_tolerance,
+        relative_tolerance * max(-lowest, highest),
+        (highest - lowest) / (_MAX_CELLS - 2),
+        1e-300,
+    ) * (1 + 1e-6)  # a margin for the rounding errors of the division below
+    scaled = np.subtract(points, lowest)
+    np.multiply(scaled, 1 / cell_size, out=scaled)
+    cells = scaled.astype(np.int64)  # truncating non-negative numbers is the floor
+    row_length = int(cells[:, 1].max()) + 2  # leave room for the neighbours of the last row
+    keys = cells[:, 0] * row_length + cells[:, 1]
+
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.diff(sorted_keys, prepend=sorted_keys[0] - 1))
+    counts = np.diff(starts, append=size)
+    cell_keys = sorted_keys[starts]
+
+    # Pairs of vectors in the same cell, and in half of the neighbouring cells (the other
+    # half would give the same pairs again)
+    ranges = [(starts, counts, starts, counts, True)]
+    for offset in (1, row_length - 1, row_length, row_length + 1):
+        neighbours = np.searchsorted(cell_keys, cell_keys + offset)
+        found = neighbours < len(cell_keys)
+        found[found] = cell_keys[neighbours[found]] == cell_keys[found] + offset
+        neighbours = neighbours[found]
+        ranges.append((starts[found], counts[found], starts[neighbours], counts[neighbours], False))
+
+    later_parts, earlier_parts = [], []
+    for left_starts, left_counts, right_starts, right_counts, same_cell in ranges:
+        blocks = _pair_blocks(left_starts, left_counts, right_starts, right_counts, same_cell)
+        for left, right in blocks:
+            first, second = order[left], order[right]
+            a, b = points[first], points[second]
+            tolerance = np.maximum(np.abs(a), np.abs(b))
+            np.multiply(tolerance, relative_tolerance, out=tolerance)
+            np.maximum(tolerance, absolute_tolerance, out=tolerance)
+            difference = np.subtract(a, b, out=a)
+            equal = np.all(np.abs(difference, out=difference) <= tolerance, axis=1)
+            later_parts.append(np.maximum(first[equal], second[equal]))
+            earlier_parts.append(np.minimum(first[equal], second[equal]))
+    later = np.concatenate(later_parts) if later_parts else np.empty(0, dtype=np.intp)
+    earlier = np.concatenate(earlier_parts) if earlier_parts else np.empty(0, dtype=np.intp)
+    return _greedy_unique(size, later, earlier, return_inverse)
+
+
+def _pair_blocks(
+    left_starts: NDArray[np.intp],
+    left_counts: NDArray[np.intp],
+    right_starts: NDArray[np.intp],
+    right_counts: NDArray[np.intp],
+    same_cell: bool = False,
+) -> Iterator[tuple[NDArray[np.intp], NDArray[np.intp]]]:
+    """All the pairs (l, r) with l in range(left_start, left_start + left_count) and r in
+    the matching right range, for every pair of ranges (only l < r if `same_cell`), in
+    blocks of at most about 2 * PAIR_BLOCK pairs.
+    """
+    if same_cell:  # single vectors have no pairs: skip them before counting
+        several = left_counts > 1
+        left_starts, left_counts = left_starts[several], left_counts[several]
+        right_starts, right_counts = left_starts, left_counts
+    # Split the left ranges of the range pairs with more than PAIR_BLOCK pairs
+    rows = np.maximum(PAIR_BLOCK // np.maximum(right_counts, 1), 1)
+    pieces = -(-left_counts // rows)
+    piece = np.arange(int(pieces.sum())) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    rows = np.repeat(rows, pieces)
+    left_counts = np.minimum(np.repeat(left_counts, pieces) - piece * rows, rows)
+    left_starts = np.repeat(left_starts, pieces) + piece * rows
+    right_starts, right_counts = np.repeat(right_starts, pieces), np.repeat(right_counts, pieces)
+
+    # Consecutive range pairs go in the same block until it has PAIR_BLOCK pairs
+    sizes = left_counts * right_counts
+    ends = np.cumsum(sizes)
+    if not len(ends) or not ends[-1]:
+        return
+    splits = np.searchsorted(ends, np.arange(PAIR_BLOCK, ends[-1], PAIR_BLOCK), side="right")
+    bounds = np.unique(np.concatenate(([0], splits, [len(sizes)])))
+    for begin, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        block_sizes, block_counts = sizes[begin:end], right_counts[begin:end]
+        total = int(block_sizes.sum())
+        step = np.arange(total) - np.repeat(np.cumsum(block_sizes) - block_sizes, block_sizes)
+        repeated_counts = np.repeat(block_counts, block_sizes)
+        left = np.repeat(left_starts[begin:end], block_sizes) + step // repeated_counts
+        right = np.repeat(right_starts[begin:end], block_sizes) + step % repeated_counts
+        if same_cell:
+            keep = left < right
+            left, right = left[keep], right[keep]
+        yield left, right
+
+
+def _greedy_unique(
+    size: int, later: NDArray[np.intp], earlier: NDArray[np.intp], return_inverse: bool
+) -> NDArray[np.intp] | tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """Keep every vector that is not equal to an earlier kept vector, given all the
+    pairs of equal vectors (later[k] > earlier[k]).
+    """
+    has_earlier = np.zeros(size, dtype=bool)
+    has_earlier[later] = True
+    # Vectors with no earlier equal are always kept, so their later equals are dropped
+    dropped = np.zeros(size, dtype=bool)
+    dropped[later[~has_earlier[earlier]]] = True
+
+    # The rest depend on whether their earlier equals were kept: we go through them in
+    # order (chains of vectors each equal to the next one but not to the first are rare)
+    undecided = has_earlier & ~dropped
+    if undecided.any():
+        partners: dict[int, list[int]] = {}
+        for position, partner in zip(later.tolist(), earlier.tolist()):
+            if undecided[position]:
+                partners.setdefault(position, []).append(partner)
+        for position in sorted(partners):
+            dropped[position] = any(not dropped[partner] for partner in partners[position])
+
+    indices = np.flatnonzero(~dropped)
+    if not return_inverse:
+        return indices
+    # Each dropped vector is represented by the first kept vector it equals
+    representative = np.where(dropped, size, np.arange(size))
+    to_kept = ~dropped[earlier]
+    np.minimum.at(representative, later[to_kept], earlier[to_kept])
+    new_positions = np.cumsum(~dropped) - 1
+    return indices, new_positions[representative]
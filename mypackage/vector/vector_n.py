@@ -0,0 +1,208 @@
+"""This module contains the VectorN class, a vector with any number of components.
+
+Vector is written for two components: its methods spell out `x` and `y` (e.g. `x * x +
+y * y`), which is as fast as Python gets for the plane. That does not scale to 3D or
+higher dimensions, so VectorN stores its components in a contiguous float64 NumPy array
+and leaves the arithmetic to NumPy, whose dot products and matrix products call the
+optimized BLAS library.
+
+Note:
+    For two components, Vector is still several times faster than VectorN: a NumPy call
+    costs around a microsecond, while multiplying a couple of Python floats costs a few
+    tens of nanoseconds. Use VectorN when the dimension is not 2 (or not known).
+
+Examples:
+    >>> vector = VectorN([1, 2, 2])
+    >>> vector.norm
+    3.0
+    >>> vector + VectorN([1, 0, 0])
+    VectorN([2.0, 2.0, 2.0])
+    >>> vector * VectorN([0, 1, 1])
+    4.0
+
+"""
+
+from __future__ import annotations
+
+import math
+import warnings
+from collections.abc import Iterator
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from . import vector as _vector_module
+from .vector import OFF, Vector, _norm_violation
+
+
+class VectorN:
+    """Vector with any number of components, stored in a read only float64 array.
+
+    Args:
+        components (ArrayLike): the components of the vector, e.g. `[1, 2, 3]`.
+
+    Attributes:
+        components (NDArray[np.float64]): contiguous one dimensional array with the
+            components. It is read only, since vectors are values (like Vector).
+
+    Raises:
+        ValueError: the components are not a one dimensional sequence of numbers.
+        NormError: the norm of the vector is greater than MAX_NORM (only if the
+            validation mode is EAGER).
+    """
+
+    __slots__ = ("components",)
+
+    def __init__(self, components: ArrayLike) -> None:
+        array = np.array(components, dtype=np.float64)
+        if array.ndim != 1:
+            raise ValueError(f"The components must be one dimensional, but got {array.shape}.")
+        array.flags.writeable = False
+        self.components: NDArray[np.float64] = array
+
+        if _vector_module._validation != OFF:
+            squared_norm = float(np.dot(array, array))  # BLAS dot product
+            if squared_norm > _vector_module._MAX_NORM_SQUARED:
+                _norm_violation(math.sqrt(squared_norm))
+
+    @classmethod
+    def _from_trusted(cls, array: NDArray[np.float64]) -> VectorN:
+        """Wrap a new one dimensional float array without copying nor validating it.
+
+        Note:
+            Only for internal use, when the array is the fresh result of an operation
+            that cannot break MAX_NORM (or validation is turned OFF).
+        """
+        vector = object.__new__(cls)
+        array.flags.writeable = False
+        vector.components = array
+        return vector
+
+    @classmethod
+    def from_vector(cls, vector: Vector) -> VectorN:
+        """Create a VectorN with the two components of a Vector."""
+        return cls._from_trusted(np.array([vector.x, vector.y], dtype=np.float64))
+
+    def to_vector(self) -> Vector:
+        """Convert a two dimensional VectorN into the (faster) Vector class.
+
+        Raises:
+            ValueError: The vector does not have two components.
+        """
+        if len(self) != 2:
+            raise ValueError(f"Only 2 dimensional vectors can be converted, not {len(self)}.")
+        x, y = self.components.tolist()
+        return Vector(x, y)
+
+    @property
+    def dimension(self) -> int:
+        """int: number of components of the vector."""
+        return self.components.shape[0]
+
+    def __len__(self) -> int:
+        return self.components.shape[0]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.components.tolist())
+
+    def __getitem__(self, index: int) -> float:
+        return float(self.components[index])
+
+    def __array__(self, dtype: object = None, copy: bool | None = None) -> NDArray:
+        """Let NumPy functions (e.g. np.asarray) use the components directly."""
+        if copy or dtype is not None:
+            return np.array(self.components, dtype=dtype)
+        return self.components
+
+    def __repr__(self) -> str:
+        return f"VectorN({self.components.tolist()})"
+
+    def __str__(self) -> str:
+        return f"({', '.join(str(component) for component in self.components.tolist())})"
+
+    def _other_components(self, other: VectorN) -> NDArray[np.float64]:
+        if not isinstance(other, VectorN):
+            raise TypeError("You must pass in a VectorN instance!")
+        if len(other) != len(self):
+            raise ValueError(f"Vectors of different dimensions: {len(self)} and {len(other)}.")
+        return other.components
+
+    def __add__(self, other: VectorN) -> VectorN:
+        """Return the addition of self and the other vector.
+
+        Raises:
+            TypeError: Not VectorN passed in.
+            ValueError: Vectors of different dimensions.
+            NormError: The result is too big.
+        """
+        components = self.components + self._other_components(other)
+        if _vector_module._validation == OFF:
+            return VectorN._from_trusted(components)
+        return VectorN(components)
+
+    def __mul__(self, other: VectorN | float) -> VectorN | float:
+        """Return the dot product with another vector or the vector scaled by a number.
+
+        Raises:
+            TypeError: Not VectorN/int/float passed in.
+            ValueError: Vectors of different dimensions.
+            NormError: The scaled vector is too big.
+        """
+        if isinstance(other, VectorN):
+            return float(np.dot(self.components, self._other_components(other)))
+
+        if not isinstance(other, (int, float, np.number)):
+            raise TypeError("You must pass in an int/float!")
+
+        components = self.components * other
+        if _vector_module._validation == OFF or -1 <= other <= 1:  # shrinking is always fine
+            return VectorN._from_trusted(components)
+        return VectorN(components)
+
+    def __rmul__(self, other: float) -> VectorN | float:
+        return self.__mul__(other)
+
+    def __eq__(self, other: object) -> bool:
+        """Check if the vectors have the same dimension and values up to some tolerance
+        (the same one as Vector.__eq__).
+        """
+        if not isinstance(other, VectorN) or len(other) != len(self):
+            return False
+        difference = np.abs(self.components - other.components)
+        scale = np.maximum(np.abs(self.components), np.abs(other.components))
+        rel_tol, abs_tol = _vector_module._relative_tolerance, _vector_module._absolute_tolerance
+        return bool(np.all(difference <= np.maximum(rel_tol * scale, abs_tol)))
+
+    __hash__ = None  # type: ignore[assignment]  # equal vectors may have different bits
+
+    @property
+    def norm(self) -> float:
+        """float: the Euclidean norm of the vector (computed by BLAS)."""
+        return float(np.linalg.norm(self.components))
+
+    def projection(self, subspace: VectorN | None = None) -> VectorN:
+        """By default projects the vector onto its first component. If a vector spanning
+        a subspace is given, then the vector is projected along this subspace.
+
+        Note:
+            Projections never increase the norm, so no validation is needed.
+
+        Args:
+            subspace (VectorN, optional): vector that spans the subspace onto which to
+                project the vector. Defaults to None.
+
+        Returns:
+            VectorN: The projected vector.
+        """
+        if subspace is None:
+            warnings.warn(
+                "No subspace given: the vector is projected onto the first component!", stacklevel=2
+            )
+            components = np.zeros_like(self.components)
+            components[0] = self.components[0]
+            return VectorN._from_trusted(components)
+        subspace_components = self._other_components(subspace)
+        coefficient = np.dot(subspace_components, self.components) / np.dot(
+            subspace_components, subspace_components
+        )
+        return VectorN._from_trusted(subspace_components * coefficient)
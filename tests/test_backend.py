@@ -0,0 +1,96 @@
+"""Tests for the batch backends. The Numba kernels must give the same results
+as the NumPy kernels, which we take as the reference implementation.
+"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Rotation, Shear, Vector, VectorArray
+from mypackage.backend import get_backend_name, numpy_kernels, set_backend, use_backend
+
+
+pytest.importorskip("numba")
+from mypackage.backend import numba_kernels  # noqa: E402
+
+
+RNG = np.random.default_rng(1234)
+A = RNG.uniform(-50, 50, size=(1000, 2))
+B = RNG.uniform(-50, 50, size=(1000, 2))
+MATRIX = np.array([[0.5, -2.0], [1.0, 3.0]])
+
+
+@pytest.mark.parametrize("other", (B, B[:1]))
+@pytest.mark.parametrize("kernel", ("add", "project"))
+def test_binary_kernels(kernel: str, other: np.ndarray) -> None:
+    expected = getattr(numpy_kernels, kernel)(A, other, np.empty_like(A))
+    result = getattr(numba_kernels, kernel)(A, other, np.empty_like(A))
+    assert np.allclose(result, expected)
+
+
+@pytest.mark.parametrize("other", (B, B[:1]))
+def test_dot_kernel(other: np.ndarray) -> None:
+    expected = numpy_kernels.dot(A, other, np.empty(len(A)))
+    assert np.allclose(numba_kernels.dot(A, other, np.empty(len(A))), expected)
+
+
+def test_unary_kernels() -> None:
+    expected = numpy_kernels.scale(A, -3.0, np.empty_like(A))
+    assert np.allclose(numba_kernels.scale(A, -3.0, np.empty_like(A)), expected)
+    expected = numpy_kernels.norm(A, np.empty(len(A)))
+    assert np.allclose(numba_kernels.norm(A, np.empty(len(A))), expected)
+    expected = numpy_kernels.norm_violations(A, 50)
+    assert np.array_equal(numba_kernels.norm_violations(A, 50), expected)
+
+
+def test_apply_in_place() -> None:
+    expected = numpy_kernels.apply(MATRIX, A, np.empty_like(A))
+    result = A.copy()
+    numba_kernels.apply(MATRIX, result, result)
+    assert np.allclose(result, expected)
+
+
+@pytest.mark.parametrize("vectors", (A, A[:1]))
+def test_apply_each(vectors: np.ndarray) -> None:
+    matrices = RNG.uniform(-2, 2, size=(len(A), 2, 2))
+    expected = np.einsum("nij,nj->ni", matrices, np.broadcast_to(vectors, A.shape))
+    assert np.allclose(numpy_kernels.apply_each(matrices, vectors, np.empty_like(A)), expected)
+    assert np.allclose(numba_kernels.apply_each(matrices, vectors, np.empty_like(A)), expected)
+    for kernels in (numpy_kernels, numba_kernels):  # in place
+        result = np.broadcast_to(vectors, A.shape).copy()
+        assert np.allclose(kernels.apply_each(matrices, result, result), expected)
+
+
+def test_lu_kernels() -> None:
+    stack = RNG.normal(size=(50, 6, 6))
+    stack[0, :, 2] = 0.0  # singular
+    b = RNG.normal(size=(50, 6, 2))
+    results = []
+    for kernels in (numpy_kernels, numba_kernels):
+        lu, pivots, b_copy = stack.copy(), np.empty((50, 6), dtype=np.intp), b.copy()
+        signs = kernels.lu_factor(lu, pivots, np.empty(50))
+        results.append((lu, pivots, signs, kernels.lu_solve(lu[1:], pivots[1:], b_copy[1:])))
+    for expected, result in zip(results[0], results[1]):
+        assert np.allclose(expected, result)
+    assert np.allclose(results[0][3], np.linalg.solve(stack[1:], b[1:]))
+
+
+@pytest.mark.parametrize("backend", ("numpy", "numba"))
+def test_vector_array_backend(backend: str) -> None:
+    vectors = VectorArray(A / 2)
+    with use_backend(backend):
+        assert get_backend_name() == backend
+        assert vectors + Vector(1, 1) == VectorArray(A / 2 + 1)
+        assert Rotation(0.3).inverse(Rotation(0.3)(vectors)) == vectors
+        with pytest.raises(NormError):
+            Shear(0.1)(vectors)
+    assert get_backend_name() == "numpy"
+
+
+def test_numba_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "mypackage.backend.numba_kernels", None)
+    monkeypatch.delattr("mypackage.backend.numba_kernels")
+    with pytest.warns(UserWarning, match="Numba"):
+        set_backend("numba")
+    assert get_backend_name() == "numpy"
@@ -0,0 +1,59 @@
+"""Tests for the benchmark suite (with tiny sizes and times, so they run fast)."""
+
+from pathlib import Path
+
+import pytest
+
+from mypackage.__main__ import main
+from mypackage.bench import (
+    BENCHMARKS,
+    BenchmarkResult,
+    compare,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+FAST = {"repeat": 2, "min_time": 1e-4}
+
+
+def test_run_all_benchmarks() -> None:
+    results = run_benchmarks(sizes=(1, 10), **FAST)
+    assert len(results) == 2 * len(BENCHMARKS)
+    assert all(len(result.times) == 2 and result.best > 0 for result in results)
+
+
+def test_scalar_benchmarks_are_capped() -> None:
+    results = run_benchmarks(sizes=(10, 100), pattern="__add__", max_scalar_size=10, **FAST)
+    assert [(result.kind, result.size) for result in results] == [
+        ("scalar", 10),
+        ("batch", 10),
+        ("batch", 100),
+    ]
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    results = run_benchmarks(sizes=(5,), pattern="^Rotation", **FAST)
+    save_results(tmp_path / "results.json", results)
+    assert load_results(tmp_path / "results.json") == results
+
+
+@pytest.mark.parametrize("current, regression", ((1.05, False), (0.5, False), (1.2, True)))
+def test_compare(current: float, regression: bool) -> None:
+    baseline = [BenchmarkResult("Vector.__add__", "scalar", 10, 1, [1.0, 2.0])]
+    results = [BenchmarkResult("Vector.__add__", "scalar", 10, 1, [current, 3.0])]
+    results.append(BenchmarkResult("Vector.__eq__", "scalar", 10, 1, [1.0]))  # not in baseline
+    (comparison,) = compare(results, baseline, threshold=0.1)
+    assert comparison.ratio == current
+    assert comparison.regression is regression
+
+
+def test_cli_regression(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    baseline = tmp_path / "baseline.json"
+    save_results(baseline, [BenchmarkResult("Vector.__add__", "scalar", 10, 1, [1e-12])])
+    with pytest.raises(SystemExit) as exit_info:
+        main(["bench", "--filter", "Vector.__add__", "--sizes", "10", "--repeat", "1",
+              "--min-time", "1e-4", "--baseline", str(baseline)])  # fmt: skip
+    assert exit_info.value.code == 1
+    assert "1 regressions out of 1 benchmarks" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+"""Tests for the binary vector file format."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Vector, VectorArray
+from mypackage.io import create_vectors, load_vectors, open_vectors, read_header, save_vectors
+from mypackage.io.binary import HEADER_SIZE
+
+
+ARRAY = np.random.default_rng(0).uniform(-50, 50, size=(1000, 2))
+
+
+@pytest.mark.parametrize("vectors", (Vector(1, 2), VectorArray(ARRAY), ARRAY, ARRAY[:0]))
+def test_roundtrip(tmp_path: Path, vectors: Vector | VectorArray | np.ndarray) -> None:
+    path = tmp_path / "vectors.vec"
+    save_vectors(path, vectors)
+    if isinstance(vectors, Vector):
+        expected = VectorArray.from_vectors([vectors])
+    else:
+        expected = VectorArray(ARRAY[: len(vectors)])
+    assert load_vectors(path) == expected
+    assert path.stat().st_size == HEADER_SIZE + 16 * read_header(path).count
+
+
+def test_float32(tmp_path: Path) -> None:
+    path = tmp_path / "vectors.vec"
+    save_vectors(path, ARRAY, dtype=np.float32)
+    assert read_header(path).dtype == np.float32
+    assert path.stat().st_size == HEADER_SIZE + 8 * len(ARRAY)
+    assert np.allclose(load_vectors(path).array, ARRAY, atol=1e-5)
+
+
+def test_memory_map(tmp_path: Path) -> None:
+    path = tmp_path / "vectors.vec"
+    mapped = create_vectors(path, len(ARRAY))
+    mapped[:500] = ARRAY[:500]
+    mapped[500:] = ARRAY[500:]
+    mapped.flush()
+    del mapped
+    loaded = open_vectors(path)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, ARRAY)
+
+
+def test_validate(tmp_path: Path) -> None:
+    path = tmp_path / "vectors.vec"
+    save_vectors(path, np.array([[1.0, 0.0], [200.0, 0.0]]))
+    load_vectors(path)  # no validation by default
+    with pytest.raises(NormError):
+        load_vectors(path, validate=True)
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    ((b"not a vector file" * 2, "magic"), (b"VECS\x01\x00d\x00\x05" + bytes(23), "Truncated")),
+)
+def test_invalid_file(tmp_path: Path, content: bytes, message: str) -> None:
+    path = tmp_path / "vectors.vec"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match=message):
+        open_vectors(path)
+
+
+def test_invalid_dtype(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="dtype"):
+        save_vectors(tmp_path / "vectors.vec", ARRAY, dtype=np.int64)
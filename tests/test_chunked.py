@@ -0,0 +1,101 @@
+"""Tests for the out-of-core (chunked) processing of datasets."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mypackage import Rotation, Shear
+from mypackage.io import (
+    centroid,
+    count_norm_violations,
+    iter_chunks,
+    max_norm,
+    open_vectors,
+    save_vectors,
+    summarize,
+    transform_file,
+)
+
+
+ARRAY = np.random.default_rng(0).uniform(-80, 80, size=(1001, 2))
+NORMS = np.hypot(ARRAY[:, 0], ARRAY[:, 1])
+
+
+@pytest.fixture(params=(".vec", ".npy"))
+def dataset(request: pytest.FixtureRequest, tmp_path: Path) -> Path:
+    path = tmp_path / f"input{request.param}"
+    if request.param == ".npy":
+        np.save(path, ARRAY)
+    else:
+        save_vectors(path, ARRAY)
+    return path
+
+
+def test_iter_chunks(dataset: Path) -> None:
+    chunks = list(iter_chunks(dataset, chunk_size=100))
+    assert len(chunks) == 11
+    assert np.array_equal(np.concatenate(chunks), ARRAY)
+
+
+@pytest.mark.parametrize("suffix", (".vec", ".npy"))
+@pytest.mark.parametrize(("linear_map", "inverse"), ((Rotation(0.4), False), (Shear(1.1), True)))
+def test_transform_file(
+    dataset: Path, tmp_path: Path, suffix: str, linear_map: Rotation, inverse: bool
+) -> None:
+    output_path = tmp_path / f"output{suffix}"
+    stats = transform_file(dataset, linear_map, output_path, inverse=inverse, chunk_size=64)
+    assert stats.vectors == len(ARRAY)
+    assert stats.vectors_per_second > 0
+    result = np.load(output_path) if suffix == ".npy" else open_vectors(output_path)
+    expected = linear_map.inverse(ARRAY) if inverse else linear_map(ARRAY)
+    assert np.allclose(result, expected)
+
+
+@pytest.mark.parametrize("chunk_size", (0, -1))
+def test_invalid_chunk_size(dataset: Path, tmp_path: Path, chunk_size: int) -> None:
+    with pytest.raises(ValueError, match="chunk size"):
+        iter_chunks(dataset, chunk_size)
+    with pytest.raises(ValueError, match="chunk size"):
+        transform_file(dataset, Rotation(1), tmp_path / "output.vec", chunk_size=chunk_size)
+    with pytest.raises(ValueError, match="chunk size"):
+        summarize(ARRAY, chunk_size)
+    assert not (tmp_path / "output.vec").exists()
+
+
+def test_transform_file_float32(tmp_path: Path) -> None:
+    save_vectors(tmp_path / "input.vec", ARRAY, dtype=np.float32)
+    transform_file(tmp_path / "input.vec", Rotation(1.0), tmp_path / "output.vec")
+    result = open_vectors(tmp_path / "output.vec")
+    assert result.dtype == np.float32
+    assert np.allclose(result, Rotation(1.0)(ARRAY), atol=1e-4)
+
+
+def test_reductions(dataset: Path) -> None:
+    summary = summarize(dataset, chunk_size=100)
+    assert summary.count == len(ARRAY)
+    assert max_norm(dataset) == pytest.approx(NORMS.max())
+    assert count_norm_violations(dataset, chunk_size=7) == np.count_nonzero(NORMS > 100)
+    assert np.allclose(centroid(dataset), ARRAY.mean(axis=0))
+
+
+def test_empty_summary() -> None:
+    summary = summarize(np.empty((0, 2)))
+    assert summary.count == 0
+    assert np.isnan(summary.max_norm)
+
+
+@pytest.mark.parametrize("suffix", (".vec", ".npy"))
+@pytest.mark.parametrize("dtype", (">f8", ">f4", "<i8", ">i4"))
+def test_transform_file_converts_dtype(tmp_path: Path, suffix: str, dtype: str) -> None:
+    array = np.round(ARRAY).astype(dtype)
+    np.save(tmp_path / "input.npy", array)
+    output_path = tmp_path / f"output{suffix}"
+    transform_file(tmp_path / "input.npy", Rotation(0.4), output_path, chunk_size=100)
+    result = np.load(output_path) if suffix == ".npy" else open_vectors(output_path)
+    assert result.dtype.kind == "f" and result.dtype.itemsize == (4 if dtype == ">f4" else 8)
+    expected = Rotation(0.4)(array.astype(np.float64))
+    assert np.allclose(result, expected, atol=1e-4)
+    transform_file(array, Rotation(0.4), output_path)  # the same for arrays
+    result = np.load(output_path) if suffix == ".npy" else open_vectors(output_path)
+    assert np.allclose(result, expected, atol=1e-4)
@@ -0,0 +1,54 @@
+"""Tests for the `vector` command line interface."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from mypackage.__main__ import main
+
+
+def test_single_vector(capsys: pytest.CaptureFixture[str]) -> None:
+    main(["1", "-2"])
+    assert capsys.readouterr().out == "Vector (1.0, -2.0) created!\n"
+
+
+def test_missing_coordinate() -> None:
+    with pytest.raises(SystemExit):
+        main(["1"])
+
+
+@pytest.mark.parametrize("chunk_size", ("0", "-1", "many"))
+def test_invalid_chunk_size(chunk_size: str, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as error:
+        main(["--batch", "--chunk-size", chunk_size])
+    assert error.value.code == 2
+    assert "--chunk-size" in capsys.readouterr().err
+
+
+def test_batch_stdin(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr("sys.stdin", io.StringIO("1 0\nfoo\n0 2\n"))
+    main(["--batch", "--rotate", "0"])
+    captured = capsys.readouterr()
+    assert captured.out == "1.0 0.0\n0.0 2.0\n"
+    assert "1 rejected" in captured.err
+
+
+def test_batch_files(tmp_path: Path) -> None:
+    (tmp_path / "a.csv").write_text("1,0\n200,0\n")
+    (tmp_path / "b.csv").write_text("0,1\n")
+    output, reject = tmp_path / "out.csv", tmp_path / "reject.csv"
+    files = [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")]
+    main(["--batch", *files, "--delimiter", ",", "--shear", "0.7853981633974483", "--inverse",
+          "-o", str(output), "--reject", str(reject)])  # fmt: skip
+    assert output.read_text().splitlines() == ["1.0,0.0", "-1.0000000000000002,1.0"]
+    assert reject.read_text() == "200,0\n"
+
+
+def test_save_load_binary(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    main(["1", "2", "--save", "vector.vec", "--format", "binary"])
+    main(["--load", "data/vector.vec"])
+    assert capsys.readouterr().out.splitlines()[-1] == "Vector (1.0, 2.0) loaded!"
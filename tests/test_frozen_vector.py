@@ -0,0 +1,99 @@
+"""Tests for the immutable, hashable vectors and their interning cache."""
+
+import copy
+import functools
+import pickle
+
+import numpy as np
+import pytest
+
+from mypackage import FrozenVector, NormError, Vector, frozen_vector
+from mypackage.vector.frozen_vector import INTERN_LIMIT, QUANTUM
+
+
+@pytest.mark.parametrize(
+    ("vector_1", "vector_2"),
+    (
+        (FrozenVector(1, 2), FrozenVector(1.0, 2.0)),
+        (FrozenVector(0.1 + 0.2, 0), FrozenVector(0.3, 0)),
+        (FrozenVector(-0.0, 5), FrozenVector(0.0, 5)),
+        (FrozenVector(1e-12, -3), FrozenVector(-1e-12, -3)),
+    ),
+)
+def test_equal_vectors_have_equal_hashes(vector_1: FrozenVector, vector_2: FrozenVector) -> None:
+    assert vector_1 == vector_2
+    assert hash(vector_1) == hash(vector_2)
+    assert len({vector_1, vector_2}) == 1
+
+
+@pytest.mark.parametrize(
+    ("vector_1", "vector_2"),
+    (
+        (FrozenVector(1, 2), FrozenVector(2, 1)),
+        (FrozenVector(1, 0), FrozenVector(1 + 3 * QUANTUM, 0)),
+    ),
+)
+def test_different_vectors(vector_1: FrozenVector, vector_2: FrozenVector) -> None:
+    assert vector_1 != vector_2
+    assert len({vector_1, vector_2}) == 2
+
+
+def test_frozen_vector_is_a_vector() -> None:
+    vector = FrozenVector(3, 4)
+    assert isinstance(vector, Vector)
+    assert vector.norm == 5
+    assert vector == Vector(3, 4) and Vector(3, 4) == vector
+    assert type(vector + vector) is Vector
+    assert vector.to_vector() == vector and type(vector.to_vector()) is Vector
+    assert FrozenVector.from_vector(Vector(1, 2)) == FrozenVector(1, 2)
+    with pytest.raises(NormError):
+        FrozenVector(100, 100)
+
+
+def test_frozen_vector_is_immutable() -> None:
+    vector = FrozenVector(1, 2)
+    with pytest.raises(AttributeError):
+        vector.x = 3  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        del vector.y
+    assert (vector.x, vector.y) == (1, 2)
+
+
+def test_interning() -> None:
+    assert frozen_vector(3, -4) is frozen_vector(3, -4)
+    assert frozen_vector(INTERN_LIMIT, -INTERN_LIMIT) is frozen_vector(INTERN_LIMIT, -INTERN_LIMIT)
+    assert frozen_vector(INTERN_LIMIT + 1, 0) is not frozen_vector(INTERN_LIMIT + 1, 0)
+    assert frozen_vector(3.0, 4.0) is not frozen_vector(3.0, 4.0)  # only integers
+    assert frozen_vector(3.0, 4.0) == frozen_vector(3, 4)
+    assert FrozenVector.from_vector(Vector(3, 4)) is frozen_vector(3, 4)
+    assert frozen_vector(True, False) is not frozen_vector(True, False)
+
+
+def test_interning_numpy_integers() -> None:
+    x, y = np.random.default_rng(0).integers(-10, 10, size=2)
+    assert isinstance(x, np.int64)
+    vector = frozen_vector(x, y)
+    assert vector is frozen_vector(x, y) is frozen_vector(int(x), int(y))
+    assert type(vector.x) is int and type(vector.y) is int
+    assert frozen_vector(np.int32(3), np.int8(4)) is frozen_vector(3, 4)
+
+
+@pytest.mark.parametrize("vector", (frozen_vector(1, 2), frozen_vector(0.5, -1.5)))
+def test_pickle_and_copy(vector: FrozenVector) -> None:
+    for duplicate in (pickle.loads(pickle.dumps(vector)), copy.copy(vector), copy.deepcopy(vector)):
+        assert type(duplicate) is FrozenVector
+        assert duplicate == vector
+    assert pickle.loads(pickle.dumps(frozen_vector(1, 2))) is frozen_vector(1, 2)
+
+
+def test_memoization() -> None:
+    calls = []
+
+    @functools.cache
+    def squared_norm(vector: FrozenVector) -> float:
+        calls.append(vector)
+        return vector * vector
+
+    for x, y in [(1, 2), (3, 4), (1, 2), (1.0, 2.0)]:
+        squared_norm(frozen_vector(x, y))
+    assert calls == [FrozenVector(1, 2), FrozenVector(3, 4)]
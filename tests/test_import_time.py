@@ -0,0 +1,67 @@
+"""Import-time budget. Every call to the `vector` command and every script that
+uses our package pays for `import mypackage`, so we measure it with
+`python -X importtime` in a fresh interpreter and fail if it regresses.
+
+Note:
+    Without the heavy dependencies the import takes around 2 ms, while importing
+    NumPy alone takes around 100 ms. The budget leaves plenty of room for slower
+    machines but still catches anyone importing NumPy (or Numba) eagerly again.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+IMPORT_TIME_BUDGET_US = 40_000  # microseconds, as reported by -X importtime
+HEAVY_MODULES = ("numpy", "numba")
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Run the statement in a new interpreter and return the cumulative import
+    time (in microseconds) of every module it imported.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("statement", ("import mypackage", "import mypackage.__main__"))
+def test_no_heavy_imports(statement: str) -> None:
+    times = import_times(statement)
+    assert not [module for module in times if module.split(".")[0] in HEAVY_MODULES]
+
+
+def test_import_time_budget() -> None:
+    import_times("import mypackage")  # warm up: write the bytecode cache
+    best_time = min(import_times("import mypackage")["mypackage"] for _ in range(3))
+    assert best_time < IMPORT_TIME_BUDGET_US, f"import mypackage took {best_time} us"
+
+
+def test_lazy_attributes() -> None:
+    times = import_times("import mypackage; mypackage.Rotation; mypackage.VectorArray")
+    assert "numpy" in times
+    assert "mypackage.linearmap.linear_map" in times
+
+
+def test_lazy_attributes_are_cached() -> None:
+    import mypackage.vector as vector_package
+
+    for name in ("VectorArray", "VectorIndex", "mean"):
+        value = getattr(vector_package, name)
+        assert vars(vector_package)[name] is value  # __getattr__ is not called again
@@ -0,0 +1,69 @@
+"""Tests for the opt-in instrumentation."""
+
+import json
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Rotation, Shear, Vector, VectorArray, instrumentation
+from mypackage.linearmap import LinearMap
+
+
+@pytest.fixture(autouse=True)
+def clean_statistics() -> Iterator[None]:
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_by_default() -> None:
+    original_init, original_call = Vector.__init__, LinearMap.__call__
+    Rotation(0.5)(Vector(1, 0))
+    assert not instrumentation.is_enabled()
+    assert instrumentation.snapshot()["counters"] == {}
+    # Enabling and disabling leaves the original methods, so there is no overhead
+    instrumentation.enable()
+    assert Vector.__init__ is not original_init
+    instrumentation.disable()
+    assert Vector.__init__ is original_init and LinearMap.__call__ is original_call
+
+
+def test_counters() -> None:
+    instrumentation.enable()
+    Vector(1, 2) * 0.5  # one validated vector and one trusted (scaling down)
+    with pytest.raises(NormError):
+        Vector(200, 0)
+    counters = instrumentation.snapshot()["counters"]
+    assert counters == {"NormError": 1, "Vector (trusted)": 1, "Vector.__init__": 2}
+
+
+def test_timers_and_histograms() -> None:
+    instrumentation.enable()
+    rotation = Rotation(0.5)
+    rotation(Vector(1, 0))
+    rotation(VectorArray.zeros(1000))
+    (Shear(1.0) @ rotation).inverse(np.zeros((11, 2)))
+    statistics = instrumentation.snapshot()
+    assert statistics["timers"]["LinearMap.__call__"]["calls"] == 2
+    assert statistics["timers"]["LinearMap.inverse"]["seconds"] > 0
+    assert statistics["histograms"] == {
+        "LinearMap.__call__": {"1": 1, "1000": 1},
+        "LinearMap.inverse": {"100": 1},
+    }
+
+
+def test_collect_only_counts_the_block() -> None:
+    Vector(1, 0)
+    with instrumentation.collect() as outer:
+        Vector(1, 0)
+        with instrumentation.collect() as inner:
+            Vector(1, 0)
+        assert instrumentation.is_enabled()  # the outer block is still collecting
+        Vector(1, 0)
+    Vector(1, 0)
+    assert not instrumentation.is_enabled()
+    assert inner.snapshot()["counters"] == {"Vector.__init__": 1}
+    assert outer.snapshot()["counters"] == {"Vector.__init__": 3}
+    assert json.loads(outer.to_json())["counters"] == {"Vector.__init__": 3}
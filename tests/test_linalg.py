@@ -0,0 +1,82 @@
+"""Tests for the linear algebra of square matrices, with numpy.linalg as the reference."""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from mypackage.backend import use_backend
+from mypackage.linalg import SingularMatrixError, determinant, inverse, lu_factor, solve
+
+
+RNG = np.random.default_rng(42)
+
+
+@pytest.fixture(params=("numpy", "numba"))
+def backend(request: pytest.FixtureRequest) -> Iterator[str]:
+    if request.param == "numba":
+        pytest.importorskip("numba")
+    with use_backend(request.param):
+        yield request.param
+
+
+@pytest.mark.parametrize("size", (0, 1, 2, 3, 4, 7, 20))
+def test_determinant(backend: str, size: int) -> None:
+    matrix = RNG.normal(size=(size, size))
+    assert np.isclose(determinant(matrix), np.linalg.det(matrix))
+    stack = RNG.normal(size=(5, size, size))
+    assert np.allclose(determinant(stack), np.linalg.det(stack))
+
+
+@pytest.mark.parametrize(
+    ("matrix", "result"),
+    (
+        ([[2, 1], [1, 1]], 1.0),
+        (((0, 1), (1, 0)), -1.0),  # needs a row swap
+        ([[1, 2, 3], [4, 5, 6], [7, 8, 10]], -3.0),
+        ([[1, 2], [2, 4]], 0.0),
+        ([[0, 0, 1, 0], [1, 0, 0, 0], [0, 0, 0, 2], [0, 3, 0, 0]], -6.0),
+        (np.zeros((5, 5)), 0.0),
+    ),
+)
+def test_determinant_values(matrix: list, result: float) -> None:
+    assert np.isclose(determinant(matrix), result)
+    assert isinstance(determinant(matrix), float)
+
+
+@pytest.mark.parametrize("size", (1, 2, 5, 12))
+def test_solve_and_inverse(backend: str, size: int) -> None:
+    matrix = RNG.normal(size=(size, size)) + size * np.eye(size)
+    b = RNG.normal(size=size)
+    assert np.allclose(solve(matrix, b), np.linalg.solve(matrix, b))
+    assert np.allclose(inverse(matrix), np.linalg.inv(matrix))
+
+    stack = RNG.normal(size=(4, size, size)) + size * np.eye(size)
+    stack_b = RNG.normal(size=(4, size, 3))
+    assert np.allclose(solve(stack, stack_b), np.linalg.solve(stack, stack_b))
+    assert np.allclose(solve(stack, stack_b[..., 0]), np.linalg.solve(stack, stack_b)[..., 0])
+    assert np.allclose(inverse(stack), np.linalg.inv(stack))
+
+
+def test_lu_factor_reuse(backend: str) -> None:
+    matrix = [[0.0, 2.0, 1.0], [1.0, 1.0, 0.0], [3.0, 0.0, 1.0]]
+    factorization = lu_factor(matrix)
+    assert np.isclose(factorization.determinant(), np.linalg.det(matrix))
+    for b in ([1, 0, 0], [[1, 2], [3, 4], [5, 6]]):
+        assert np.allclose(np.dot(matrix, factorization.solve(b)), b)
+
+
+def test_singular_matrices(backend: str) -> None:
+    with pytest.raises(SingularMatrixError, match="matrix"):
+        inverse([[1, 2], [2, 4]])
+    with pytest.raises(SingularMatrixError, match=r"\[1\]"):
+        solve(np.stack([np.eye(3), np.ones((3, 3))]), np.ones((2, 3)))
+    assert not np.any(np.isnan(lu_factor(np.zeros((3, 3))).lu))
+
+
+@pytest.mark.parametrize("matrix", (np.zeros((2, 3)), np.zeros(4), np.zeros((2, 2, 2, 2))))
+def test_invalid_shapes(matrix: np.ndarray) -> None:
+    with pytest.raises(ValueError, match="square"):
+        determinant(matrix)
+    with pytest.raises(ValueError, match="shape"):
+        solve(np.eye(3), np.ones(2))
@@ -8,10 +8,12 @@ each test function (using the @pytest.mark.parametrize decorator).
 
 from math import sqrt
 
+import numpy as np
 import pytest
 from numpy import pi as PI
 
-from mypackage import Vector, Rotation, Shear, LinearMap
+from mypackage import Vector, VectorArray, NormError, Rotation, Shear, LinearMap, ComposedMap
+from mypackage.linearmap import MatrixMap, SingularMatrixError
 
 
 V1 = Vector(2, 1)
@@ -64,3 +66,157 @@ def test_shear(shear: LinearMap, vector: Vector, result: Vector) -> None:
 def test_inverse_shear(shear: LinearMap, vector: Vector, result: Vector) -> None:
     shear_vector = shear(vector)
     assert shear.inverse(shear_vector) == result
+
+
+@pytest.mark.parametrize("linear_map", (R1, R2, S1, S2))
+def test_call_batch(linear_map: LinearMap) -> None:
+    vectors = VectorArray.from_vectors([V1, V2])
+    expected = VectorArray.from_vectors([linear_map(V1), linear_map(V2)])
+    assert linear_map(vectors) == expected
+    assert linear_map.inverse(linear_map(vectors)) == vectors
+
+
+@pytest.mark.parametrize("linear_map", (R1, S2))
+def test_call_ndarray_out(linear_map: LinearMap) -> None:
+    array = np.array([[V1.x, V1.y], [V2.x, V2.y]], dtype=float)
+    expected = VectorArray.from_vectors([linear_map.inverse(V1), linear_map.inverse(V2)])
+    result = linear_map.inverse(array, out=array)  # transform in place
+    assert result is array
+    assert VectorArray(array) == expected
+
+
+def test_call_batch_out() -> None:
+    out = VectorArray.zeros(2)
+    result = R1(VectorArray.from_vectors([V1, V2]), out=out)
+    assert result is out
+    assert out == VectorArray.from_vectors([Vector(-1, 2), Vector(1, 1)])
+
+
+def test_call_batch_errors() -> None:
+    with pytest.raises(ValueError, match="shape"):
+        R1(np.zeros((3, 3)))
+    with pytest.raises(TypeError, match="floats"):
+        Rotation(0.5)(np.array([[3, 4]]), out=np.zeros((1, 2), dtype=int))
+    with pytest.raises(NormError):
+        Shear(0.01)(VectorArray([[0, 1], [1, 0]]))
+
+
+@pytest.mark.parametrize(
+    ("map_1", "map_2"), ((R1, S1), (S2, R2), (R1, R2), (S1, S2), (R1 @ S1, S2 @ R2))
+)
+@pytest.mark.parametrize("vector", (V1, V2))
+def test_composition(map_1: LinearMap, map_2: LinearMap, vector: Vector) -> None:
+    composed_map = map_1 @ map_2
+    assert composed_map(vector) == map_1(map_2(vector))
+    assert composed_map.inverse(composed_map(vector)) == vector
+
+
+def test_composition_collapse() -> None:
+    assert isinstance(R1 @ R2, Rotation)
+    assert isinstance(S1 @ S2, Shear)
+    assert isinstance(R1 @ S1, ComposedMap)
+    assert len((R1 @ S1 @ R2 @ S2).maps) == 4
+    assert (R1 @ S1).preserves_norm is False
+    assert ComposedMap(R1, R2).preserves_norm is True
+
+
+@pytest.mark.parametrize(
+    "matrix", ([[2, 1], [1, 1]], np.array([[0.0, -3.0], [0.5, 0.0]]), [[4, 0], [0, 0.25]])
+)
+@pytest.mark.parametrize("vector", (V1, V2))
+def test_matrix_map(matrix: list, vector: Vector) -> None:
+    matrix_map = MatrixMap(matrix)
+    assert matrix_map.inverse(matrix_map(vector)) == vector
+    assert np.allclose(matrix_map.matrix @ matrix_map.inv_matrix, np.eye(2))
+
+
+@pytest.mark.parametrize(
+    ("matrix", "error"),
+    (
+        ([[1, 2], [2, 4]], SingularMatrixError),
+        ([[0, 0], [0, 0]], SingularMatrixError),
+        ([[1, 2, 3], [4, 5, 6]], ValueError),
+        (np.eye(3), ValueError),
+        ([[1, float("nan")], [0, 1]], ValueError),
+    ),
+)
+def test_matrix_map_errors(matrix: list, error: type[Exception]) -> None:
+    with pytest.raises(error):
+        MatrixMap(matrix)
+
+
+def test_lazy_inverse() -> None:
+    rotation = Rotation(0.5)
+    assert "_inv_entries" not in rotation.__dict__ and "matrix" not in rotation.__dict__
+    rotation.inverse(V1)
+    assert "_inv_entries" in rotation.__dict__ and "inv_matrix" not in rotation.__dict__
+    assert rotation.matrix.flags.c_contiguous and not rotation.matrix.flags.writeable
+    assert rotation.inv_matrix is rotation.inv_matrix  # computed once
+    assert np.array_equal(rotation.inv_matrix, rotation.matrix.T)
+
+
+M1 = MatrixMap([[0.9, 0.3], [-0.2, 1.05]])
+
+
+@pytest.mark.parametrize("linear_map", (R2, S1, M1, R1 @ S2))
+@pytest.mark.parametrize("k", (0, 1, 2, 7, -3))
+def test_power(linear_map: LinearMap, k: int) -> None:
+    power = linear_map.power(k)
+    matrix = linear_map.matrix if k >= 0 else linear_map.inv_matrix
+    expected = np.linalg.matrix_power(matrix, abs(k))
+    assert np.allclose(power.matrix, expected)
+    assert power.preserves_norm == linear_map.preserves_norm
+    assert (linear_map**k)(V1) == power(V1)
+
+
+def test_power_closed_forms() -> None:
+    assert isinstance(R2**5, Rotation) and (R2**5).angle == 5 * R2.angle
+    assert isinstance(S1**-2, Shear) and (S1**-2).shear_factor == -2 * S1.shear_factor
+    assert np.allclose((M1**2 @ M1).matrix, (M1**3).matrix)
+    with pytest.raises(TypeError):
+        M1.power(0.5)
+    with pytest.raises(TypeError):
+        R1.power(2.0)
+
+
+@pytest.mark.parametrize("linear_map", (R2, S1, M1))
+def test_orbit(linear_map: LinearMap) -> None:
+    vectors = VectorArray.from_vectors([V1, V2, Vector(0.5, -3)])
+    orbit = linear_map.orbit(vectors, steps=10)
+    assert orbit.shape == (10, 3, 2)
+    expected = vectors
+    for step in orbit:
+        assert VectorArray(step) == expected
+        expected = linear_map(expected)
+    assert np.array_equal(linear_map.orbit(vectors.array, 10), orbit)
+    single = linear_map.orbit(V1, 10)
+    assert single.shape == (10, 1, 2) and np.array_equal(single[:, 0], orbit[:, 0])
+
+
+def test_orbit_out() -> None:
+    out = np.empty((5, 2, 2))
+    assert M1.orbit(np.array([[1.0, 0.0], [0.0, 1.0]]), 5, out=out) is out
+    assert np.allclose(out[3], (M1**3).matrix.T)  # the orbits of the basis are the columns
+    assert M1.orbit(V1, 0).shape == (0, 1, 2)
+    with pytest.raises(ValueError, match="shape"):
+        M1.orbit(V1, 5, out=np.empty((5, 2, 2)))
+    with pytest.raises(ValueError, match="shape"):
+        M1.orbit(np.zeros((3, 3)), 5)
+    with pytest.raises(ValueError):
+        M1.orbit(V1, -1)
+    with pytest.raises(TypeError):
+        M1.orbit(V1, 5, out=np.empty((5, 1, 2), dtype=int))
+    with pytest.raises(NormError):
+        MatrixMap([[2, 0], [0, 2]]).orbit(VectorArray([[1, 1]]), 10)
+
+
+@pytest.mark.parametrize(("steps", "chunk_steps"), ((10, 3), (9, 3), (2, 5), (1, 1), (0, 4)))
+def test_iter_orbit(steps: int, chunk_steps: int) -> None:
+    vectors = VectorArray.from_vectors([V1, V2])
+    chunks = list(M1.iter_orbit(vectors, steps, chunk_steps=chunk_steps))
+    assert all(len(chunk) <= chunk_steps for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == steps
+    if chunks:
+        assert np.allclose(np.concatenate(chunks), M1.orbit(vectors, steps))
+    with pytest.raises(ValueError):
+        next(M1.iter_orbit(vectors, steps, chunk_steps=0))
@@ -0,0 +1,58 @@
+"""Tests for the batches of linear maps."""
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Rotation, RotationBatch, Shear, ShearBatch, Vector, VectorArray
+from mypackage.linearmap import LinearMapBatch
+
+
+RNG = np.random.default_rng(7)
+ANGLES = RNG.uniform(-np.pi, np.pi, size=50)
+SHEAR_ANGLES = RNG.uniform(1, 2, size=50)  # shear factors between -0.64 and 0.64
+ARRAY = RNG.uniform(-50, 50, size=(50, 2))
+
+
+@pytest.mark.parametrize(
+    "maps, single_maps",
+    (
+        (RotationBatch(ANGLES), [Rotation(angle) for angle in ANGLES]),
+        (ShearBatch(SHEAR_ANGLES), [Shear(angle) for angle in SHEAR_ANGLES]),
+    ),
+)
+def test_same_as_single_maps(maps: LinearMapBatch, single_maps: list) -> None:
+    assert len(maps) == len(single_maps)
+    expected = np.array([linear_map(Vector(*row)).x for linear_map, row in zip(single_maps, ARRAY)])
+    assert np.allclose(maps(ARRAY)[:, 0], expected)
+    expected = [linear_map.inverse(Vector(1, 2)) for linear_map in single_maps]
+    assert maps.inverse(Vector(1, 2)) == VectorArray.from_vectors(expected)
+    assert np.allclose(maps[3].matrix, single_maps[3].matrix)
+
+
+@pytest.mark.parametrize("maps", (RotationBatch(ANGLES), ShearBatch(SHEAR_ANGLES)))
+def test_inverse(maps: LinearMapBatch) -> None:
+    assert np.allclose(maps.inverse(maps(ARRAY)), ARRAY)
+    assert np.allclose(np.matmul(maps.matrices, maps.inv_matrices), np.eye(2))
+
+
+def test_in_place_and_vector_array() -> None:
+    vectors = VectorArray(ARRAY)
+    rotations = RotationBatch(ANGLES)
+    assert rotations(vectors, out=vectors) is vectors
+    assert np.allclose(rotations.inverse(vectors).array, ARRAY)
+
+
+def test_shear_from_factors() -> None:
+    shears = ShearBatch.from_factors([0.0, 2.0])
+    assert np.array_equal(shears(np.array([[1.0, 1.0], [1.0, 1.0]])), [[1, 1], [3, 1]])
+    with pytest.raises(NormError):
+        ShearBatch.from_factors([0.0, 100.0])(VectorArray([[1, 1], [1, 1]]))
+
+
+def test_wrong_shapes() -> None:
+    with pytest.raises(ValueError):
+        RotationBatch(ANGLES)(ARRAY[:10])
+    with pytest.raises(ValueError):
+        RotationBatch(ANGLES)(ARRAY, out=np.empty((10, 2)))
+    with pytest.raises(TypeError):
+        RotationBatch(ANGLES)([[1, 0]])
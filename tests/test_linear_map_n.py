@@ -0,0 +1,61 @@
+"""Tests for the linear maps of vectors with any number of components."""
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Rotation, Shear, Vector, VectorN
+from mypackage.linalg import SingularMatrixError
+from mypackage.linearmap import LinearMap, LinearMapN
+
+
+RNG = np.random.default_rng(7)
+Z_ROTATION = LinearMapN([[0, -1, 0], [1, 0, 0], [0, 0, 1]], preserves_norm=True)
+SCALING = LinearMapN(np.diag([2.0, 0.5, 1.0, 4.0]))
+
+
+@pytest.mark.parametrize(
+    ("linear_map", "vector", "result"),
+    (
+        (Z_ROTATION, VectorN([1, 2, 3]), VectorN([-2, 1, 3])),
+        (SCALING, VectorN([1, 1, 1, 1]), VectorN([2, 0.5, 1, 4])),
+        (Z_ROTATION @ Z_ROTATION, VectorN([1, 2, 3]), VectorN([-1, -2, 3])),
+    ),
+)
+def test_call_and_inverse(linear_map: LinearMapN, vector: VectorN, result: VectorN) -> None:
+    assert linear_map(vector) == result
+    assert linear_map.inverse(result) == vector
+
+
+@pytest.mark.parametrize("dimension", (1, 3, 6))
+def test_batch(dimension: int) -> None:
+    linear_map = LinearMapN(RNG.normal(size=(dimension, dimension)) + 3 * np.eye(dimension))
+    batch = RNG.normal(size=(100, dimension))
+    out = np.empty_like(batch)
+    assert linear_map(batch, out=out) is out
+    assert np.allclose(out, [linear_map.matrix @ vector for vector in batch])
+    assert np.allclose(linear_map.inverse(out), batch)
+
+
+@pytest.mark.parametrize("linear_map", (Rotation(0.5), Shear(0.8), Rotation(1) @ Shear(1.2)))
+def test_from_linear_map(linear_map: LinearMap) -> None:
+    linear_map_n = LinearMapN.from_linear_map(linear_map)
+    assert linear_map_n.preserves_norm == linear_map.preserves_norm
+    vector = Vector(1.5, -2)
+    assert linear_map_n(VectorN.from_vector(vector)).to_vector() == linear_map(vector)
+    inverse = linear_map_n.inverse(VectorN.from_vector(vector))
+    assert inverse.to_vector() == linear_map.inverse(vector)
+
+
+def test_errors() -> None:
+    with pytest.raises(ValueError, match="square"):
+        LinearMapN(np.ones((2, 3)))
+    with pytest.raises(ValueError, match="dimension"):
+        Z_ROTATION(VectorN([1, 2]))
+    with pytest.raises(ValueError, match="shape"):
+        Z_ROTATION(np.ones((5, 2)))
+    with pytest.raises(ValueError, match="dimensions"):
+        Z_ROTATION @ SCALING
+    with pytest.raises(NormError):
+        SCALING(VectorN([0, 0, 0, 30]))
+    with pytest.raises(SingularMatrixError):
+        LinearMapN(np.ones((3, 3))).inverse(VectorN([1, 2, 3]))
@@ -0,0 +1,122 @@
+"""Tests for the float32 precision of the batches and the tolerance that follows it."""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mypackage import Rotation, RotationBatch, Shear, ShearBatch, Vector, VectorArray
+from mypackage.backend import get_dtype, get_precision, get_tolerance, set_precision
+from mypackage.backend import use_backend, use_precision
+from mypackage.io.binary import load_vectors, read_header, save_vectors
+from mypackage.stream import Pipeline, apply, from_array, from_stream, project_onto, to_stream
+from mypackage.vector import VectorIndex, deduplicate, mean
+
+
+RNG = np.random.default_rng(32)
+POINTS = RNG.uniform(-50, 50, size=(1000, 2))
+
+
+@pytest.fixture(autouse=True)
+def restore_precision():
+    yield
+    set_precision("float64")
+
+
+def test_use_precision() -> None:
+    assert get_precision() == "float64" and get_dtype() == np.float64
+    with use_precision("float32"):
+        assert get_dtype() == np.float32 and get_tolerance() == (1e-4, 1e-5)
+        assert VectorArray(POINTS).dtype == np.float32
+        assert VectorArray.zeros(3).dtype == np.float32
+        assert VectorArray.from_vectors([Vector(1, 2)]).dtype == np.float32
+        assert VectorArray(POINTS, dtype=np.float64).dtype == np.float64
+    assert VectorArray(POINTS).dtype == np.float64
+    with pytest.raises(ValueError):
+        set_precision("float16")
+    with pytest.raises(ValueError):
+        VectorArray(POINTS, dtype=np.int32)
+
+
+def test_tolerance_follows_precision() -> None:
+    vector, rounded = Vector(1 / 3, 2 / 3), Vector(*np.float32([1 / 3, 2 / 3]).tolist())
+    assert vector != rounded
+    assert not VectorArray([[1 / 3, 2 / 3]]).isclose(rounded).all()
+    with use_precision("float32"):
+        assert vector == rounded and rounded == vector
+        assert VectorArray([[1 / 3, 2 / 3]]).isclose(rounded).all()
+        assert Vector(1, 0) != Vector(1.001, 0)
+    assert vector != rounded
+
+
+@pytest.mark.parametrize("backend", ("numpy", "numba"))
+def test_operations_keep_float32(backend: str) -> None:
+    pytest.importorskip(backend)
+    with use_backend(backend), use_precision("float32"):
+        vectors = VectorArray(POINTS / 2)
+        results = {
+            "add": vectors + Vector(1, 1),
+            "add_batch": vectors + VectorArray(POINTS / 4, dtype=np.float64),
+            "scale": vectors * 0.5,
+            "projection": vectors.projection(Vector(1, 2)),
+            "rotation": Rotation(0.3)(vectors),
+            "inverse": Shear(1.3).inverse(vectors),
+            "rotation_batch": RotationBatch(POINTS[:, 0])(vectors),
+            "shear_batch": ShearBatch.from_factors(POINTS[:, 1] / 100).inverse(vectors),
+            "many_rotations": RotationBatch(POINTS[:, 0])(Vector(1, 0)),
+        }
+        for name, result in results.items():
+            assert result.dtype == np.float32, name
+        assert (vectors * Vector(1, 1)).dtype == np.float32
+        assert vectors.norm.dtype == np.float32
+        expected = Rotation(0.3)(VectorArray(POINTS / 2, dtype=np.float64))
+        assert results["rotation"] == expected.astype(np.float32)
+        assert Rotation(0.3)(POINTS.astype(np.float32)).dtype == np.float32
+
+
+def test_float64_batches_stay_float64() -> None:
+    with use_precision("float32"):
+        assert Rotation(0.3)(VectorArray(POINTS / 2, dtype=np.float64)).dtype == np.float64
+        assert Rotation(0.3)(POINTS).dtype == np.float64
+        assert Rotation(0.3)(np.array([[1, 2]])).dtype == np.float32  # integers
+
+
+def test_binary_files(tmp_path: Path) -> None:
+    path = tmp_path / "vectors.vec"
+    with use_precision("float32"):
+        save_vectors(path, POINTS)
+        assert read_header(path).dtype == np.float32
+        loaded = load_vectors(path)
+        assert isinstance(loaded.array, np.memmap)  # mapped, not copied
+        assert loaded == VectorArray(POINTS)
+    assert load_vectors(path).dtype == np.float64
+
+
+def test_stream() -> None:
+    output = io.BytesIO()
+    Pipeline(from_array(POINTS)).run(to_stream(output, dtype="<f4"))
+    assert len(output.getvalue()) == 8 * len(POINTS)
+    with use_precision("float32"):
+        pipeline = Pipeline(
+            from_stream(io.BytesIO(output.getvalue()), 128, dtype="<f4"),
+            apply(Rotation(0.5)),
+            project_onto(Vector(1, 1)),
+        )
+        result = pipeline.run()
+        assert result.dtype == np.float32
+        expected = VectorArray(Rotation(0.5)(POINTS)).projection(Vector(1, 1))
+        assert VectorArray(result) == expected
+        assert mean(VectorArray(POINTS)) == mean(POINTS)
+
+
+def test_tolerant_lookups_follow_precision() -> None:
+    points = np.array([[1 / 3, 2 / 3], [0.0, 1.0], *np.float32([[1 / 3, 2 / 3]]).tolist()])
+    assert deduplicate(points).tolist() == [0, 1, 2]
+    assert VectorIndex.from_array(points).find_equal(Vector(1 / 3, 2 / 3)) == [0]
+    with use_precision("float32"):
+        assert deduplicate(points).tolist() == [0, 1]  # as Vector.__eq__ now says
+        index = VectorIndex.from_array(points)
+        assert index.find_equal(Vector(1 / 3, 2 / 3)) == [0, 2]
+    assert index.find_equal(Vector(1 / 3, 2 / 3)) == [0, 2]  # fixed when it was created
+    assert deduplicate(points, absolute_tolerance=1e-4, relative_tolerance=1e-5).tolist() == [0, 1]
@@ -0,0 +1,69 @@
+"""Tests for the shared-memory process pool."""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from mypackage import Rotation, Shear
+from mypackage.linearmap import LinearMap
+from mypackage.parallel import ProcessPool, SharedArray
+
+
+ARRAY = np.random.default_rng(0).uniform(-80, 80, size=(1001, 2))
+NORMS = np.hypot(ARRAY[:, 0], ARRAY[:, 1])
+
+
+@pytest.fixture(scope="module")
+def pool() -> Iterator[ProcessPool]:
+    with ProcessPool(workers=2) as pool:  # spawned once and reused by all the tests
+        yield pool
+
+
+@pytest.fixture
+def vectors() -> Iterator[SharedArray]:
+    with SharedArray.from_array(ARRAY) as vectors:
+        yield vectors
+
+
+def test_shared_array_copies_the_array(vectors: SharedArray) -> None:
+    assert np.array_equal(vectors.array, ARRAY)
+    assert len(vectors) == len(ARRAY)
+
+
+def test_shared_array_attach_sees_the_same_memory(vectors: SharedArray) -> None:
+    attached = SharedArray(ARRAY.shape, ARRAY.dtype, name=vectors.name)
+    attached.array[0] = (1, 2)
+    assert np.array_equal(vectors.array[0], (1, 2))
+    attached.close()
+
+
+@pytest.mark.parametrize("linear_map", (Rotation(0.5), Shear(0.3), Rotation(1) @ Shear(-0.2)))
+@pytest.mark.parametrize("inverse", (False, True))
+def test_apply(
+    pool: ProcessPool, vectors: SharedArray, linear_map: LinearMap, inverse: bool
+) -> None:
+    expected = linear_map.inverse(ARRAY) if inverse else linear_map(ARRAY)
+    with pool.apply(linear_map, vectors, inverse=inverse) as result:
+        assert np.allclose(result.array, expected)
+
+
+def test_apply_in_place(pool: ProcessPool, vectors: SharedArray) -> None:
+    assert pool.apply(Rotation(0.5), vectors, out=vectors) is vectors
+    assert np.allclose(vectors.array, Rotation(0.5)(ARRAY))
+
+
+@pytest.mark.parametrize("size", (0, 1, 3))
+def test_apply_fewer_vectors_than_workers(pool: ProcessPool, size: int) -> None:
+    with SharedArray.from_array(ARRAY[:size]) as vectors:
+        pool.apply(Rotation(0.5), vectors, out=vectors)
+        assert np.allclose(vectors.array, Rotation(0.5)(ARRAY[:size]))
+
+
+def test_apply_wrong_out(pool: ProcessPool, vectors: SharedArray) -> None:
+    with SharedArray((10, 2)) as out, pytest.raises(ValueError):
+        pool.apply(Rotation(0.5), vectors, out=out)
+
+
+def test_norm_violations(pool: ProcessPool, vectors: SharedArray) -> None:
+    assert np.array_equal(pool.norm_violations(vectors), np.flatnonzero(NORMS > 100))
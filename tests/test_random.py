@@ -0,0 +1,82 @@
+"""Tests for the generators of random batches of vectors and linear maps."""
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, RotationBatch, ShearBatch, Vector, random
+from mypackage.backend import use_precision
+from mypackage.vector.vector import MAX_NORM, OFF, validation
+
+
+SIZE = 100_000
+
+
+@pytest.mark.parametrize(
+    ("function", "kwargs"),
+    (
+        (random.uniform, {"low": -5, "high": 5}),
+        (random.integers, {"low": -3, "high": 3}),
+        (random.normal, {"mean": Vector(1, 2), "std": 3}),
+        (random.in_disk, {"radius": 10}),
+    ),
+)
+def test_reproducible(function, kwargs: dict) -> None:
+    first = function(SIZE, seed=7, **kwargs)
+    assert len(first) == SIZE and first.dtype == np.float64
+    assert np.array_equal(first.array, function(SIZE, seed=7, **kwargs).array)
+    assert not np.array_equal(first.array, function(SIZE, seed=8, **kwargs).array)
+    rng = np.random.default_rng(7)
+    first, second = function(10, seed=rng, **kwargs), function(10, seed=rng, **kwargs)
+    assert not np.array_equal(first.array, second.array)  # the generator continues
+    with use_precision("float32"):
+        assert function(10, seed=7, **kwargs).dtype == np.float32
+
+
+def test_distributions() -> None:
+    points = random.uniform(SIZE, -5, 5, seed=1).array
+    assert points.min() >= -5 and points.max() < 5 and abs(points.mean()) < 0.05
+    points = random.integers(SIZE, -3, 3, seed=1).array
+    assert set(np.unique(points).tolist()) == {-3, -2, -1, 0, 1, 2}
+    points = random.normal(SIZE, mean=(1, 2), std=3, seed=1).array
+    assert np.allclose(points.mean(axis=0), [1, 2], atol=0.05)
+    assert np.allclose(points.std(axis=0), [3, 3], atol=0.05)
+
+
+@pytest.mark.parametrize("dtype", (np.float64, np.float32))
+def test_in_disk(dtype) -> None:
+    points = random.in_disk(SIZE, seed=2, dtype=dtype)
+    norms = np.hypot(points.x.astype(np.float64), points.y.astype(np.float64))
+    assert norms.max() <= MAX_NORM
+    points.validate()  # no NormError
+    # Uniform in the disk: a quarter of the points lie within half the radius
+    assert np.mean(norms < MAX_NORM / 2) == pytest.approx(0.25, abs=0.01)
+    assert abs(np.mean(points.x > 0) - 0.5) < 0.01
+    with pytest.raises(ValueError):
+        random.in_disk(10, radius=2 * MAX_NORM)
+
+
+def test_norm_validation() -> None:
+    with pytest.raises(NormError):
+        random.uniform(1000, -100, 100, seed=0)
+    with validation(OFF):
+        assert len(random.normal(1000, std=100, seed=0)) == 1000
+    random.uniform(1000, -70, 70, seed=0)  # the whole box is within MAX_NORM
+
+
+def test_linear_maps() -> None:
+    rotations = random.rotations(1000, seed=3)
+    assert isinstance(rotations, RotationBatch) and len(rotations) == 1000
+    assert rotations.angles.min() >= 0 and rotations.angles.max() < 2 * np.pi
+    shears = random.shears(1000, seed=3)
+    assert isinstance(shears, ShearBatch)
+    assert np.abs(shears.shear_factors).max() <= 1 + 1e-12
+    assert np.array_equal(random.rotations(10, seed=4).angles, random.rotations(10, seed=4).angles)
+
+
+def test_spawn_generators() -> None:
+    generators = random.spawn_generators(2024, 4)
+    again = random.spawn_generators(np.random.SeedSequence(2024), 4)
+    draws = [random.in_disk(1000, seed=generator).array for generator in generators]
+    for draw, generator in zip(draws, again):
+        assert np.array_equal(draw, random.in_disk(1000, seed=generator).array)
+    assert len({draw.tobytes() for draw in draws}) == 4  # independent streams
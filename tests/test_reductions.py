@@ -0,0 +1,115 @@
+"""Tests for the accumulator and the one-pass reductions of vectors."""
+
+import numpy as np
+import pytest
+
+from mypackage import Accumulator, NormError, Vector, VectorArray
+from mypackage.stream import Pipeline, from_array
+from mypackage.vector import (
+    argmax_norm,
+    energy,
+    max_norm,
+    mean,
+    min_norm,
+    vector_sum,
+    weighted_sum,
+)
+from mypackage.vector import reductions
+
+
+RNG = np.random.default_rng(3)
+POINTS = RNG.uniform(-5, 5, size=(1000, 2))
+
+
+def as_inputs(points: np.ndarray) -> list:
+    """The same vectors given in every way the reductions accept."""
+    return [
+        points,
+        VectorArray(points),
+        [Vector(x, y) for x, y in points.tolist()],
+        [points[:300], VectorArray(points[300:301]), *map(lambda p: Vector(*p), points[301:310])]
+        + [points[310:]],
+        Pipeline(from_array(points, 128)),
+    ]
+
+
+@pytest.mark.parametrize("vectors", as_inputs(POINTS))
+def test_reductions(vectors) -> None:
+    if isinstance(vectors, Pipeline):  # pipelines can only be consumed once
+        vectors = list(vectors)
+    norms = np.hypot(POINTS[:, 0], POINTS[:, 1])
+    assert vector_sum(vectors) == Vector(*POINTS.sum(axis=0))
+    assert mean(vectors) == Vector(*POINTS.mean(axis=0))
+    assert energy(vectors) == pytest.approx((norms**2).sum())
+    assert max_norm(vectors) == pytest.approx(norms.max())
+    assert min_norm(vectors) == pytest.approx(norms.min())
+    assert argmax_norm(vectors) == norms.argmax()
+    weights = np.linspace(0, 1, len(POINTS))
+    assert weighted_sum(vectors, weights) == Vector(*(weights @ POINTS))
+    assert weighted_sum(vectors, weights.tolist()) == Vector(*(weights @ POINTS))
+
+
+def test_chunks_bound_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(reductions, "CHUNK_SIZE", 64)
+    points = RNG.uniform(-5, 5, size=(1000, 2))
+    points[[200, 700]] = [[50, 50], [-50, -50]]  # ties: the first one wins
+    assert [len(array) for array in reductions._chunks(points)] == [64] * 15 + [40]
+    assert argmax_norm(points) == 200
+    assert argmax_norm([Vector(*point) for point in points]) == 200
+    assert mean(points) == Vector(*points.mean(axis=0))
+
+
+def test_only_the_result_is_validated() -> None:
+    vectors = [Vector(60, 0), Vector(60, 0), Vector(-60, 0)]
+    with pytest.raises(NormError):
+        sum(vectors, Vector(0, 0))
+    assert mean(vectors) == Vector(20, 0)
+    assert vector_sum(vectors) == Vector(60, 0)
+    with pytest.raises(NormError):
+        vector_sum(vectors[:2])
+
+
+def test_accumulator() -> None:
+    accumulator = Accumulator()
+    accumulator += Vector(1, 2)
+    accumulator += VectorArray([[1, 0], [0, 1]])
+    accumulator += np.array([[2.0, 1.0]])
+    assert (accumulator.x, accumulator.y, accumulator.weight) == (4, 4, 4)
+    assert accumulator.sum == Vector(4, 4) and accumulator.mean == Vector(1, 1)
+    accumulator *= 0.5
+    assert accumulator.sum == Vector(2, 2) and accumulator.mean == Vector(1, 1)
+    accumulator.add(Vector(3, 3), weights=2)
+    accumulator.add([[1, 1], [2, 2]], weights=[1, 0.5])
+    assert accumulator.sum == Vector(10, 10) and accumulator.weight == 5.5
+    with pytest.raises(TypeError):
+        accumulator += 3
+    with pytest.raises(TypeError):
+        accumulator *= Vector(1, 1)
+    with pytest.raises(ValueError):
+        accumulator.add([[1, 1]], weights=[1, 2])
+
+
+def test_exponential_mean() -> None:
+    average = Accumulator()
+    for vector in [Vector(60, 0), Vector(60, 0), Vector(-60, 0)]:
+        average *= 0.9
+        average += vector
+    assert average.mean == Vector((0.81 * 60 + 0.9 * 60 - 60) / 2.71, 0)
+
+
+@pytest.mark.parametrize("function", (mean, max_norm, min_norm, argmax_norm))
+def test_empty(function) -> None:
+    with pytest.raises(ValueError):
+        function([])
+    with pytest.raises(ValueError):
+        function(np.empty((0, 2)))
+    assert vector_sum([]) == Vector(0, 0) and energy([]) == 0
+
+
+def test_errors() -> None:
+    with pytest.raises(ValueError):
+        weighted_sum(POINTS, np.ones(10))
+    with pytest.raises(ValueError):
+        weighted_sum(POINTS, [1.0] * 10)
+    with pytest.raises(ValueError):
+        mean(np.zeros((3, 3)))
@@ -0,0 +1,158 @@
+"""Tests for the transform server, its protocol and its client."""
+
+import asyncio
+import struct
+
+import numpy as np
+import pytest
+
+from mypackage import Rotation, Shear
+from mypackage.linearmap import LinearMap
+from mypackage.server import (
+    MicroBatcher,
+    ProtocolError,
+    ServerError,
+    TransformClient,
+    TransformServer,
+    run_load,
+)
+from mypackage.server.protocol import (
+    CALL,
+    ERROR,
+    HEADER,
+    MAX_VECTORS,
+    encode,
+    encode_error,
+    read_frame,
+)
+
+
+RNG = np.random.default_rng(3)
+
+
+def read_bytes(data: bytes) -> tuple:
+    async def read() -> tuple:
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_frame(reader)
+
+    return asyncio.run(read())
+
+
+@pytest.mark.parametrize("count", (0, 1, 7))
+def test_protocol_round_trip(count: int) -> None:
+    vectors = RNG.normal(size=(count, 2))
+    request_id, code, payload = read_bytes(encode(42, CALL, vectors))
+    assert (request_id, code) == (42, CALL)
+    assert np.array_equal(payload, vectors)
+
+
+def test_protocol_errors() -> None:
+    assert read_bytes(encode_error(5, "Singular map")) == (5, ERROR, "Singular map")
+    with pytest.raises(ValueError):
+        encode(0, CALL, np.zeros((3, 3)))
+    with pytest.raises(ProtocolError):
+        read_bytes(HEADER.pack(0, MAX_VECTORS + 1, CALL))
+    with pytest.raises(asyncio.IncompleteReadError):
+        read_bytes(encode(0, CALL, np.zeros((2, 2)))[:-1])
+    assert HEADER.size == struct.calcsize("<IIB3x") == 12
+
+
+async def transform_concurrently(
+    linear_map: LinearMap, batches: list[np.ndarray], inverse: bool = False
+) -> tuple[list, TransformServer]:
+    async with TransformServer(linear_map) as server:
+        await server.start(port=0)
+        host, port = server.address
+        async with await TransformClient.connect(host, port) as client:
+            results = await asyncio.gather(
+                *(client.transform(batch, inverse) for batch in batches), return_exceptions=True
+            )
+    return results, server
+
+
+@pytest.mark.parametrize("linear_map", (Rotation(0.5), Shear(1.5)))
+@pytest.mark.parametrize("inverse", (False, True))
+def test_server(linear_map: LinearMap, inverse: bool) -> None:
+    batches = [RNG.normal(size=(size, 2)) for size in RNG.integers(0, 20, size=200)]
+    results, server = asyncio.run(transform_concurrently(linear_map, batches, inverse))
+    transform = linear_map.inverse if inverse else linear_map
+    for batch, result in zip(batches, results):
+        assert np.allclose(result, transform(batch))
+
+    stats = server.batchers[1 if inverse else 0].stats
+    assert stats.requests == len(batches)
+    assert stats.vectors == sum(len(batch) for batch in batches)
+    assert stats.batches < stats.requests  # the concurrent requests were coalesced
+
+
+class BrokenInverse(Rotation):
+    def inverse(self, vector, out=None):  # noqa: ANN001, ANN201
+        raise ValueError("No inverse today.")
+
+
+def test_server_error() -> None:
+    results, _ = asyncio.run(
+        transform_concurrently(BrokenInverse(1), [np.ones((2, 2))] * 3, inverse=True)
+    )
+    assert all(isinstance(result, ServerError) for result in results)
+    assert "No inverse today." in str(results[0])
+
+
+def test_client_after_server_closed() -> None:
+    async def run() -> None:
+        async def close_connection(reader, writer) -> None:  # noqa: ANN001
+            writer.close()
+
+        server = await asyncio.start_server(close_connection, "127.0.0.1", 0)
+        async with server:
+            host, port = server.sockets[0].getsockname()[:2]
+            client = await TransformClient.connect(host, port)
+            await asyncio.wait_for(asyncio.shield(client._reader_task), timeout=5)
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(client.transform(np.ones((2, 2))), timeout=5)
+            assert not client._waiting
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_micro_batcher_limits() -> None:
+    async def run() -> MicroBatcher:
+        batcher = MicroBatcher(Rotation(1), max_batch_size=10)
+        task = asyncio.create_task(batcher.run())
+        results = await asyncio.gather(*(batcher.submit(np.ones((4, 2))) for _ in range(9)))
+        task.cancel()
+        assert all(np.allclose(result, Rotation(1)(np.ones((4, 2)))) for result in results)
+        return batcher
+
+    stats = asyncio.run(run()).stats
+    assert (stats.requests, stats.batches, stats.largest_batch) == (9, 3, 12)
+
+
+def test_micro_batcher_max_wait() -> None:
+    async def run() -> MicroBatcher:
+        batcher = MicroBatcher(Rotation(1), max_batch_size=10, max_wait=0.01)
+        task = asyncio.create_task(batcher.run())
+        for _ in range(3):  # the batcher keeps running after each timeout
+            result = await asyncio.wait_for(batcher.submit(np.ones((4, 2))), timeout=5)
+            assert np.allclose(result, Rotation(1)(np.ones((4, 2))))
+        task.cancel()
+        return batcher
+
+    stats = asyncio.run(run()).stats
+    assert (stats.requests, stats.batches) == (3, 3)
+
+
+def test_run_load() -> None:
+    async def run():  # noqa: ANN202
+        async with TransformServer(Rotation(0.3)) as server:
+            await server.start(port=0)
+            host, port = server.address
+            return await run_load(host, port, connections=4, requests=100, vectors_per_request=3)
+
+    report = asyncio.run(run())
+    assert (report.requests, report.vectors) == (100, 300)
+    assert 0 < report.p50 <= report.p99
+    assert "100 requests (300 vectors)" in str(report)
@@ -0,0 +1,201 @@
+"""Tests for the streaming pipelines of chunked vectors."""
+
+import io
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Vector, stream
+from mypackage.linearmap import Rotation, Shear
+from mypackage.stream import (
+    Pipeline,
+    apply,
+    buffer,
+    chunk,
+    for_each,
+    from_array,
+    from_iterable,
+    from_socket,
+    from_stream,
+    from_text,
+    project_onto,
+    reduce,
+    to_array,
+    to_stream,
+    validate_norm,
+)
+
+
+RNG = np.random.default_rng(5)
+
+
+def test_pipeline_matches_batch_operations() -> None:
+    points = RNG.uniform(-5, 5, size=(10_000, 2))
+    rotation, shear = Rotation(0.4), Shear(0.3)
+    pipeline = Pipeline(
+        from_array(points, 999),
+        apply(rotation),
+        apply(shear, inverse=True),
+        project_onto(Vector(1, 2)),
+    )
+    subspace = np.array([1.0, 2.0])
+    transformed = shear.inverse(rotation(points))
+    expected = np.outer(transformed @ subspace / 5, subspace)
+    assert np.allclose(pipeline.run(), expected)
+    assert list(pipeline) == []  # the source is consumed
+
+
+@pytest.mark.parametrize("sizes", ([5, 5, 5], [1] * 17, [40], [3, 30, 0, 2], []))
+@pytest.mark.parametrize("size", (1, 4, 16))
+def test_chunk(sizes: list[int], size: int) -> None:
+    chunks = [RNG.uniform(size=(length, 2)) for length in sizes]
+    result = list(Pipeline(chunks, chunk(size)))
+    total = sum(sizes)
+    assert [len(array) for array in result] == [size] * (total // size) + (
+        [total % size] if total % size else []
+    )
+    if chunks:
+        assert np.array_equal(np.concatenate(result or [np.empty((0, 2))]), np.concatenate(chunks))
+
+
+def test_validate_norm() -> None:
+    points = np.zeros((10, 2))
+    points[[2, 7], 0] = [200.0, 300.0]
+    dropped = Pipeline(from_array(points, 4), validate_norm(on_error="drop")).run()
+    assert len(dropped) == 8 and not dropped.any()
+    with pytest.raises(NormError) as error:
+        Pipeline(from_array(points, 4), validate_norm()).run()
+    assert error.value.indices == [2]
+    with pytest.raises(NormError):
+        Pipeline(from_array(points, 4), validate_norm()).run(reduce(lambda _, array: None, None))
+    with pytest.raises(NormError) as error:
+        Pipeline(from_array(points[3:], 2), validate_norm()).run()
+    assert error.value.indices == [4] and error.value.norm == 300.0
+    with pytest.raises(ValueError):
+        validate_norm(on_error="ignore")
+
+
+def test_sources() -> None:
+    vectors = [Vector(i, -i) for i in range(7)]
+    expected = np.array([(i, -i) for i in range(7)], dtype=float)
+    assert np.array_equal(Pipeline(from_iterable(vectors, 3)).run(), expected)
+    assert np.array_equal(Pipeline(from_iterable(expected.tolist(), 3)).run(), expected)
+    lines = [f"{x} {y}\n" for x, y in expected] + ["not a vector\n"]
+    assert np.array_equal(Pipeline(from_text(lines, 4)).run(), expected)
+    assert Pipeline(from_iterable([])).run().shape == (0, 2)
+    with pytest.raises(ValueError):
+        next(from_array(np.zeros((3, 3))))
+
+
+class SlowStream(io.RawIOBase):
+    """Binary stream that returns a few bytes on each read, like a socket."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = io.BytesIO(data)
+
+    def readinto(self, buffer: memoryview) -> int:
+        return self.data.readinto(buffer[:5])
+
+
+def test_binary_streams() -> None:
+    points = RNG.uniform(-5, 5, size=(1000, 2))
+    output = io.BytesIO()
+    assert Pipeline(from_array(points, 64)).run(to_stream(output)) == 1000
+    for stream in (io.BytesIO(output.getvalue()), SlowStream(output.getvalue())):
+        chunks = list(from_stream(stream, 300))
+        assert [len(array) for array in chunks] == [300, 300, 300, 100]
+        assert np.array_equal(np.concatenate(chunks), points)
+    with pytest.raises(ValueError):
+        list(from_stream(io.BytesIO(output.getvalue()[:-3])))
+
+
+def test_socket_source() -> None:
+    points = RNG.uniform(-5, 5, size=(5000, 2))
+    sender, receiver = socket.socketpair()
+
+    def send() -> None:
+        with sender:
+            sender.sendall(points.astype("<f8").tobytes())
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    total = Pipeline(from_socket(receiver, 512), buffer(2)).run(
+        reduce(lambda total, array: total + array.sum(axis=0), np.zeros(2))
+    )
+    thread.join()
+    receiver.close()
+    assert np.allclose(total, points.sum(axis=0))
+
+
+def test_buffer_is_bounded() -> None:
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield np.full((1, 2), i, dtype=float)
+
+    pipeline = iter(Pipeline(source(), buffer(3)))
+    assert next(pipeline)[0, 0] == 0
+    time.sleep(0.1)
+    assert len(produced) <= 5  # one taken, three queued and one waiting to be queued
+    pipeline.close()  # stops the background thread
+    assert len(produced) <= 5
+
+
+def test_project_onto_zero_vector() -> None:
+    with pytest.raises(ZeroDivisionError):
+        Vector(1, 1).projection(Vector(0, 0))
+    with pytest.raises(ZeroDivisionError):
+        project_onto(Vector(0, 0))
+
+
+def test_buffer_with_blocked_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(stream, "BUFFER_JOIN_TIMEOUT", 0.1)
+    sender, receiver = socket.socketpair()
+    sender.sendall(np.array([[300.0, 0.0]], dtype="<f8").tobytes())  # too long
+    pipeline = Pipeline(from_socket(receiver, 1), buffer(), validate_norm())
+    start = time.perf_counter()
+    with pytest.raises(NormError):
+        pipeline.run()  # the sender is still open, so the source waits for more data
+    assert time.perf_counter() - start < 5
+    sender.close()  # the source ends, and so does the background thread
+    receiver.close()
+
+
+def test_buffer_propagates_errors() -> None:
+    def source():
+        yield np.zeros((1, 2))
+        raise RuntimeError("broken source")
+
+    with pytest.raises(RuntimeError, match="broken source"):
+        Pipeline(source(), buffer(), apply(Rotation(1))).run()
+    with pytest.raises(ValueError):
+        buffer(0)
+
+
+def test_stats() -> None:
+    points = RNG.uniform(-5, 5, size=(1000, 2))
+    points[10] = [500.0, 0.0]
+    seen = []
+    pipeline = Pipeline(from_array(points, 100), validate_norm("drop"), chunk(300))
+    pipeline.run(for_each(seen.append))
+    assert [len(array) for array in seen] == [300, 300, 300, 99]
+    assert [stats.name for stats in pipeline.stats] == [
+        "source",
+        "validate_norm(drop)",
+        "chunk(300)",
+        "for_each(append)",
+    ]
+    assert [(stats.chunks, stats.vectors) for stats in pipeline.stats] == [
+        (10, 1000),
+        (10, 999),
+        (4, 999),
+        (4, 999),
+    ]
+    assert all(stats.seconds >= 0 for stats in pipeline.stats)
+    assert len(pipeline.report().splitlines()) == 5
+    assert Pipeline(from_array(points[:0])).run(to_array()).shape == (0, 2)
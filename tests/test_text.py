@@ -0,0 +1,58 @@
+"""Tests for the chunked text streaming of vectors."""
+
+import io
+
+import numpy as np
+import pytest
+
+from mypackage import Rotation, Shear
+from mypackage.io import StreamStats, transform_text
+from mypackage.io.text import parse_lines, read_chunks
+
+
+LINES = ["1 0\n", "0 1\n", "# comment\n", "\n", "foo bar\n", "200 0\n", "3 4 5\n", "50 50\n"]
+
+
+def test_read_chunks() -> None:
+    chunks = list(read_chunks(LINES, chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+    for chunk_size in (0, -1):
+        with pytest.raises(ValueError, match="chunk size"):
+            read_chunks(LINES, chunk_size)
+        with pytest.raises(ValueError, match="chunk size"):
+            transform_text(LINES, io.StringIO(), chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize(
+    ("lines", "n_good", "n_bad"),
+    ((["1 2\n", "3 4\n"], 2, 0), (["1 2\n", "x 4\n", "1\n", "nan 1\n"], 1, 3)),
+)
+def test_parse_lines(lines: list[str], n_good: int, n_bad: int) -> None:
+    array, good_lines, bad_lines = parse_lines(lines)
+    assert array.shape == (n_good, 2)
+    assert len(good_lines) == n_good
+    assert len(bad_lines) == n_bad
+
+
+@pytest.mark.parametrize("chunk_size", (1, 3, 100))
+@pytest.mark.parametrize(
+    ("linear_map", "expected"),
+    ((None, StreamStats(3, 2, 1)), (Shear(0.5), StreamStats(2, 2, 2))),
+)
+def test_transform_text(chunk_size: int, linear_map: Shear | None, expected: StreamStats) -> None:
+    sink, rejects = io.StringIO(), io.StringIO()
+    stats = transform_text(LINES, sink, linear_map, chunk_size=chunk_size, rejects=rejects)
+    assert stats == expected
+    assert len(sink.getvalue().splitlines()) == expected.vectors
+    assert len(rejects.getvalue().splitlines()) == expected.rejected
+
+
+def test_transform_text_roundtrip() -> None:
+    rotation = Rotation(0.7)
+    points = np.random.default_rng(0).uniform(-50, 50, size=(1000, 2))
+    source = [f"{x},{y}\n" for x, y in points]
+    rotated, restored = io.StringIO(), io.StringIO()
+    transform_text(source, rotated, rotation, chunk_size=128, delimiter=",")
+    rotated.seek(0)
+    transform_text(rotated, restored, rotation, inverse=True, delimiter=",")
+    assert np.allclose(np.loadtxt(restored.getvalue().splitlines(), delimiter=","), points)
@@ -0,0 +1,98 @@
+"""Tests for the thread pool and the `workers=` argument of the batch operations."""
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Rotation, RotationBatch, Shear, Vector, VectorArray
+from mypackage.backend import get_kernels, numpy_kernels
+from mypackage.linearmap import LinearMap
+from mypackage.parallel import ThreadPool, get_thread_pool, thread_scaling_benchmark
+from mypackage.parallel.thread_pool import MIN_CHUNK_SIZE
+
+
+RNG = np.random.default_rng(5)
+SIZE = 3 * MIN_CHUNK_SIZE + 17  # big enough to be split in chunks
+ARRAY = RNG.uniform(-80, 80, size=(SIZE, 2))
+SUBSPACES = RNG.uniform(-5, 5, size=(SIZE, 2))
+
+
+@pytest.fixture(scope="module", params=(1, 2, 4))
+def pool(request: pytest.FixtureRequest) -> ThreadPool:
+    return get_thread_pool(request.param)
+
+
+@pytest.mark.parametrize("size", (0, 1, MIN_CHUNK_SIZE - 1, 2 * MIN_CHUNK_SIZE, SIZE))
+def test_chunks_cover_the_batch(pool: ThreadPool, size: int) -> None:
+    chunks = pool._chunks(size)
+    assert len(chunks) <= pool.workers
+    assert [chunk.start for chunk in chunks[1:]] == [chunk.stop for chunk in chunks[:-1]]
+    assert (chunks[0].start, chunks[-1].stop) == (0, size)
+    assert len(chunks) == 1 or min(chunk.stop - chunk.start for chunk in chunks) >= MIN_CHUNK_SIZE
+
+
+def test_kernels_match_numpy(pool: ThreadPool) -> None:
+    matrix = np.array([[0.5, -2.0], [1.0, 3.0]])
+    expected = numpy_kernels.apply(matrix, ARRAY, np.empty_like(ARRAY))
+    assert np.allclose(pool.apply(matrix, ARRAY, np.empty_like(ARRAY)), expected)
+    in_place = ARRAY.copy()
+    assert np.allclose(pool.apply(matrix, in_place, in_place), expected)
+
+    expected = numpy_kernels.norm(ARRAY, np.empty(SIZE))
+    assert np.allclose(pool.norm(ARRAY, np.empty(SIZE)), expected)
+    expected = numpy_kernels.norm_violations(ARRAY, 100)
+    assert np.array_equal(pool.norm_violations(ARRAY, 100), expected)
+
+    for subspaces in (SUBSPACES, SUBSPACES[:1]):
+        expected = numpy_kernels.project(ARRAY, subspaces, np.empty_like(ARRAY))
+        assert np.allclose(pool.project(ARRAY, subspaces, np.empty_like(ARRAY)), expected)
+
+
+@pytest.mark.parametrize("vectors", (ARRAY, ARRAY[:1]))
+def test_apply_each_matches_numpy(pool: ThreadPool, vectors: np.ndarray) -> None:
+    matrices = RNG.uniform(-2, 2, size=(SIZE, 2, 2))
+    expected = numpy_kernels.apply_each(matrices, vectors, np.empty_like(ARRAY))
+    assert np.allclose(pool.apply_each(matrices, vectors, np.empty_like(ARRAY)), expected)
+
+
+@pytest.mark.parametrize("linear_map", (Rotation(0.5), Shear(0.3), Rotation(1) @ Shear(-0.2)))
+def test_linear_map_workers(linear_map: LinearMap) -> None:
+    assert np.allclose(linear_map(ARRAY, workers=3), linear_map(ARRAY))
+    assert np.allclose(linear_map.inverse(ARRAY, workers=3), linear_map.inverse(ARRAY))
+    batch = VectorArray(ARRAY / 10)
+    assert linear_map(batch, workers=2) == linear_map(batch)
+
+
+def test_linear_map_batch_workers() -> None:
+    rotations = RotationBatch(RNG.uniform(-3, 3, size=SIZE))
+    assert np.allclose(rotations(ARRAY, workers=2), rotations(ARRAY))
+    assert rotations.inverse(Vector(1, 2), workers=2) == rotations.inverse(Vector(1, 2))
+
+
+def test_vector_array_workers() -> None:
+    batch = VectorArray(ARRAY / 10)
+    batch.validate(workers=4)
+    assert batch.projection(Vector(1, 1), workers=4) == batch.projection(Vector(1, 1))
+
+    too_big = ARRAY.copy()
+    too_big[[3, SIZE - 1]] = (200, 0)
+    with pytest.raises(NormError) as error:
+        VectorArray._from_trusted(too_big).validate(workers=4)
+    assert set(error.value.indices) >= {3, SIZE - 1}
+
+
+def test_get_kernels() -> None:
+    assert get_kernels(None) is numpy_kernels
+    assert get_kernels(2) is get_thread_pool(2)  # the pools are reused
+
+
+def test_invalid_workers() -> None:
+    with pytest.raises(ValueError):
+        ThreadPool(-1)
+
+
+def test_thread_scaling_benchmark() -> None:
+    results = thread_scaling_benchmark(size=1000, max_workers=2, repeat=1, operation="validate")
+    assert [workers for workers, _, _ in results] == [1, 2]
+    assert results[0][2] == 1.0
+    with pytest.raises(ValueError):
+        thread_scaling_benchmark(size=10, operation="rotate")
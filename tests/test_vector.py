@@ -13,6 +13,7 @@ import math
 import pytest
 
 from mypackage import Vector, NormError
+from mypackage.vector.vector import DEFERRED, EAGER, OFF, get_validation, validation
 
 
 V1 = Vector(0, 0)
@@ -30,6 +31,54 @@ def test_norm_error(x: float, y: float) -> None:
         Vector(x, y)
 
 
+def test_validation_off() -> None:
+    with validation(OFF):
+        vector = Vector(100, 80) + Vector(100, 0)
+        assert vector * 2 == Vector(400, 160)
+    assert get_validation() == EAGER
+
+
+def test_validation_deferred() -> None:
+    with pytest.raises(NormError, match="300"), validation(DEFERRED):
+        Vector(200, 0)
+        Vector(300, 0)
+        Vector(1, 1)
+    assert get_validation() == EAGER
+
+
+def test_validation_deferred_keeps_other_errors() -> None:
+    with pytest.raises(KeyError), validation(DEFERRED):
+        Vector(200, 0)
+        raise KeyError("the real error")
+    assert get_validation() == EAGER
+    with validation(DEFERRED):  # the violation above was discarded
+        Vector(1, 1)
+
+
+def test_validation_nested_in_deferred() -> None:
+    with pytest.raises(NormError, match="300"), validation(DEFERRED):
+        Vector(300, 0)
+        with validation(OFF):  # does not raise the pending violation
+            Vector(500, 0)
+            assert get_validation() == OFF
+        with validation(DEFERRED):
+            Vector(200, 0)
+        assert get_validation() == DEFERRED
+    with pytest.raises(NormError, match="200"), validation(EAGER):
+        with validation(DEFERRED):
+            Vector(200, 0)
+
+
+def test_validation_mode_error() -> None:
+    with pytest.raises(ValueError, match="mode"), validation("lazy"):
+        pass
+
+
+def test_slots() -> None:
+    with pytest.raises(AttributeError):
+        V1.z = 0  # type: ignore[attr-defined]
+
+
 @pytest.mark.parametrize(
     ("vector_1", "vector_2", "result"),
     (
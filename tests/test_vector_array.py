@@ -0,0 +1,93 @@
+"""Tests for the VectorArray class. Every batch operation should give the same
+result as applying the corresponding Vector operation to each element.
+"""
+
+import numpy as np
+import pytest
+
+from mypackage import Vector, VectorArray, NormError
+
+
+A1 = VectorArray([[0, 0], [-1, 1], [2.5, -2.5]])
+A2 = VectorArray([[2, 1], [1, -1], [-1, 1]])
+
+
+def test_shape_error() -> None:
+    with pytest.raises(ValueError, match="shape"):
+        VectorArray([1, 2, 3])
+
+
+@pytest.mark.parametrize(
+    ("coordinates", "indices"),
+    (
+        ([[100, 200], [1, 1]], [0]),
+        ([[1, 1], [100, 80], [0, 0], [0, 101]], [1, 3]),
+    ),
+)
+def test_norm_error(coordinates: list[list[float]], indices: list[int]) -> None:
+    with pytest.raises(NormError) as error:
+        VectorArray(coordinates)
+    assert error.value.indices == indices
+
+
+def test_add_norm_error() -> None:
+    with pytest.raises(NormError):
+        VectorArray([[60, 0], [1, 0]]) + VectorArray([[60, 0], [1, 0]])
+
+
+@pytest.mark.parametrize(
+    ("array_1", "array_2"),
+    ((A1, A2), (A2, A1), (A1, Vector(1, 2))),
+)
+def test_add(array_1: VectorArray, array_2: VectorArray | Vector) -> None:
+    other = [array_2] * len(array_1) if isinstance(array_2, Vector) else list(array_2)
+    expected = VectorArray.from_vectors([v1 + v2 for v1, v2 in zip(array_1, other)])
+    assert array_1 + array_2 == expected
+
+
+@pytest.mark.parametrize(("array", "number"), ((A1, 2.0), (A2, -3.0), (A2, 0.5)))
+def test_mul_float(array: VectorArray, number: float) -> None:
+    assert array * number == VectorArray.from_vectors([v * number for v in array])
+    assert number * array == array * number
+
+
+def test_vector_on_the_left() -> None:
+    # Vector.__add__ and __mul__ only take Vectors (and numbers): put the batch first
+    with pytest.raises(TypeError):
+        Vector(1, 2) + A1
+    with pytest.raises(TypeError):
+        Vector(1, 2) * A1
+    with pytest.raises(TypeError):
+        1 + A1
+
+
+@pytest.mark.parametrize(("array_1", "array_2"), ((A1, A2), (A2, Vector(1, 1))))
+def test_mul_vec(array_1: VectorArray, array_2: VectorArray | Vector) -> None:
+    other = [array_2] * len(array_1) if isinstance(array_2, Vector) else list(array_2)
+    expected = [v1 * v2 for v1, v2 in zip(array_1, other)]
+    assert np.allclose(array_1 * array_2, expected)
+
+
+@pytest.mark.parametrize("array", (A1, A2))
+def test_norm(array: VectorArray) -> None:
+    assert np.allclose(array.norm, [vector.norm for vector in array])
+
+
+def test_eq_tolerance() -> None:
+    assert VectorArray([[1, 0]]) == VectorArray([[1, 1e-11]])
+    assert VectorArray([[1, 0]]) != VectorArray([[1, 1e-9]])
+    assert VectorArray([[1, 0]]) != VectorArray([[1, 0], [1, 0]])
+
+
+@pytest.mark.parametrize(
+    ("array", "subspace"), ((A1, Vector(1, 1)), (A2, Vector(0, 2)), (A2, A1 + Vector(1, 0)))
+)
+def test_projection(array: VectorArray, subspace: VectorArray | Vector) -> None:
+    other = [subspace] * len(array) if isinstance(subspace, Vector) else list(subspace)
+    expected = VectorArray.from_vectors([v.projection(s) for v, s in zip(array, other)])
+    assert array.projection(subspace) == expected
+
+
+def test_projection_warning() -> None:
+    with pytest.warns(UserWarning):
+        assert A2.projection() == VectorArray([[2, 0], [1, 0], [-1, 0]])
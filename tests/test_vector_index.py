@@ -0,0 +1,120 @@
+"""Tests for the spatial index of vectors and the deduplication of batches."""
+
+import numpy as np
+import pytest
+
+from mypackage import Vector, VectorIndex
+from mypackage.vector import deduplicate, vector_index
+
+
+RNG = np.random.default_rng(11)
+
+
+def brute_force_unique(points: np.ndarray) -> list[int]:
+    """Deduplicate by comparing every vector with the kept ones (O(N^2))."""
+    kept: list[int] = []
+    for i, point in enumerate(points.tolist()):
+        if not any(Vector(*point) == Vector(*points[k]) for k in kept):
+            kept.append(i)
+    return kept
+
+
+def near_duplicates(size: int, scale: float = 1.0) -> np.ndarray:
+    """Points on a small grid, shifted by about the tolerance of Vector.__eq__, so that
+    some of them are equal, some are not, and some form chains of equal vectors.
+    """
+    grid = RNG.integers(-3, 3, size=(size, 2)) * scale
+    shifts = RNG.choice([0, 4e-11, 8e-11, 1.2e-10, 3e-10], size=grid.shape) * scale
+    return grid + shifts
+
+
+@pytest.mark.parametrize("scale", (1.0, 1e-3, 20.0))
+def test_deduplicate_matches_brute_force(scale: float) -> None:
+    for _ in range(10):
+        points = near_duplicates(80, scale)
+        kept = brute_force_unique(points)
+        indices, inverse = deduplicate(points, return_inverse=True)
+        assert indices.tolist() == kept
+        for point, representative in zip(points, points[indices][inverse]):
+            assert Vector(*point) == Vector(*representative)
+        assert VectorIndex.from_array(points, unique=True).points.tolist() == points[kept].tolist()
+
+
+@pytest.mark.parametrize(
+    ("points", "expected"),
+    (
+        (np.empty((0, 2)), []),
+        (np.array([[1.0, 2.0]]), [0]),
+        (np.array([[1.0, 2.0], [1.0, 2.0], [1.0, 2.0]]), [0]),
+        (np.array([[0.0, 0.0], [5e-11, 0.0], [1.5e-10, 0.0], [2e-10, 0.0]]), [0, 2]),
+        (np.array([[1e6, 1e6], [1e6 + 1e-4, 1e6], [-1e6, 1e6]]), [0, 2]),  # relative tolerance
+    ),
+)
+def test_deduplicate(points: np.ndarray, expected: list[int]) -> None:
+    assert deduplicate(points).tolist() == expected
+
+
+def test_deduplicate_errors() -> None:
+    with pytest.raises(ValueError):
+        deduplicate(np.zeros((3, 3)))
+    with pytest.raises(ValueError):
+        deduplicate(np.array([[np.nan, 0.0]]))
+
+
+def test_deduplicate_large_batch() -> None:
+    points = RNG.uniform(-50, 50, size=(50_000, 2))
+    copies = points[RNG.integers(0, len(points), 20_000)] * (1 + 1e-11)
+    indices, inverse = deduplicate(np.concatenate([points, copies]), return_inverse=True)
+    assert indices.tolist() == list(range(len(points)))
+    assert np.allclose(points[inverse], np.concatenate([points, copies]))
+
+
+def test_deduplicate_exact_copies() -> None:
+    points = RNG.integers(-10, 10, size=(1_000_000, 2)).astype(np.float64)  # 400 values
+    indices, inverse = deduplicate(points, return_inverse=True)
+    assert len(indices) == 400
+    first_copies = np.unique(points[:, 0] * 100 + points[:, 1], return_index=True)[1]
+    assert indices.tolist() == sorted(first_copies.tolist())
+    assert np.array_equal(points[indices][inverse], points)
+
+
+def test_deduplicate_dense_cell(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(vector_index, "PAIR_BLOCK", 64)  # many blocks, even within a cell
+    points = np.concatenate([near_duplicates(300), RNG.uniform(0, 1e-10, size=(100, 2))])
+    indices, inverse = deduplicate(points, return_inverse=True)
+    assert indices.tolist() == brute_force_unique(points)
+    for point, representative in zip(points, points[indices][inverse]):
+        assert Vector(*point) == Vector(*representative)
+
+
+def test_index_find_equal() -> None:
+    index = VectorIndex()
+    assert [index.insert(Vector(x, y)) for x, y in [(1, 2), (3, 4), (1, 2 + 1e-11)]] == [0, 1, 2]
+    assert len(index) == 3
+    assert index.find_equal(Vector(1, 2)) == [0, 2]
+    assert index.first_equal(Vector(1 + 5e-11, 2)) == 0
+    assert index.first_equal(Vector(1, 2.1)) is None
+    assert Vector(3, 4) in index and Vector(4, 3) not in index
+    assert index.insert(Vector(3, 4), unique=True) == 1 and len(index) == 3
+    assert index[1] == Vector(3, 4)
+    assert list(index) == [Vector(1, 2), Vector(3, 4), Vector(1, 2)]
+
+
+@pytest.mark.parametrize("cell_size", (None, 1e-3, 5.0))
+@pytest.mark.parametrize("radius", (0.0, 0.5, 3.0, 200.0))
+def test_index_within(cell_size: float | None, radius: float) -> None:
+    points = RNG.uniform(-10, 10, size=(500, 2))
+    index = VectorIndex.from_array(points, cell_size=cell_size)
+    center = Vector(1.5, -2.0)
+    distances = np.hypot(points[:, 0] - center.x, points[:, 1] - center.y)
+    assert index.within(center, radius) == np.flatnonzero(distances <= radius).tolist()
+    assert index.within(Vector(*points[7]), 0.0) == [7]
+
+
+def test_index_errors() -> None:
+    with pytest.raises(ValueError):
+        VectorIndex(absolute_tolerance=-1)
+    with pytest.raises(ValueError):
+        VectorIndex(cell_size=0)
+    with pytest.raises(ValueError):
+        VectorIndex().insert(Vector(float("inf"), 0))
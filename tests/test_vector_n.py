@@ -0,0 +1,68 @@
+"""Tests for the vectors with any number of components."""
+
+import numpy as np
+import pytest
+
+from mypackage import NormError, Vector, VectorN
+from mypackage.vector.vector import OFF, validation
+
+
+V1 = VectorN([1, 2, 2])
+V2 = VectorN([0, -1, 3])
+
+
+@pytest.mark.parametrize(
+    ("vector_1", "vector_2", "result"),
+    (
+        (V1, V2, VectorN([1, 1, 5])),
+        (VectorN([1, 0]), VectorN([0, 1]), VectorN([1, 1])),
+        (VectorN([1, 2, 3, 4, 5]), VectorN([5, 4, 3, 2, 1]), VectorN([6] * 5)),
+    ),
+)
+def test_add(vector_1: VectorN, vector_2: VectorN, result: VectorN) -> None:
+    assert vector_1 + vector_2 == result
+
+
+@pytest.mark.parametrize(
+    ("vector", "other", "result"),
+    ((V1, V2, 4.0), (V1, 2, VectorN([2, 4, 4])), (V2, -0.5, VectorN([0, 0.5, -1.5]))),
+)
+def test_mul(vector: VectorN, other: VectorN | float, result: VectorN | float) -> None:
+    assert vector * other == result
+
+
+@pytest.mark.parametrize(("vector", "result"), ((V1, 3.0), (VectorN([3, 4]), 5.0), (V2, 10**0.5)))
+def test_norm(vector: VectorN, result: float) -> None:
+    assert np.isclose(vector.norm, result)
+
+
+def test_projection() -> None:
+    assert V1.projection(VectorN([0, 0, 5])) == VectorN([0, 0, 2])
+    with pytest.warns(UserWarning):
+        assert V1.projection() == VectorN([1, 0, 0])
+
+
+def test_equality_and_conversions() -> None:
+    assert V1 == VectorN(np.array([1.0, 2.0, 2.0 + 1e-12]))
+    assert V1 != VectorN([1, 2]) and V1 != VectorN([1, 2, 2.1])
+    assert VectorN.from_vector(Vector(1, 2)).to_vector() == Vector(1, 2)
+    assert list(V1) == [1.0, 2.0, 2.0] and V1[2] == 2.0 and V1.dimension == 3
+    assert np.asarray(V1) is V1.components
+    assert not V1.components.flags.writeable
+
+
+def test_errors() -> None:
+    with pytest.raises(NormError):
+        VectorN([60, 60, 60])
+    with pytest.raises(NormError):
+        VectorN([50, 50, 0]) * 2
+    with validation(OFF):
+        assert VectorN([60, 60, 60]) + V1 == VectorN([61, 62, 62])
+    with pytest.raises(ValueError, match="dimensions"):
+        V1 + VectorN([1, 2])
+    with pytest.raises(ValueError, match="one dimensional"):
+        VectorN([[1, 2], [3, 4]])
+    with pytest.raises(TypeError):
+        V1 + Vector(1, 2)
+    with pytest.raises(ValueError, match="2 dimensional"):
+        V1.to_vector()